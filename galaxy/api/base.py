@@ -17,6 +17,7 @@
 
 from django.core import exceptions as dj_exc
 from django import http as dj_http
+from django.utils import cache as dj_cache
 from rest_framework import exceptions as drf_exc
 from rest_framework import generics
 from rest_framework import mixins
@@ -25,6 +26,8 @@ from rest_framework.settings import api_settings
 from rest_framework import status as http_codes
 from rest_framework import views
 
+from galaxy.main import response_cache
+
 
 def exception_handler(exc, context):
     if isinstance(exc, dj_http.Http404):
@@ -88,6 +91,85 @@ class ExceptionHandlerMixin:
         return exception_handler
 
 
+class ResponseCacheMixin:
+    """Caches successful JSON responses to anonymous GET requests.
+
+    The mixin wraps `get` of a generic view, so views must not override it.
+    Views call `add_cache_tags` with tags of objects a response is rendered
+    from (see `galaxy.main.response_cache`), responses without tags are
+    not cached. Data stored in `response_cache_meta` is cached with
+    a response and passed to `response_cache_hit` on cache hits.
+    """
+
+    _cache_tags = None
+    response_cache_meta = None
+
+    def get(self, request, *args, **kwargs):
+        if not self._is_response_cacheable(request):
+            return super().get(request, *args, **kwargs)
+
+        view_name = type(self).__name__
+        key = response_cache.make_key(
+            request.scheme, request.get_host(), request.path,
+            request.query_params, request.accepted_media_type)
+        cached = response_cache.get_response(key)
+        if cached is not None:
+            response_cache.lookups.labels(view_name, 'hit').inc()
+            self.response_cache_hit(cached.meta)
+            response = dj_http.HttpResponse(
+                cached.content, content_type=cached.content_type)
+            return self._get_conditional_response(
+                request, response, cached.etag)
+        response_cache.lookups.labels(view_name, 'miss').inc()
+
+        self._cache_tags = {}
+        self.response_cache_meta = {}
+        response = super().get(request, *args, **kwargs)
+        if response.status_code != http_codes.HTTP_200_OK:
+            return response
+
+        # Response is rendered here instead of `finalize_response`,
+        # so that rendered content can be cached.
+        response.accepted_renderer = request.accepted_renderer
+        response.accepted_media_type = request.accepted_media_type
+        response.renderer_context = self.get_renderer_context()
+        response.render()
+        etag = response_cache.make_etag(response.content)
+        if self._cache_tags:
+            response_cache.set_response(key, response_cache.CachedResponse(
+                content=response.content,
+                content_type=response['Content-Type'],
+                etag=etag,
+                tags=self._cache_tags,
+                meta=self.response_cache_meta,
+            ))
+        return self._get_conditional_response(request, response, etag)
+
+    def add_cache_tags(self, *tags):
+        """Tags a response to the current request."""
+        if self._cache_tags is not None:
+            self._cache_tags.update(response_cache.get_tag_tokens(tags))
+
+    def response_cache_hit(self, meta):
+        """Called when a request is answered by a cached response."""
+        pass
+
+    def _is_response_cacheable(self, request):
+        return (
+            response_cache.is_enabled()
+            and not request.user.is_authenticated
+            and request.accepted_renderer.format == 'json'
+        )
+
+    def _get_conditional_response(self, request, response, etag):
+        response['ETag'] = etag
+        response = dj_cache.get_conditional_response(
+            request._request, etag=etag, response=response)
+        if response.status_code == http_codes.HTTP_304_NOT_MODIFIED:
+            response_cache.not_modified.labels(type(self).__name__).inc()
+        return response
+
+
 class APIView(ExceptionHandlerMixin,
               views.APIView):
     """Base class for API views."""
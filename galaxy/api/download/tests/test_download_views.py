@@ -19,6 +19,7 @@ import importlib
 from urllib import parse as urlparse
 from unittest import mock
 
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.contrib.auth import get_user_model
 from django.test import override_settings
@@ -72,11 +73,11 @@ class TestArtifactDownloadView(APITestCase):
         self.version = models.CollectionVersion.objects.create(
             collection=self.collection, version='1.2.3')
 
-    def _create_artifact(self):
+    def _create_artifact(self, content=b''):
         self.artifact = pulp_models.Artifact.objects.create(
-            size=427611,
+            size=len(content) or 427611,
             sha256=self.sha256,
-            file=SimpleUploadedFile(self.storage_path, ''),
+            file=SimpleUploadedFile(self.storage_path, content),
         )
         self.ca = pulp_models.ContentArtifact.objects.create(
             content=self.version, artifact=self.artifact,
@@ -127,6 +128,119 @@ class TestArtifactDownloadView(APITestCase):
         assert response.status_code == http_codes.HTTP_200_OK
         assert response.getvalue() == b'CONTENT'
 
+    @override_settings(
+        MEDIA_ROOT='/var/lib/galaxy/media/',
+        DEFAULT_FILE_STORAGE='pulpcore.app.models.storage.FileSystem',
+    )
+    def test_direct_serve_headers(self):
+        self._create_artifact(b'CONTENT')
+        url = self.download_url.format(filename=self.filename)
+        response = self.client.get(url)
+
+        assert response.status_code == http_codes.HTTP_200_OK
+        assert response['ETag'] == f'"{self.sha256}"'
+        assert response['Content-Length'] == '7'
+        assert response['Accept-Ranges'] == 'bytes'
+        assert 'Last-Modified' in response
+        assert response['Content-Disposition'] == (
+            f'attachment; filename="{self.filename}"')
+        assert response.getvalue() == b'CONTENT'
+
+    @override_settings(
+        MEDIA_ROOT='/var/lib/galaxy/media/',
+        DEFAULT_FILE_STORAGE='pulpcore.app.models.storage.FileSystem',
+    )
+    def test_direct_serve_not_modified(self):
+        self._create_artifact(b'CONTENT')
+        url = self.download_url.format(filename=self.filename)
+        response = self.client.get(
+            url, HTTP_IF_NONE_MATCH=f'"{self.sha256}"')
+
+        assert response.status_code == http_codes.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == f'"{self.sha256}"'
+
+    @override_settings(
+        MEDIA_ROOT='/var/lib/galaxy/media/',
+        DEFAULT_FILE_STORAGE='pulpcore.app.models.storage.FileSystem',
+    )
+    def test_direct_serve_range(self):
+        self._create_artifact(b'CONTENT')
+        url = self.download_url.format(filename=self.filename)
+
+        response = self.client.get(url, HTTP_RANGE='bytes=1-3')
+        assert response.status_code == http_codes.HTTP_206_PARTIAL_CONTENT
+        assert response['Content-Range'] == 'bytes 1-3/7'
+        assert response['Content-Length'] == '3'
+        assert response.getvalue() == b'ONT'
+
+        response = self.client.get(url, HTTP_RANGE='bytes=-2')
+        assert response.status_code == http_codes.HTTP_206_PARTIAL_CONTENT
+        assert response.getvalue() == b'NT'
+
+        response = self.client.get(url, HTTP_RANGE='bytes=7-')
+        assert (response.status_code
+                == http_codes.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+        assert response['Content-Range'] == 'bytes */7'
+
+        response = self.client.get(
+            url, HTTP_RANGE='bytes=1-3', HTTP_IF_RANGE='"outdated"')
+        assert response.status_code == http_codes.HTTP_200_OK
+        assert response.getvalue() == b'CONTENT'
+
+    @override_settings(
+        MEDIA_ROOT='/var/lib/galaxy/media/',
+        DEFAULT_FILE_STORAGE='pulpcore.app.models.storage.FileSystem',
+        GALAXY_DOWNLOAD_SENDFILE='x-accel-redirect',
+        GALAXY_DOWNLOAD_SENDFILE_LOCATION='/_protected/',
+    )
+    def test_x_accel_redirect(self):
+        self._create_artifact(b'CONTENT')
+        url = self.download_url.format(filename=self.filename)
+        response = self.client.get(url)
+
+        assert response.status_code == http_codes.HTTP_200_OK
+        assert response['X-Accel-Redirect'] == (
+            '/_protected/' + self.artifact.file.name)
+        assert response['ETag'] == f'"{self.sha256}"'
+        assert response['Content-Length'] == '7'
+        assert response.content == b''
+
+    @override_settings(
+        MEDIA_ROOT='/var/lib/galaxy/media/',
+        DEFAULT_FILE_STORAGE='pulpcore.app.models.storage.FileSystem',
+        GALAXY_DOWNLOAD_SENDFILE='x-sendfile',
+    )
+    def test_x_sendfile(self):
+        self._create_artifact(b'CONTENT')
+        url = self.download_url.format(filename=self.filename)
+        response = self.client.get(url)
+
+        assert response.status_code == http_codes.HTTP_200_OK
+        assert response['X-Sendfile'] == self.artifact.file.path
+
+    @override_settings(
+        MEDIA_ROOT='/var/lib/galaxy/media/',
+        DEFAULT_FILE_STORAGE='pulpcore.app.models.storage.FileSystem',
+        GALAXY_ARTIFACT_CACHE='default',
+    )
+    def test_cached_lookup(self):
+        cache.clear()
+        self._create_artifact(b'CONTENT')
+        url = self.download_url.format(
+            filename='MyNamespace-MyCollection-1.2.3.tar.gz')
+
+        response = self.client.get(url)
+        assert response.status_code == http_codes.HTTP_200_OK
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        assert response.status_code == http_codes.HTTP_200_OK
+        assert response.getvalue() == b'CONTENT'
+
+        self.version.delete()
+        response = self.client.get(url)
+        assert response.status_code == http_codes.HTTP_404_NOT_FOUND
+
     def test_invalid_filename(self):
         filename = 'invalidfilename.tar.gz'
         url = self.download_url.format(filename=filename)
@@ -1,18 +1,24 @@
 import logging
+import os
+import re
 from pathlib import PurePath
+from urllib.parse import quote
 
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
-from django.core.files.storage import FileSystemStorage
-from django.http import FileResponse
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import redirect
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
 from storages.backends import s3boto3
 from rest_framework.exceptions import NotFound
 from rest_framework.permissions import AllowAny
 
 from galaxy.api.base import APIView
 from galaxy.common.schema import CollectionFilename
-from galaxy.main import models
+from galaxy.main.artifacts import resolve_artifact
+from galaxy.main.downloads import download_counter
 
 
 __all__ = (
@@ -21,6 +27,14 @@ __all__ = (
 
 logger = logging.getLogger(__name__)
 
+SENDFILE_X_ACCEL_REDIRECT = 'x-accel-redirect'
+SENDFILE_X_SENDFILE = 'x-sendfile'
+
+ARTIFACT_CONTENT_TYPE = 'application/gzip'
+CHUNK_SIZE = 64 * 1024
+
+BYTE_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
 
 class ArtifactDownloadView(APIView):
     permission_classes = (AllowAny,)
@@ -31,54 +45,181 @@ class ArtifactDownloadView(APIView):
         except ValueError:
             raise NotFound(f'Artifact "{filename}" does not exist.')
 
-        try:
-            version = models.CollectionVersion.objects.get(
-                collection__namespace__name__iexact=filename.namespace,
-                collection__name__iexact=filename.name,
-                version__exact=filename.version,
-            )
-        except models.CollectionVersion.DoesNotExist:
+        artifact = resolve_artifact(filename)
+        if artifact is None:
             raise NotFound(f'Artifact "{filename}" does not exist.')
 
         user_agent = request.META.get('HTTP_USER_AGENT', '')
         if user_agent.startswith('ansible-galaxy/'):
-            version.collection.inc_download_count()
+            download_counter.increment_collection(artifact.collection_id)
+
+        filename = PurePath(artifact.relative_path).name
 
-        ca = version.get_content_artifact()
-        filename = PurePath(ca.relative_path).name
+        # Artifact files are stored in the default storage.
+        storage = default_storage
 
         # If artifact url is a remote URL (e.g. S3 URL) return redirect to
         # # this URL.
-        artifact_file = ca.artifact.file
-        storage = artifact_file.storage
         if isinstance(storage, s3boto3.S3Boto3Storage):
-            return self._s3_redirect(artifact_file, filename)
+            return self._s3_redirect(storage, artifact, filename)
 
-        # If running in debug mode serve file directly by Django.
+        # Local filesystem storage. The file is either passed to the front
+        # proxy, or streamed by Django if sendfile mode is not configured.
         if isinstance(storage, FileSystemStorage):
-            return self._serve_file(artifact_file, filename)
+            return self._serve_file(request, storage, artifact, filename)
 
         raise ImproperlyConfigured(
             'Only S3 and local filesystem storage backends are supported.')
 
-    def _s3_redirect(self, artifact_file, filename):
+    def _s3_redirect(self, storage, artifact, filename):
         content_disposition = f'attachment; filename={filename}'
         parameters = {
             'ResponseContentDisposition': content_disposition
         }
-        url = artifact_file.storage.url(
-            artifact_file.name, parameters=parameters)
+        url = storage.url(artifact.storage_name, parameters=parameters)
         return redirect(url)
 
-    def _serve_file(self, artifact_file, filename):
-        if not settings.DEBUG:
-            logger.warning(
-                f'Serving artifact "{filename}" directly by Django '
-                f'application. This can affect service performance and '
-                f'should not be used in production.')
-        storage = artifact_file.storage
+    def _serve_file(self, request, storage, artifact, filename):
         try:
-            return FileResponse(storage.open(artifact_file.path),
-                                as_attachment=True, filename=filename)
+            last_modified = int(os.path.getmtime(
+                storage.path(artifact.storage_name)))
         except FileNotFoundError:
             raise NotFound(f'Artifact "{filename}" does not exist.')
+
+        etag = quote_etag(artifact.sha256)
+
+        response = HttpResponse(content_type=ARTIFACT_CONTENT_TYPE)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=last_modified,
+            response=response)
+        if not_modified is not None:
+            return not_modified
+
+        sendfile = settings.GALAXY_DOWNLOAD_SENDFILE
+        if sendfile:
+            response = self._sendfile(
+                response, storage, artifact.storage_name, sendfile)
+            response['Content-Length'] = str(artifact.size)
+        else:
+            if not settings.DEBUG:
+                logger.warning(
+                    f'Serving artifact "{filename}" directly by Django '
+                    f'application. This can affect service performance '
+                    f'and should not be used in production. '
+                    f'Configure GALAXY_DOWNLOAD_SENDFILE instead.')
+            response = self._stream_file(
+                request, response, storage, artifact.storage_name,
+                artifact.size, etag, last_modified)
+
+        response['Accept-Ranges'] = 'bytes'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    def _sendfile(self, response, storage, name, sendfile):
+        """Delegates sending file to the front proxy.
+
+        Range requests are handled by the proxy.
+        """
+        location = settings.GALAXY_DOWNLOAD_SENDFILE_LOCATION
+        if sendfile == SENDFILE_X_ACCEL_REDIRECT:
+            if not location:
+                raise ImproperlyConfigured(
+                    'GALAXY_DOWNLOAD_SENDFILE_LOCATION is required for '
+                    'X-Accel-Redirect.')
+            response['X-Accel-Redirect'] = (
+                location.rstrip('/') + '/' + quote(name))
+        elif sendfile == SENDFILE_X_SENDFILE:
+            if location:
+                path = os.path.join(location, name)
+            else:
+                path = storage.path(name)
+            response['X-Sendfile'] = path
+        else:
+            raise ImproperlyConfigured(
+                f'Unsupported GALAXY_DOWNLOAD_SENDFILE value "{sendfile}".')
+        return response
+
+    def _stream_file(self, request, response, storage, name, size, etag,
+                     last_modified):
+        byte_range = _parse_range(request, size, etag, last_modified)
+        if byte_range is None:
+            start, length = 0, size
+            status = 200
+        elif byte_range is False:
+            response.status_code = 416
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+        else:
+            start, length = byte_range
+            status = 206
+
+        fp = storage.open(name)
+        streaming_response = StreamingHttpResponse(
+            _read_file(fp, start, length),
+            status=status,
+            content_type=ARTIFACT_CONTENT_TYPE,
+        )
+        for header, value in response.items():
+            streaming_response[header] = value
+        streaming_response['Content-Length'] = str(length)
+        if status == 206:
+            streaming_response['Content-Range'] = (
+                f'bytes {start}-{start + length - 1}/{size}')
+        return streaming_response
+
+
+def _parse_range(request, size, etag, last_modified):
+    """Parses a single byte range of a `Range` request header.
+
+    :return: A tuple of (start, length), `None` if the whole file should be
+        served, or `False` if the range is not satisfiable.
+    """
+    header = request.META.get('HTTP_RANGE')
+    if not header:
+        return None
+
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if if_range:
+        if_range_date = parse_http_date_safe(if_range)
+        if if_range_date is None:
+            if if_range != etag:
+                return None
+        elif if_range_date < last_modified:
+            return None
+
+    # Multiple ranges are not supported, the whole file is served instead.
+    match = BYTE_RANGE_RE.match(header.strip())
+    if match is None:
+        return None
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if last and int(last) < start:
+            return None
+    elif last:
+        # Suffix range, i.e. last N bytes.
+        start = max(size - int(last), 0)
+        end = size - 1
+        if int(last) == 0:
+            return False
+    else:
+        return None
+
+    if start >= size:
+        return False
+    return start, end - start + 1
+
+
+def _read_file(fp, start, length):
+    with fp:
+        fp.seek(start)
+        while length > 0:
+            chunk = fp.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
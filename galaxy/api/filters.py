@@ -52,18 +52,18 @@ class ActiveOnlyBackend(BaseFilterBackend):
         return queryset
 
 
-# NOTE(cutwater): Adding `DISTINCT` statement to all database queries
-# may have significant performance impact. To keep compatibility with
-# existing code a `FieldLookupBackend` implementation is moved to
-# base class `_FieldLookupBackend` except calling `.distinct()` for all
-# returned querysets, which is added in child class.
-class _FieldLookupBackend(BaseFilterBackend):
+class FieldLookupBackend(BaseFilterBackend):
     """
     Filter using field lookups provided via query string parameters.
+
+    Lookups that span multi-valued relations may match an object more than
+    once. Only if such lookups are present, filters are applied with a
+    semi-join (``pk IN (SELECT ...)``), that returns each object once
+    without adding ``DISTINCT`` to the query.
     """
 
-    RESERVED_NAMES = ('page', 'page_size', 'format', 'order', 'order_by',
-                      'search')
+    RESERVED_NAMES = ('page', 'page_size', 'cursor', 'format', 'order',
+                      'order_by', 'search')
 
     SUPPORTED_LOOKUPS = ('exact', 'iexact', 'contains', 'icontains',
                          'startswith', 'istartswith', 'endswith', 'iendswith',
@@ -92,6 +92,26 @@ class _FieldLookupBackend(BaseFilterBackend):
                     model = field.model
         return field
 
+    def is_multivalued_lookup(self, model, lookup):
+        """
+        Returns True if a lookup traverses a many-to-many or a reverse
+        foreign key relation.
+        """
+        parts = lookup.split('__')
+        if parts[-1] in self.SUPPORTED_LOOKUPS:
+            parts.pop()
+        for name in parts:
+            if name == 'pk':
+                field = model._meta.pk
+            else:
+                field = model._meta.get_field(name)
+            if field.many_to_many or field.one_to_many:
+                return True
+            if not field.is_relation:
+                break
+            model = field.related_model
+        return False
+
     def to_python_boolean(self, value, allow_none=False):
         value = str(value)
         if value.lower() in ('true', '1'):
@@ -178,6 +198,7 @@ class _FieldLookupBackend(BaseFilterBackend):
             and_filters = []
             or_filters = []
             chain_filters = []
+            multivalued = False
             for key, values in request.GET.lists():
                 if key in self.RESERVED_NAMES:
                     continue
@@ -211,6 +232,9 @@ class _FieldLookupBackend(BaseFilterBackend):
                     key = key[5:]
                     q_not = True
 
+                multivalued = multivalued or self.is_multivalued_lookup(
+                    queryset.model, key)
+
                 # Convert value(s) to python and add to the appropriate list.
                 for value in values:
                     if q_int:
@@ -225,6 +249,10 @@ class _FieldLookupBackend(BaseFilterBackend):
 
             # Now build Q objects for database query filter.
             if and_filters or or_filters or chain_filters:
+                if multivalued:
+                    filtered = queryset.model._default_manager.all()
+                else:
+                    filtered = queryset
                 args = []
                 for n, k, v in and_filters:
                     if n:
@@ -239,13 +267,17 @@ class _FieldLookupBackend(BaseFilterBackend):
                         else:
                             q |= Q(**{k: v})
                     args.append(q)
-                queryset = queryset.filter(*args)
+                filtered = filtered.filter(*args)
                 for n, k, v in chain_filters:
                     if n:
                         q = ~Q(**{k: v})
                     else:
                         q = Q(**{k: v})
-                    queryset = queryset.filter(q)
+                    filtered = filtered.filter(q)
+                if multivalued:
+                    filtered = queryset.filter(
+                        pk__in=filtered.values('pk'))
+                queryset = filtered
             return queryset
         except (FieldError, FieldDoesNotExist, ValueError) as e:
             raise ParseError(e.args[0])
@@ -253,13 +285,6 @@ class _FieldLookupBackend(BaseFilterBackend):
             raise ParseError(e.messages)
 
 
-class FieldLookupBackend(_FieldLookupBackend):
-    def filter_queryset(self, request, queryset, view):
-        qs = super().filter_queryset(
-            request, queryset, view)
-        return qs.distinct()
-
-
 class OrderByBackend(BaseFilterBackend):
     """
     Filter to apply ordering based on query string parameters.
@@ -14,14 +14,19 @@
 #
 # You should have received a copy of the Apache License
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+import base64
 import functools
+import json
 import operator
+import typing as t
+from collections import OrderedDict
 
 from django.contrib.postgres import search as psql_search
+from django.db import connection
 from django.db.models import fields as db_fields
-from django.db.models.expressions import Func, F, Case, When, Value, \
+from django.db.models.expressions import Func, F, Value, \
     ExpressionWrapper as Expr, RawSQL
-from django.db.models.functions.comparison import Coalesce
+from django.db.models.functions import Cast
 from django.db.models.query_utils import Q
 
 from galaxy import constants
@@ -31,18 +36,14 @@ from galaxy.main import models
 __all__ = (
     'CollectionSearch',
     'ContentSearch',
+    'SearchPage',
+    'UnifiedSearch',
 )
 
 
 RANK_FUNCTION = 'ts_rank'
 RANK_NORMALIZATION = 32
 
-VENDOR_RANK = 0.1
-DOWNLOAD_RANK_MULTIPLIER = 0.4
-CONTENT_SCORE_MULTIPLIER = 0.2
-COMMUNITY_SCORE_MODIFIER = 0.002
-COMMUNITY_SCORE_MODIFIER_MIN = 0.005
-
 CONTENT_MATCH_QUERY = """
     SELECT json_agg(json_build_object('name', cvc ->> 'name',
                                       'content_type', cvc ->> 'content_type'))
@@ -63,6 +64,24 @@ class BaseSearch:
     def search(self):
         raise NotImplementedError
 
+    def ranked(self):
+        """Returns filtered queryset annotated with relevance.
+
+        Unlike `search()` the returned queryset is not ordered and
+        does not load related objects.
+        """
+        raise NotImplementedError
+
+    def sort_fields(self):
+        """Returns list of field names used for ordering."""
+        if self.order_by == 'qualname':
+            return ['namespace__name', 'name']
+        return [self.order_by]
+
+    def _add_order_by(self, qs):
+        prefix = '-' if self.order == 'desc' else ''
+        return qs.order_by(*[prefix + f for f in self.sort_fields()])
+
 
 class CollectionSearch(BaseSearch):
     """Builds queries to search for collections."""
@@ -77,6 +96,9 @@ class CollectionSearch(BaseSearch):
         qs = self._add_order_by(qs)
         return qs
 
+    def ranked(self):
+        return self._add_relevance(self._base_queryset())
+
     def _base_queryset(self):
         """Returns generic queryset used both for count and search."""
         qs = models.Collection.objects.order_by()
@@ -140,39 +162,17 @@ class CollectionSearch(BaseSearch):
         """Annotates query with relevance based on quality score.
 
         It is calculated by a formula:
-            R = log(Q + 1) + 0.1 * v
+            R = 0.2 * log(Q + 1) + 0.1 * v
         Where:
             R - Relevance;
             Q - Quality score (0 to 5);
             v - 1 if collection belongs to a partner namespace, otherwise 0.
-        """
-        quality_rank_expr = (
-            Func(Coalesce(F('latest_version__quality_score'), 0) + 1,
-                 function='log')
-            * CONTENT_SCORE_MULTIPLIER
-        )
-        vendor_rank_expr = Case(
-            When(namespace__is_vendor=True, then=Value(VENDOR_RANK)),
-            When(namespace__is_vendor=False, then=Value(0)),
-        )
-        relevance_expr = F('quality_rank') + F('vendor_rank')
-        return qs.annotate(
-            quality_rank=Expr(
-                quality_rank_expr, output_field=db_fields.FloatField()),
-            vendor_rank=Expr(
-                vendor_rank_expr, output_field=db_fields.FloatField()),
-            relevance=Expr(
-                relevance_expr, output_field=db_fields.FloatField()),
-        )
 
-    def _add_order_by(self, qs):
-        order_by = self.order_by
-        prefix = '-' if self.order == 'desc' else ''
-        if order_by == 'qualname':
-            order_by = [prefix + 'namespace__name', prefix + 'name']
-        else:
-            order_by = [prefix + order_by]
-        return qs.order_by(*order_by)
+        Relevance is precomputed and stored in `search_relevance` column,
+        which is maintained by database triggers. This allows ordering
+        by relevance using an index scan.
+        """
+        return qs.annotate(relevance=F('search_relevance'))
 
     def _add_content_match(self, collections):
         keywords = self.filters.get('keywords')
@@ -219,6 +219,10 @@ class ContentSearch(BaseSearch):
         qs = self._add_order_by(qs)
         return qs
 
+    def ranked(self):
+        qs = self._add_search_rank(self._base_queryset())
+        return self._add_relevance(qs)
+
     def _base_queryset(self):
         """Returns generic queryset used both for count and search."""
         qs = models.Content.objects.order_by().filter(
@@ -314,70 +318,264 @@ class ContentSearch(BaseSearch):
             Dr = 0.4 * --------------
                        ln(cd + 1) + 1
 
+        where `cd` is a download count modified by a community score:
+
+            cd = (0.002 * c + 0.005) * d
+
+        We're using the community_score as a modifier to the download count
+        instead of just allocating a certain number of points based on the
+        score. The reason for this is that the download score is
+        a logaritmic scale so adding a fixed number of points ended up
+        boosting scores way too much for content with low numbers of
+        downloads. This system allows for the weight of the community score
+        to scale with the number of downloads.
+
         Quality rank is calculated by a formula:
 
             Qr = 0.2 * log(Q + 1)
 
+        This function is better than using a linear function because it
+        makes it so that the effect of losing the first few points is
+        relatively minor, which reduces the impact of errors in scoring.
+
+        Download and quality ranks do not depend on search query, so they
+        are precomputed and stored in `search_download_rank` and
+        `search_relevance` columns, which are maintained by database
+        triggers. If no keywords specified, relevance is read directly
+        from an indexed `search_relevance` column.
         """
-        c = 'repository__community_score'
-        d = 'repository__download_count'
-
-        # ln((MOD*c + MIN) * d + 1)
-        # where c = community_score and d = download_count
-        # We're using the community_score as a modifier to the download count
-        # instead of just allocating a certain number of points based on the
-        # score. The reason for this is that the download score is
-        # a logaritmic scale so adding a fixed number of points ended up
-        # boosting scores way too much for content with low numbers of
-        # downloads. This system allows for the weight of the community score
-        # to scale with the number of downloads
-        download_count_ln_expr = Func(
-            (((Coalesce(F(c), 0) * COMMUNITY_SCORE_MODIFIER) +
-              COMMUNITY_SCORE_MODIFIER_MIN)
-             * F(d)) + 1,
-            function='ln'
-        )
-        download_rank_expr = (
-                F('download_count_ln')
-                / (1 + F('download_count_ln'))
-                * DOWNLOAD_RANK_MULTIPLIER
-        )
+        if self.filters.get('keywords'):
+            relevance_expr = Expr(
+                F('search_rank') + F('search_relevance'),
+                output_field=db_fields.FloatField())
+        else:
+            relevance_expr = F('search_relevance')
 
-        q = 'repository__quality_score'
-        # This function is better than using a linear function because it
-        # makes it so that the effect of losing the first few points is
-        # relatively minor, which reduces the impact of errors in scoring.
-        quality_rank_expr = (
-                Func(Coalesce(F(q), 0) + 1, function='log')
-                * CONTENT_SCORE_MULTIPLIER
+        return qs.annotate(
+            download_rank=F('search_download_rank'),
+            relevance=relevance_expr,
         )
 
-        relevance_expr = (
-                F('search_rank') + F('download_rank') + F('quality_rank')
-        )
+    def sort_fields(self):
+        if self.order_by == 'download_count':
+            return ['repository__download_count']
+        return super().sort_fields()
 
-        return qs.annotate(
-            download_count_ln=Expr(
-                download_count_ln_expr,
-                output_field=db_fields.FloatField()),
-            download_rank=Expr(
-                download_rank_expr,
-                output_field=db_fields.FloatField()),
-            quality_rank=Expr(
-                quality_rank_expr,
-                output_field=db_fields.FloatField()),
-            relevance=Expr(
-                relevance_expr,
-                output_field=db_fields.FloatField()),
-        )
 
-    def _add_order_by(self, qs):
-        order_by = self.order_by
+class SearchPage(t.NamedTuple):
+    collections: t.List[models.Collection]
+    content: t.List[models.Content]
+    next_cursor: t.Optional[str]
+
+
+class UnifiedSearch:
+    """Searches collections and content with a single ranked query.
+
+    Matching collections and content items are merged with ``UNION ALL``
+    and ordered by entity kind (collections go first), sort key and id.
+    Only ids are selected by the ranked query, objects for a page are
+    loaded afterwards by their ids.
+
+    Both offset and keyset pagination are supported. A cursor encodes
+    the sort key of the last item on a page, so that fetching the next
+    page does not require scanning skipped rows.
+    """
+
+    KIND_COLLECTION = 0
+    KIND_CONTENT = 1
+
+    def __init__(self, filters, order_by='relevance', order='desc',
+                 collections=True, content=True):
+        self.order_by = order_by
+        self.order = order
+        self.searches = OrderedDict()
+        if collections:
+            self.searches[self.KIND_COLLECTION] = CollectionSearch(
+                filters, order_by, order)
+        if content:
+            self.searches[self.KIND_CONTENT] = ContentSearch(
+                filters, order_by, order)
+
+    def count(self, estimated=False):
+        """Returns number of matching collections and content items.
+
+        If `estimated` is True, row estimates from query planner are
+        returned instead of exact values. This avoids a full scan
+        of matching rows for large result sets.
+        """
+        querysets = {kind: search.ranked().values('pk')
+                     for kind, search in self.searches.items()}
+        if not querysets:
+            return 0, 0
+        if estimated:
+            counts = {kind: _estimate_count(qs)
+                      for kind, qs in querysets.items()}
+        else:
+            counts = dict(zip(querysets, _count(querysets.values())))
+        return (counts.get(self.KIND_COLLECTION, 0),
+                counts.get(self.KIND_CONTENT, 0))
+
+    def search(self, limit, offset=0, cursor=None):
+        """Returns a page of search results.
+
+        :param limit: Maximum number of items on a page.
+        :param offset: Number of items to skip. Ignored if `cursor`
+            is specified.
+        :param cursor: A cursor returned with a previous page.
+        :raises ValueError: If cursor is invalid.
+        """
+        after = self.decode_cursor(cursor) if cursor else None
+        branches = [self._branch(kind, search, after)
+                    for kind, search in self.searches.items()
+                    if after is None or kind >= after[0]]
+        if not branches:
+            return SearchPage([], [], None)
+
+        qs = branches[0]
+        if len(branches) > 1:
+            qs = qs.union(*branches[1:], all=True)
+
         prefix = '-' if self.order == 'desc' else ''
-        if order_by == 'qualname':
-            order_by = [prefix + 'namespace__name', prefix + 'name']
-        elif order_by == 'download_count':
-            order_by = [prefix + 'repository__download_count']
+        sort_keys = [prefix + key for key in self._sort_keys()]
+        qs = qs.order_by('result_kind', *sort_keys, prefix + 'result_id')
+        if after is None:
+            rows = list(qs[offset:offset + limit + 1])
         else:
-            order_by = [prefix + order_by]
-        return qs.order_by(*order_by)
+            rows = list(qs[:limit + 1])
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self.encode_cursor(rows[-1])
+
+        ids = {kind: [] for kind in self.searches}
+        for row in rows:
+            ids[row[0]].append(row[-1])
+
+        collections = []
+        if ids.get(self.KIND_COLLECTION):
+            search = self.searches[self.KIND_COLLECTION]
+            collections = _load_ordered(
+                search.search(), ids[self.KIND_COLLECTION])
+            search._add_content_match(collections)
+
+        content = []
+        if ids.get(self.KIND_CONTENT):
+            search = self.searches[self.KIND_CONTENT]
+            content = _load_ordered(search.search(), ids[self.KIND_CONTENT])
+
+        return SearchPage(collections, content, next_cursor)
+
+    @staticmethod
+    def encode_cursor(row):
+        # Floats are serialized with `repr`, which preserves exact values,
+        # so stored relevance can be compared without rounding.
+        data = json.dumps(list(row), separators=(',', ':'))
+        return base64.urlsafe_b64encode(data.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            data = base64.urlsafe_b64decode(cursor.encode())
+            values = json.loads(data.decode())
+        except (TypeError, ValueError):
+            raise ValueError('Invalid cursor.')
+        if (not isinstance(values, list)
+                or len(values) != len(self._sort_keys()) + 2
+                or values[0] not in (self.KIND_COLLECTION,
+                                     self.KIND_CONTENT)):
+            raise ValueError('Invalid cursor.')
+        value_types = self._sort_key_types() + [int]
+        for value, value_type in zip(values[1:], value_types):
+            # NOTE: bool is a subclass of int
+            if isinstance(value, bool) or not isinstance(value, value_type):
+                raise ValueError('Invalid cursor.')
+        return values
+
+    def _sort_keys(self):
+        # NOTE: Collections and content are always sorted by the same
+        #   number of fields.
+        search = next(iter(self.searches.values()), None)
+        if search is None:
+            return []
+        return [f'sort_key_{i}' for i in range(len(search.sort_fields()))]
+
+    def _sort_key_types(self):
+        """Returns types of sort key values as passed through a cursor."""
+        search = next(iter(self.searches.values()), None)
+        if search is None:
+            return []
+        types = []
+        for field in search.sort_fields():
+            if field == 'relevance':
+                types.append((int, float))
+            elif field.endswith('download_count'):
+                types.append(int)
+            else:
+                types.append(str)
+        return types
+
+    def _branch(self, kind, search, after):
+        """Returns a queryset selecting kind, sort keys and id of results."""
+        annotations = OrderedDict()
+        annotations['result_kind'] = Value(
+            kind, output_field=db_fields.IntegerField())
+        for key, field in zip(self._sort_keys(), search.sort_fields()):
+            if field == 'relevance' and search.filters.get('keywords'):
+                # `ts_rank` returns a single precision value, that can't be
+                # compared exactly with a cursor value. Keyword relevance
+                # is computed for each row anyway, so the cast is free.
+                annotations[key] = Cast(F(field), db_fields.FloatField())
+            else:
+                annotations[key] = F(field)
+        annotations['result_id'] = F('pk')
+
+        qs = search.ranked().annotate(**annotations)
+        if after is not None and kind == after[0]:
+            qs = qs.filter(self._keyset_filter(after[1:]))
+        return qs.values_list(*annotations.keys())
+
+    def _keyset_filter(self, values):
+        """Builds a filter selecting rows following the cursor values.
+
+        Equivalent of row comparison ``(k1, ..., kN, id) < (v1, ..., vN, i)``
+        (or ``>`` for ascending order), expanded into conditions on
+        individual columns.
+        """
+        lookup = 'lt' if self.order == 'desc' else 'gt'
+        keys = self._sort_keys() + ['result_id']
+        conditions = []
+        for i, key in enumerate(keys):
+            condition = Q(**{f'{key}__{lookup}': values[i]})
+            for prev_key, prev_value in zip(keys[:i], values[:i]):
+                condition &= Q(**{prev_key: prev_value})
+            conditions.append(condition)
+        return functools.reduce(operator.or_, conditions)
+
+
+def _count(querysets):
+    """Counts rows of each queryset in a single database query."""
+    parts, params = [], []
+    for qs in querysets:
+        sql, qs_params = qs.query.sql_with_params()
+        parts.append(f'(SELECT COUNT(*) FROM ({sql}) AS subquery)')
+        params.extend(qs_params)
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT ' + ', '.join(parts), params)
+        return cursor.fetchone()
+
+
+def _estimate_count(qs):
+    """Returns number of rows estimated by PostgreSQL query planner."""
+    sql, params = qs.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def _load_ordered(qs, ids):
+    """Loads objects by ids preserving order of ids."""
+    objects = {obj.pk: obj for obj in qs.filter(pk__in=ids)}
+    return [objects[pk] for pk in ids if pk in objects]
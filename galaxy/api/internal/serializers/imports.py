@@ -38,7 +38,8 @@ class CollectionImportTaskItem(serializers.ModelSerializer):
     class Meta:
         model = models.CollectionImport
         fields = ('id', 'href', 'type', 'state', 'started_at', 'finished_at',
-                  'namespace', 'name', 'version')
+                  'namespace', 'name', 'version',
+                  'error_count', 'warning_count')
 
     def get_type(self, obj):
         return TYPE_COLLECTION
@@ -68,7 +69,7 @@ class RepositoryImportTaskItem(serializers.ModelSerializer):
     class Meta:
         model = models.ImportTask
         fields = ('id', 'href', 'type', 'state', 'started_at', 'finished_at',
-                  'namespace', 'name')
+                  'namespace', 'name', 'error_count', 'warning_count')
 
     def get_type(self, obj):
         return TYPE_REPOSITORY
@@ -22,7 +22,7 @@ from django.test import TestCase
 from galaxy import constants
 from galaxy.main import models
 from galaxy.api.internal.search import (
-    BaseSearch, CollectionSearch, ContentSearch
+    BaseSearch, CollectionSearch, ContentSearch, UnifiedSearch
 )
 
 
@@ -288,6 +288,19 @@ class TestCollectionSearch(CommonSearchTestMixin, TestCase):
         # TODO(cutwater): Requires discussion of quality relevance function.
         pass
 
+    def test_search_relevance_follows_vendor_flag(self):
+        query = CollectionSearch(
+            {'names': ['nginx', 'docker']}, order_by='relevance')
+        self._assert_search_results(
+            query, ['docker', 'nginx'], check_order=True)
+
+        models.Namespace.objects.filter(name='cloudtools').update(
+            is_vendor=False)
+        models.Namespace.objects.filter(name='webtools').update(
+            is_vendor=True)
+        self._assert_search_results(
+            query, ['nginx', 'docker'], check_order=True)
+
     def test_order_by_download_count(self):
         expected = ['openstack', 'nginx', 'kubernetes',
                     'uwsgi', 'docker', 'apache2']
@@ -481,6 +494,17 @@ class TestContentSearch(CommonSearchTestMixin, TestCase):
         self._assert_search_results(
             query, ['apache2', 'nginx'], check_order=True)
 
+    def test_search_relevance_follows_repository_counters(self):
+        query = ContentSearch(
+            {'names': ['nginx', 'apache2']}, order_by='relevance')
+        self._assert_search_results(
+            query, ['nginx', 'apache2'], check_order=True)
+
+        models.Repository.objects.filter(name='apache2').update(
+            download_count=10000000, quality_score=5.0)
+        self._assert_search_results(
+            query, ['apache2', 'nginx'], check_order=True)
+
     def test_order_by_download_count(self):
         expected = ['openstack', 'nginx', 'kubernetes',
                     'uwsgi', 'docker', 'apache2']
@@ -511,3 +535,95 @@ class TestContentSearch(CommonSearchTestMixin, TestCase):
                     'openstack', 'kubernetes', 'docker']
         query = ContentSearch({}, order_by='qualname', order='desc')
         self._assert_search_results(query, expected, check_order=True)
+
+
+class TestUnifiedSearch(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        namespace = models.Namespace.objects.create(name='webtools')
+        provider = models.Provider.objects.get(name='GitHub')
+        provider_ns = models.ProviderNamespace.objects.create(
+            provider=provider, namespace=namespace, name='webtools')
+        content_type = models.ContentType.get(constants.ContentType.ROLE)
+
+        for i, name in enumerate(['nginx', 'apache2', 'uwsgi']):
+            models.Collection.objects.create(
+                namespace=namespace, name=name, download_count=i)
+
+            repository = models.Repository.objects.create(
+                name=name, provider_namespace=provider_ns,
+                download_count=i * 1000)
+            models.Content.objects.create(
+                namespace=namespace, name=name, repository=repository,
+                content_type=content_type)
+
+    def _names(self, page):
+        return ([c.name for c in page.collections],
+                [c.name for c in page.content])
+
+    def test_count(self):
+        search = UnifiedSearch({})
+        assert search.count() == (3, 3)
+
+        search = UnifiedSearch({'names': ['nginx']}, content=False)
+        assert search.count() == (1, 0)
+
+    def test_offset_pagination(self):
+        search = UnifiedSearch({}, order_by='name', order='asc')
+
+        page = search.search(limit=4)
+        assert self._names(page) == (
+            ['apache2', 'nginx', 'uwsgi'], ['apache2'])
+        assert page.next_cursor is not None
+
+        page = search.search(limit=4, offset=4)
+        assert self._names(page) == ([], ['nginx', 'uwsgi'])
+        assert page.next_cursor is None
+
+    def _fetch_all_pages(self, search, limit):
+        collections, content = [], []
+        cursor = None
+        while True:
+            page = search.search(limit=limit, cursor=cursor)
+            collections.extend(c.name for c in page.collections)
+            content.extend(c.name for c in page.content)
+            cursor = page.next_cursor
+            if cursor is None:
+                return collections, content
+
+    def test_cursor_pagination(self):
+        search = UnifiedSearch({}, order_by='download_count', order='desc')
+        expected = self._names(search.search(limit=6))
+        assert expected == (
+            ['uwsgi', 'apache2', 'nginx'], ['uwsgi', 'apache2', 'nginx'])
+        assert self._fetch_all_pages(search, limit=2) == expected
+
+    def test_cursor_pagination_by_relevance(self):
+        search = UnifiedSearch({'keywords': 'webtools'})
+        expected = self._names(search.search(limit=6))
+        assert self._fetch_all_pages(search, limit=1) == expected
+
+    def test_cursor_pagination_by_stored_relevance(self):
+        search = UnifiedSearch({}, order_by='relevance', order='desc')
+        expected = self._names(search.search(limit=6))
+        assert self._fetch_all_pages(search, limit=1) == expected
+
+    def test_invalid_cursor(self):
+        search = UnifiedSearch({})
+        with self.assertRaises(ValueError):
+            search.search(limit=10, cursor='invalid')
+
+    def test_invalid_cursor_values(self):
+        search = UnifiedSearch({}, order_by='qualname')
+        for row in ([0, 'webtools', {'a': 1}, 1],
+                    [0, 'webtools', 'nginx', '1'],
+                    [0, ['webtools'], 'nginx', 1]):
+            with self.assertRaises(ValueError):
+                search.search(
+                    limit=10, cursor=UnifiedSearch.encode_cursor(row))
+
+        search = UnifiedSearch({}, order_by='download_count')
+        for row in ([0, 'abc', 1], [0, 1.5, 1], [0, True, 1]):
+            with self.assertRaises(ValueError):
+                search.search(
+                    limit=10, cursor=UnifiedSearch.encode_cursor(row))
@@ -19,6 +19,7 @@ from rest_framework import exceptions
 from galaxy.api import base
 from galaxy.api.internal import serializers
 from galaxy.main import models
+from galaxy.main import response_cache
 
 
 class CollectionList(base.ListAPIView):
@@ -45,3 +46,7 @@ class CollectionUpdate(base.UpdateAPIView):
 
         if not is_owner:
             raise exceptions.PermissionDenied()
+
+    def perform_update(self, serializer):
+        collection = serializer.save()
+        response_cache.invalidate(response_cache.collection_tag(collection.pk))
@@ -20,8 +20,7 @@ from galaxy.api import base
 from galaxy.api import exceptions
 from galaxy.api import serializers as serializers_v1
 from galaxy.api.internal import serializers as serializers_int
-from galaxy.api.internal.search import CollectionSearch, ContentSearch
-from galaxy.main import models
+from galaxy.api.internal.search import UnifiedSearch
 
 
 __all__ = (
@@ -38,6 +37,11 @@ ALLOWED_FORMAT_TYPES = [
     'role',
 ]
 
+ALLOWED_COUNT_MODES = [
+    'exact',
+    'estimated',
+]
+
 
 def _ensure_positive_int(string, field, cutoff=None):
     msg = f'{field} must be a positive integer'
@@ -52,7 +56,6 @@ def _ensure_positive_int(string, field, cutoff=None):
     return value
 
 
-# TODO(cutwater): Lazy pagination
 # TODO(cutwater): Implement autocomplete views
 class SearchView(base.APIView):
 
@@ -71,54 +74,41 @@ class SearchView(base.APIView):
     def get(self, request):
         page = self.get_page(request)
         page_size = self.get_page_size(request)
+        cursor = request.query_params.get('cursor')
+        estimated_count = self.get_count_mode(request) == 'estimated'
         order_by, order = self.get_order_by(request)
         format_type = self.get_format_type(request)
         filters = self._parse_query_params(request.query_params)
 
-        start = page_size * (page - 1)
-        end = page_size * page
-
-        # Collections
-        if format_type == 'role' \
-                or any(filters[k] for k in CONTENT_ONLY_FILTERS):
-            collections_count = 0
-            collections = []
-        else:
-            collection_search = CollectionSearch(filters, order_by, order)
-            collections_count = collection_search.count()
-            collections = collection_search.search()[start:end]
-            # TODO(cutwater): This function should be refactored in order
-            #  to annotate collection objects retrieved withing search class.
-            #  However due to initial design search() function returns
-            #  a queryset, while pagination is performed outside.
-            #  This makes injecting content_match currently impossible.
-            collection_search._add_content_match(collections)
-
-        # Contents
-        if format_type == 'collection':
-            content_count = 0
-            contents = []
-        else:
-            content_search = ContentSearch(filters, order_by, order)
-            content_count = content_search.count()
-            if len(collections) >= page_size:
-                contents = models.Content.objects.none()
-            else:
-                c_start = max(0, start - collections_count)
-                c_end = end - collections_count
-                contents = content_search.search()[c_start:c_end]
+        search = UnifiedSearch(
+            filters, order_by, order,
+            collections=not (
+                format_type == 'role'
+                or any(filters[k] for k in CONTENT_ONLY_FILTERS)),
+            content=(format_type != 'collection'),
+        )
+
+        try:
+            result_page = search.search(
+                limit=page_size, offset=page_size * max(page - 1, 0),
+                cursor=cursor)
+        except ValueError as e:
+            raise exceptions.ValidationError(detail=str(e))
+        collections_count, content_count = search.count(
+            estimated=estimated_count)
 
         result = {
             'collection': {
                 'count': collections_count,
                 'results': serializers_int.CollectionSearchSerializer(
-                    collections, many=True).data
+                    result_page.collections, many=True).data
             },
             'content': {
                 'count': content_count,
                 'results': serializers_v1.RoleSearchSerializer(
-                    contents, many=True).data,
+                    result_page.content, many=True).data,
             },
+            'next_cursor': result_page.next_cursor,
         }
 
         return Response(result)
@@ -132,6 +122,13 @@ class SearchView(base.APIView):
             request.query_params.get('page_size', self.page_size), 'page_size',
             self.max_page_size)
 
+    def get_count_mode(self, request):
+        mode = request.query_params.get('count', 'exact').lower()
+        if mode not in ALLOWED_COUNT_MODES:
+            raise exceptions.ValidationError(
+                f'{repr(mode)} is not a valid count mode.')
+        return mode
+
     def get_order_by(self, request):
         param = request.query_params.get(
             self.ordering_param, self.default_ordering)
@@ -23,13 +23,18 @@ from rest_framework import pagination
 from rest_framework import response
 from rest_framework.utils.urls import remove_query_param, replace_query_param
 
+from galaxy.api.v2.pagination import CursorPaginationMixin
 
-class PageNumberPagination(pagination.PageNumberPagination):
+
+class PageNumberPagination(CursorPaginationMixin,
+                           pagination.PageNumberPagination):
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 1000
 
     def get_next_link(self):
+        if self.cursor_mode:
+            return self.get_next_cursor_link(self.request.get_full_path())
         if not self.page.has_next():
             return None
         url = self.request.get_full_path()
@@ -37,6 +42,8 @@ class PageNumberPagination(pagination.PageNumberPagination):
         return replace_query_param(url, self.page_query_param, page_number)
 
     def get_previous_link(self):
+        if self.cursor_mode:
+            return None
         if not self.page.has_previous():
             return None
         url = self.request.get_full_path()
@@ -53,11 +60,13 @@ class PageNumberPagination(pagination.PageNumberPagination):
         previous_page = (previous_link.replace('/api/v1', '')
                          if previous_link is not None else None)
 
-        return response.Response(OrderedDict([
-            ('count', self.page.paginator.count),
-            ('next', next_page),
-            ('next_link', next_link),
-            ('previous', previous_page),
-            ('previous_link', previous_link),
-            ('results', data),
-        ]))
+        fields = OrderedDict()
+        # Items are not counted in cursor mode
+        if not self.cursor_mode:
+            fields['count'] = self.page.paginator.count
+        fields['next'] = next_page
+        fields['next_link'] = next_link
+        fields['previous'] = previous_page
+        fields['previous_link'] = previous_link
+        fields['results'] = data
+        return response.Response(fields)
@@ -15,10 +15,16 @@
 # You should have received a copy of the Apache License
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 
+import collections
+import operator
+
+from django.db.models import Prefetch, prefetch_related_objects
 from django.urls import reverse
 from rest_framework import serializers as drf_serializers
 
-from galaxy.main.models import Repository
+from galaxy.main.models import (
+    Content, ImportTask, Repository, RepositoryContentCount,
+    RepositoryVersion)
 from . import serializers
 
 
@@ -27,14 +33,87 @@ __all__ = [
 ]
 
 
+class RepositorySummaryLoader:
+    """Loads related objects of repository summaries in bulk.
+
+    Each relation is fetched with a single query for all repositories,
+    so the number of queries doesn't depend on the number of repositories.
+    """
+
+    def __init__(self, repositories):
+        repositories = [
+            r for r in repositories if isinstance(r, Repository)]
+        ids = [r.pk for r in repositories]
+
+        prefetch_related_objects(
+            repositories,
+            'owners',
+            'readme',
+            'provider_namespace__provider',
+            'provider_namespace__namespace',
+            Prefetch(
+                'content_objects',
+                queryset=Content.objects.select_related('content_type')),
+        )
+
+        self._latest_imports = {
+            task.repository_id: task for task in ImportTask.objects
+            .filter(repository__in=ids)
+            .order_by('repository_id', '-id')
+            .distinct('repository_id')
+            .only('id', 'repository_id', 'state', 'started', 'finished',
+                  'created', 'modified')
+        }
+
+        self._content_counts = collections.defaultdict(dict)
+        for row in (RepositoryContentCount.objects
+                    .filter(repository__in=ids, count__gt=0)
+                    .values('repository_id', 'content_type__name', 'count')
+                    .order_by('repository_id', 'content_type__name')):
+            self._content_counts[row['repository_id']][
+                row['content_type__name']] = row['count']
+
+        self._versions = collections.defaultdict(list)
+        for version in RepositoryVersion.objects.filter(
+                repository__in=ids, version__isnull=False):
+            self._versions[version.repository_id].append(version)
+        for versions in self._versions.values():
+            versions.sort(key=operator.attrgetter('version'), reverse=True)
+
+    def get_latest_import(self, repository):
+        return self._latest_imports.get(repository.pk)
+
+    def get_content_counts(self, repository):
+        return self._content_counts.get(repository.pk, {})
+
+    def get_versions(self, repository):
+        """Returns repository versions, highest first."""
+        return self._versions.get(repository.pk, [])
+
+
+class RepositoryListSerializer(drf_serializers.ListSerializer):
+    """Loads summaries of all serialized repositories at once."""
+
+    def to_representation(self, data):
+        repositories = list(data.all() if hasattr(data, 'all') else data)
+        self.child.summaries = RepositorySummaryLoader(repositories)
+        try:
+            return super().to_representation(repositories)
+        finally:
+            self.child.summaries = None
+
+
 class RepositorySerializer(serializers.BaseSerializer):
     external_url = drf_serializers.SerializerMethodField()
     readme = drf_serializers.SerializerMethodField()
     readme_html = drf_serializers.SerializerMethodField()
     download_url = drf_serializers.SerializerMethodField()
 
+    summaries = None
+
     class Meta:
         model = Repository
+        list_serializer_class = RepositoryListSerializer
         fields = serializers.BASE_FIELDS + (
             'id',
             'original_name',
@@ -92,9 +171,15 @@ class RepositorySerializer(serializers.BaseSerializer):
                 kwargs={'pk': instance.provider_namespace.namespace.pk})
         return related
 
+    def _get_summaries(self, instance):
+        if self.summaries is None:
+            return RepositorySummaryLoader([instance])
+        return self.summaries
+
     def get_summary_fields(self, instance):
         if not isinstance(instance, Repository):
             return {}
+        summaries = self._get_summaries(instance)
         owners = [{
             'id': u.id,
             'avatar_url': u.avatar_url,
@@ -118,14 +203,14 @@ class RepositorySerializer(serializers.BaseSerializer):
                 'is_vendor': namespace_obj.is_vendor
             }
         latest_import = {}
-        import_tasks = instance.import_tasks.order_by('-id')
-        if len(import_tasks):
-            latest_import['id'] = import_tasks[0].id
-            latest_import['state'] = import_tasks[0].state
-            latest_import['started'] = import_tasks[0].started
-            latest_import['finished'] = import_tasks[0].finished
-            latest_import['created'] = import_tasks[0].created
-            latest_import['modified'] = import_tasks[0].modified
+        import_task = summaries.get_latest_import(instance)
+        if import_task is not None:
+            latest_import['id'] = import_task.id
+            latest_import['state'] = import_task.state
+            latest_import['started'] = import_task.started
+            latest_import['finished'] = import_task.finished
+            latest_import['created'] = import_task.created
+            latest_import['modified'] = import_task.modified
 
         content_objects = [
             {
@@ -138,17 +223,13 @@ class RepositorySerializer(serializers.BaseSerializer):
             for c in instance.content_objects.all()
         ]
 
-        content_counts = {
-            c['content_type__name']: c['count']
-            for c in instance.content_counts
-        }
+        content_counts = summaries.get_content_counts(instance)
 
         versions = []
 
-        for version in instance.all_versions():
+        for version in summaries.get_versions(instance):
             versions.append({
-                'download_url':
-                    version.repository.get_download_url(version.tag),
+                'download_url': instance.get_download_url(version.tag),
                 'version': str(version.version)
             })
 
@@ -183,4 +264,9 @@ class RepositorySerializer(serializers.BaseSerializer):
         return None
 
     def get_download_url(self, obj):
-        return obj.get_download_url()
+        if self.summaries is None:
+            return obj.get_download_url()
+        versions = self.summaries.get_versions(obj)
+        if versions:
+            return obj.get_download_url(versions[0].tag)
+        return obj.get_download_url(obj.import_branch)
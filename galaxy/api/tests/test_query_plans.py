@@ -0,0 +1,133 @@
+# (c) 2012-2019, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status as http_codes
+from rest_framework.test import APITestCase
+
+from galaxy import constants
+from galaxy.main import models
+
+UserModel = get_user_model()
+
+
+def _iter_plan_nodes(node):
+    yield node
+    for child in node.get('Plans', []):
+        yield from _iter_plan_nodes(child)
+
+
+class TestListQueryPlans(APITestCase):
+    """Checks query plans of list endpoints for duplicate elimination.
+
+    DISTINCT makes PostgreSQL sort or hash whole result rows, it must only
+    be used when a filter spans a multi-valued relation.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.owner = UserModel.objects.create(username='alice')
+        self.namespace = models.Namespace.objects.create(name='alice')
+        self.namespace.owners.add(self.owner)
+        provider = models.Provider.objects.get(name='GitHub')
+        provider_ns = models.ProviderNamespace.objects.create(
+            name='alice', namespace=self.namespace, provider=provider)
+        repository = models.Repository.objects.create(
+            provider_namespace=provider_ns, name='apache',
+            original_name='apache')
+        models.Content.objects.create(
+            namespace=self.namespace, repository=repository, name='apache',
+            content_type=models.ContentType.get(constants.ContentType.ROLE),
+            is_valid=True)
+
+    def _get_list_query(self, url, model):
+        """Requests a list endpoint and returns a query of a result page."""
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        assert response.status_code == http_codes.HTTP_200_OK
+        table = connection.ops.quote_name(model._meta.db_table)
+        queries = [
+            q['sql'] for q in ctx.captured_queries
+            if q['sql'].startswith('SELECT')
+            and q['sql'].split(' FROM ', 1)[1].startswith(table)
+            and ' LIMIT ' in q['sql']
+        ]
+        assert queries, f'No list query for {url}'
+        return queries[0], response.json()
+
+    def _explain(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN (FORMAT JSON) ' + sql)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return list(_iter_plan_nodes(plan[0]['Plan']))
+
+    def _assert_no_distinct(self, url, model):
+        sql, data = self._get_list_query(url, model)
+        assert not sql.startswith('SELECT DISTINCT'), sql
+        nodes = self._explain(sql)
+        node_types = {node['Node Type'] for node in nodes}
+        assert not node_types & {'Unique', 'Aggregate'}, node_types
+        return sql, data
+
+    def test_namespace_list(self):
+        self._assert_no_distinct('/api/v1/namespaces/', models.Namespace)
+
+    def test_namespace_list_filtered(self):
+        _, data = self._assert_no_distinct(
+            '/api/v1/namespaces/?name__icontains=ali&active=true',
+            models.Namespace)
+        assert data['count'] == 1
+
+    def test_provider_namespace_list(self):
+        self._assert_no_distinct(
+            '/api/v1/provider_namespaces/?provider__name=GitHub',
+            models.ProviderNamespace)
+
+    def test_content_list(self):
+        self._assert_no_distinct(
+            '/api/v1/content/?repository__name=apache', models.Content)
+
+    def test_role_list(self):
+        self._assert_no_distinct(
+            '/api/v1/roles/?namespace__name=alice', models.Content)
+
+    def test_sublist(self):
+        sql, data = self._assert_no_distinct(
+            f'/api/v1/namespaces/{self.namespace.pk}/content/',
+            models.Content)
+        assert data['count'] == 1
+        # Parent filter is applied once, without intersecting querysets
+        assert sql.count('"main_content"."namespace_id" =') == 1
+
+    def test_multivalued_lookup_uses_semi_join(self):
+        other = UserModel.objects.create(username='bob')
+        self.namespace.owners.add(other)
+
+        sql, data = self._get_list_query(
+            '/api/v1/namespaces/?owners__username__in=alice,bob',
+            models.Namespace)
+
+        assert not sql.startswith('SELECT DISTINCT'), sql
+        assert ' IN (SELECT ' in sql
+        assert [ns['name'] for ns in data['results']] == ['alice']
+        assert data['count'] == 1
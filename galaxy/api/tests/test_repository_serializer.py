@@ -0,0 +1,89 @@
+# (c) 2012-2019, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from galaxy import constants
+from galaxy.api import serializers
+from galaxy.main import models
+
+UserModel = get_user_model()
+
+
+class TestRepositorySerializer(TestCase):
+
+    def setUp(self):
+        self.owner = UserModel.objects.create(username='alice')
+        namespace = models.Namespace.objects.create(name='alice')
+        provider = models.Provider.objects.get(name='GitHub')
+        self.provider_ns = models.ProviderNamespace.objects.create(
+            name='alice', namespace=namespace, provider=provider)
+        self.content_type = models.ContentType.get(
+            constants.ContentType.ROLE)
+
+    def _create_repository(self, name):
+        repository = models.Repository.objects.create(
+            provider_namespace=self.provider_ns, name=name,
+            original_name=name)
+        repository.owners.add(self.owner)
+        models.Content.objects.create(
+            namespace=self.provider_ns.namespace, name=name,
+            repository=repository, content_type=self.content_type)
+        for version in ('1.0.0', '1.10.0', '1.2.0'):
+            repository.versions.create(version=version, tag=f'v{version}')
+        for _ in range(2):
+            models.ImportTask.objects.create(
+                repository=repository, owner=self.owner)
+        return repository
+
+    def _serialize(self):
+        with CaptureQueriesContext(connection) as ctx:
+            data = serializers.RepositorySerializer(
+                models.Repository.objects.order_by('pk'), many=True).data
+        return data, len(ctx.captured_queries)
+
+    def test_summary_fields(self):
+        repository = self._create_repository('apache')
+        latest_import = repository.import_tasks.order_by('-id').first()
+
+        (result,), _ = self._serialize()
+
+        summary = result['summary_fields']
+        assert summary['owners'][0]['username'] == 'alice'
+        assert summary['latest_import']['id'] == latest_import.id
+        assert summary['content_counts'] == {'role': 1}
+        assert [c['name'] for c in summary['content_objects']] == ['apache']
+        assert [v['version'] for v in summary['versions']] == [
+            '1.10.0', '1.2.0', '1.0.0']
+        assert summary['versions'][0]['download_url'].endswith(
+            '/alice/apache/archive/v1.10.0.tar.gz')
+        assert result['download_url'] == summary['versions'][0][
+            'download_url']
+
+    def test_query_count_does_not_depend_on_page_size(self):
+        self._create_repository('apache')
+        _, single_count = self._serialize()
+
+        self._create_repository('nginx')
+        self._create_repository('redis')
+        data, multiple_count = self._serialize()
+
+        assert len(data) == 3
+        assert multiple_count == single_count
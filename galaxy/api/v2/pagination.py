@@ -15,10 +15,287 @@
 # You should have received a copy of the Apache License
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 
+import base64
+import datetime
+import functools
+import json
+import operator
+from collections import OrderedDict
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework import exceptions
 from rest_framework import pagination
+from rest_framework import response
+from rest_framework.utils.urls import replace_query_param
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    # Unlike DjangoJSONEncoder, keeps microseconds, which keyset
+    # comparison depends on.
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class CursorPaginationMixin:
+    """Adds an opt-in keyset pagination mode to page number pagination.
+
+    The mode is enabled with the ``cursor`` query parameter, an empty
+    value requests the first page. Items are ordered by the queryset
+    ordering with ``pk`` as a tiebreaker, and a cursor encodes ordering
+    values of the last item on a page. The next page is selected with
+    a keyset condition instead of OFFSET and items are not counted,
+    so fetching a page costs the same regardless of its depth.
+
+    Only forward pagination is supported, ``previous`` link of a cursor
+    page is always empty.
+    """
+
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor.'
+
+    cursor_mode = False
+    next_cursor = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = self.cursor_query_param in request.query_params
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.next_cursor = None
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        ordering = get_keyset_ordering(queryset)
+        keys = [f'cursor_key_{i}' for i in range(len(ordering))]
+        queryset = queryset.annotate(**{
+            key: F(name) for key, (name, _, _) in zip(keys, ordering)
+        }).order_by(*[('-' if desc else '') + name
+                      for name, desc, _ in ordering])
+
+        cursor = request.query_params[self.cursor_query_param]
+        if cursor:
+            values = self.decode_cursor(cursor, ordering, queryset.model)
+            queryset = queryset.filter(
+                get_keyset_filter(keys, ordering, values))
+
+        items = list(queryset[:page_size + 1])
+        if len(items) > page_size:
+            items = items[:page_size]
+            self.next_cursor = self.encode_cursor(
+                ordering, [getattr(items[-1], key) for key in keys])
+        return items
+
+    def get_next_cursor_link(self, url):
+        if self.next_cursor is None:
+            return None
+        return replace_query_param(
+            url, self.cursor_query_param, self.next_cursor)
+
+    def get_next_link(self):
+        if self.cursor_mode:
+            return self.get_next_cursor_link(
+                self.request.build_absolute_uri())
+        return super().get_next_link()
+
+    def get_previous_link(self):
+        if self.cursor_mode:
+            return None
+        return super().get_previous_link()
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        return response.Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', None),
+            ('results', data),
+        ]))
+
+    def get_html_context(self):
+        if self.cursor_mode:
+            return {}
+        return super().get_html_context()
+
+    def get_schema_fields(self, view):
+        import coreapi
+        import coreschema
+        return super().get_schema_fields(view) + [
+            coreapi.Field(
+                name=self.cursor_query_param,
+                required=False,
+                location='query',
+                schema=coreschema.String(
+                    title='Cursor',
+                    description='The pagination cursor value.',
+                )
+            )
+        ]
+
+    @staticmethod
+    def encode_cursor(ordering, values):
+        data = json.dumps(
+            [[name for name, _, _ in ordering], values],
+            cls=CursorEncoder, separators=(',', ':'))
+        return base64.urlsafe_b64encode(data.encode()).decode()
+
+    def decode_cursor(self, cursor, ordering, model):
+        """Decodes ordering values of a cursor.
+
+        Cursors are bound to the ordering they were created with. Values
+        are converted with `to_python` of the model fields they order by.
+        """
+        try:
+            data = base64.urlsafe_b64decode(cursor.encode())
+            names, values = json.loads(data.decode())
+        except (TypeError, ValueError):
+            raise exceptions.NotFound(self.invalid_cursor_message)
+        if (names != [name for name, _, _ in ordering]
+                or not isinstance(values, list)
+                or len(values) != len(ordering)):
+            raise exceptions.NotFound(self.invalid_cursor_message)
+
+        result = []
+        for (name, _, nullable), value in zip(ordering, values):
+            if value is None:
+                if not nullable:
+                    raise exceptions.NotFound(self.invalid_cursor_message)
+                result.append(None)
+                continue
+            if not isinstance(value, (str, int, float)):
+                raise exceptions.NotFound(self.invalid_cursor_message)
+            field = _get_ordering_field(model, name)
+            if field is not None:
+                try:
+                    value = field.to_python(value)
+                except (ValidationError, TypeError, ValueError):
+                    raise exceptions.NotFound(self.invalid_cursor_message)
+            result.append(value)
+        return result
+
+
+def get_keyset_ordering(queryset):
+    """Returns ordering of a queryset as a list of field paths.
+
+    Ordering by a relation is expanded into ordering of the related
+    model, the same way Django does it. Ordering is terminated with
+    ``pk`` as a tiebreaker.
+
+    :return: List of ``(path, descending, nullable)`` tuples.
+    :raises ParseError: If queryset is ordered by an expression.
+    """
+    query = queryset.query
+    if query.order_by:
+        names = query.order_by
+    elif query.default_ordering:
+        names = query.get_meta().ordering
+    else:
+        names = []
+
+    ordering = []
+    for name in names:
+        if not isinstance(name, str) or name == '?':
+            raise exceptions.ParseError(
+                'Ordering is not supported by cursor pagination.')
+        desc = name.startswith('-')
+        ordering.extend(_expand_ordering(
+            queryset.model, name.lstrip('-'), desc))
+
+    for i, (name, _, _) in enumerate(ordering):
+        if name in ('pk', 'id'):
+            return ordering[:i + 1]
+    return ordering + [('pk', False, False)]
+
+
+def _expand_ordering(model, path, desc, prefix='', nullable=False):
+    opts = model._meta
+    parts = path.split(LOOKUP_SEP)
+    for i, part in enumerate(parts):
+        try:
+            field = opts.pk if part == 'pk' else opts.get_field(part)
+        except FieldDoesNotExist:
+            # Annotations
+            return [(prefix + path, desc, True)]
+        nullable = nullable or bool(
+            field.null or field.many_to_many or field.one_to_many)
+        if not field.is_relation or i == len(parts) - 1:
+            break
+        opts = field.related_model._meta
+
+    path = prefix + path
+    related = field.related_model if field.is_relation else None
+    if related is None or not related._meta.ordering \
+            or part == field.attname:
+        return [(path, desc, nullable)]
+
+    ordering = []
+    for name in related._meta.ordering:
+        ordering.extend(_expand_ordering(
+            related, name.lstrip('-'), desc != name.startswith('-'),
+            path + LOOKUP_SEP, nullable))
+    return ordering
+
+
+def _get_ordering_field(model, path):
+    """Returns a model field referenced by an ordering path.
+
+    :return: Model field or None for annotations.
+    """
+    opts = model._meta
+    field = None
+    for part in path.split(LOOKUP_SEP):
+        if field is not None:
+            if not field.is_relation:
+                return None
+            opts = field.related_model._meta
+        try:
+            field = opts.pk if part == 'pk' else opts.get_field(part)
+        except FieldDoesNotExist:
+            return None
+    if not hasattr(field, 'to_python'):
+        return None
+    return field
+
+
+def get_keyset_filter(keys, ordering, values):
+    """Builds a filter selecting rows that follow the cursor values.
+
+    Equivalent of a row comparison ``(k1, ..., kN) > (v1, ..., vN)``,
+    where each key is compared in its ordering direction, expanded into
+    conditions on individual keys. NULL values are sorted last in
+    ascending order and first in descending order, as PostgreSQL does.
+    """
+    conditions = []
+    for i, (key, (_, desc, nullable), value) in enumerate(
+            zip(keys, ordering, values)):
+        if value is None:
+            if desc:
+                condition = Q(**{f'{key}__isnull': False})
+            else:
+                continue
+        else:
+            condition = Q(**{f'{key}__{"lt" if desc else "gt"}': value})
+            if nullable and not desc:
+                condition |= Q(**{f'{key}__isnull': True})
+        for prev_key, prev_value in zip(keys[:i], values[:i]):
+            if prev_value is None:
+                condition &= Q(**{f'{prev_key}__isnull': True})
+            else:
+                condition &= Q(**{prev_key: prev_value})
+        conditions.append(condition)
+    if not conditions:
+        return Q(pk__in=[])
+    return functools.reduce(operator.or_, conditions)
 
 
-class DefaultPagination(pagination.PageNumberPagination):
+class DefaultPagination(CursorPaginationMixin,
+                        pagination.PageNumberPagination):
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 100
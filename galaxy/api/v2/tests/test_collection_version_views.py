@@ -221,6 +221,21 @@ class TestVersionListView(APITestCase):
             assert results[3]['version'] == self.version1.version
             assert results[4]['version'] == self.version5.version
 
+    def test_view_prerelease_ordering(self):
+        for version in ('2.12.2-rc.1', '2.12.2-alpha', '2.12.2-alpha.10',
+                        '2.12.2-alpha.9'):
+            models.CollectionVersion.objects.create(
+                collection=self.collection, version=version)
+
+        response = self.client.get(
+            self.url_id.format(pk=self.collection.pk))
+        assert response.status_code == http_codes.HTTP_200_OK
+        versions = [r['version'] for r in response.json()['results']]
+        assert versions[:6] == [
+            '2.12.2', '2.12.2-rc.1', '2.12.2-alpha.10', '2.12.2-alpha.9',
+            '2.12.2-alpha', '2.2.2',
+        ]
+
     def test_view_404(self):
         response = self.client.get(
             self.url_id.format(pk=self.collection.pk + 1))
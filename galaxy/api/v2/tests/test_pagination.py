@@ -0,0 +1,127 @@
+# (c) 2012-2019, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+import base64
+import json
+from urllib.parse import unquote
+
+from rest_framework import status as http_codes
+from rest_framework.test import APITestCase
+
+from galaxy import constants
+from galaxy.api.v2.pagination import DefaultPagination
+from galaxy.main import models
+
+
+class TestCursorPagination(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        for name in ('delta', 'alpha', 'charlie', 'bravo', 'echo'):
+            models.Namespace.objects.create(
+                name=name, company='acme' if name < 'd' else '')
+        self.collection = models.Collection.objects.create(
+            namespace=models.Namespace.objects.get(name='alpha'),
+            name='mycollection')
+        for version in ('1.0.0', '1.10.0', '1.2.0', '2.0.0-beta', '2.0.0'):
+            models.CollectionVersion.objects.create(
+                collection=self.collection, version=version)
+
+    def _crawl(self, url, key='next_link'):
+        pages = []
+        while url:
+            response = self.client.get(url)
+            assert response.status_code == http_codes.HTTP_200_OK
+            data = response.json()
+            assert 'count' not in data
+            pages.append(data['results'])
+            url = data[key]
+        return pages
+
+    def test_v1_namespaces(self):
+        pages = self._crawl('/api/v1/namespaces/?cursor=&page_size=2')
+        assert [[ns['name'] for ns in page] for page in pages] == [
+            ['alpha', 'bravo'], ['charlie', 'delta'], ['echo']]
+
+    def test_v1_filters_and_ordering(self):
+        pages = self._crawl(
+            '/api/v1/namespaces/?cursor=&page_size=2'
+            '&company=acme&order_by=-name')
+        assert [[ns['name'] for ns in page] for page in pages] == [
+            ['charlie', 'bravo'], ['alpha']]
+
+    def test_v1_roles_by_owner(self):
+        namespace = models.Namespace.objects.get(name='alpha')
+        provider_ns = models.ProviderNamespace.objects.create(
+            name='alpha', namespace=namespace,
+            provider=models.Provider.objects.get(name='GitHub'))
+        for name in ('apache', 'nginx', 'mysql'):
+            repository = models.Repository.objects.create(
+                provider_namespace=provider_ns, name=name,
+                original_name=name)
+            models.Content.objects.create(
+                namespace=namespace, repository=repository, name=name,
+                content_type=models.ContentType.get(
+                    constants.ContentType.ROLE),
+                is_valid=True)
+
+        pages = self._crawl(
+            '/api/v1/roles/?owner__username=alpha&cursor=&page_size=2')
+        assert [len(page) for page in pages] == [2, 1]
+        assert sorted(role['name'] for page in pages for role in page) == [
+            'apache', 'mysql', 'nginx']
+
+    def test_v2_versions(self):
+        pages = self._crawl(
+            '/api/v2/collections/alpha/mycollection/versions/'
+            '?cursor=&page_size=2', key='next')
+        assert [[v['version'] for v in page] for page in pages] == [
+            ['2.0.0', '2.0.0-beta'], ['1.10.0', '1.2.0'], ['1.0.0']]
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/v1/namespaces/?cursor=invalid')
+        assert response.status_code == http_codes.HTTP_404_NOT_FOUND
+
+        # Cursors are bound to ordering
+        response = self.client.get('/api/v1/namespaces/?cursor=&page_size=1')
+        cursor = response.json()['next_link'].split('cursor=')[1]
+        cursor = cursor.split('&')[0]
+        response = self.client.get(
+            f'/api/v1/namespaces/?cursor={cursor}&order_by=-name')
+        assert response.status_code == http_codes.HTTP_404_NOT_FOUND
+
+    def test_invalid_cursor_values(self):
+        response = self.client.get('/api/v1/namespaces/?cursor=&page_size=1')
+        cursor = response.json()['next_link'].split('cursor=')[1]
+        cursor = unquote(cursor.split('&')[0])
+        names, values = json.loads(base64.urlsafe_b64decode(cursor))
+        for index, value in ((0, {'a': 1}), (0, ['alpha']),
+                             (len(values) - 1, 'abc'),
+                             (len(values) - 1, None)):
+            invalid = list(values)
+            invalid[index] = value
+            cursor = DefaultPagination.encode_cursor(
+                [(name, False, False) for name in names], invalid)
+            response = self.client.get(
+                f'/api/v1/namespaces/?cursor={cursor}')
+            assert response.status_code == http_codes.HTTP_404_NOT_FOUND
+
+    def test_page_number_pagination(self):
+        response = self.client.get('/api/v1/namespaces/?page_size=2')
+        data = response.json()
+        assert data['count'] == 5
+        assert data['next'] == '/namespaces/?page=2&page_size=2'
@@ -0,0 +1,156 @@
+# (c) 2012-2019, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.http import QueryDict
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from rest_framework import status as http_codes
+
+from galaxy import constants
+from galaxy.main import models
+from galaxy.main import response_cache
+
+UserModel = get_user_model()
+
+
+def test_make_key_normalizes_query():
+    key1 = response_cache.make_key(
+        'http', 'testserver', '/api/v2/collections/',
+        QueryDict('page=2&page_size=10'), 'application/json')
+    key2 = response_cache.make_key(
+        'http', 'testserver', '/api/v2/collections/',
+        QueryDict('page_size=10&page=2'), 'application/json')
+    key3 = response_cache.make_key(
+        'http', 'example.com', '/api/v2/collections/',
+        QueryDict('page_size=10&page=2'), 'application/json')
+    assert key1 == key2
+    assert key1 != key3
+
+
+@override_settings(GALAXY_RESPONSE_CACHE='default')
+class TestResponseCache(APITestCase):
+    url = '/api/v2/collections/mynamespace/mycollection/'
+
+    def setUp(self):
+        super().setUp()
+        caches['default'].clear()
+        self.namespace = models.Namespace.objects.create(name='mynamespace')
+        self.collection = models.Collection.objects.create(
+            namespace=self.namespace, name='mycollection')
+
+    def _set_deprecated(self):
+        # Bypasses invalidation
+        models.Collection.objects.filter(
+            pk=self.collection.pk).update(deprecated=True)
+
+    def test_cached_until_invalidated(self):
+        response = self.client.get(self.url)
+        assert response.status_code == http_codes.HTTP_200_OK
+        assert response.json()['deprecated'] is False
+
+        self._set_deprecated()
+        response = self.client.get(self.url)
+        assert response.json()['deprecated'] is False
+
+        response_cache.invalidate(
+            response_cache.collection_tag(self.collection.pk))
+        response = self.client.get(self.url)
+        assert response.json()['deprecated'] is True
+
+    def test_invalidation_is_shared_by_urls(self):
+        url_id = f'/api/v2/collections/{self.collection.pk}/'
+        self.client.get(self.url)
+        self.client.get(url_id)
+
+        self._set_deprecated()
+        response_cache.invalidate(
+            response_cache.collection_tag(self.collection.pk))
+
+        assert self.client.get(self.url).json()['deprecated'] is True
+        assert self.client.get(url_id).json()['deprecated'] is True
+
+    def test_etag(self):
+        response = self.client.get(self.url)
+        etag = response['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == http_codes.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == etag
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH='"other"')
+        assert response.status_code == http_codes.HTTP_200_OK
+        assert response['ETag'] == etag
+
+    def test_not_found_is_not_cached(self):
+        url = '/api/v2/collections/mynamespace/other/'
+        assert self.client.get(url).status_code == \
+            http_codes.HTTP_404_NOT_FOUND
+
+        models.Collection.objects.create(
+            namespace=self.namespace, name='other')
+        assert self.client.get(url).status_code == http_codes.HTTP_200_OK
+
+    def test_authenticated_not_cached(self):
+        UserModel.objects.create_user(username='testuser', password='secret')
+        self.client.login(username='testuser', password='secret')
+
+        self.client.get(self.url)
+        self._set_deprecated()
+        response = self.client.get(self.url)
+        assert response.json()['deprecated'] is True
+
+
+@override_settings(GALAXY_RESPONSE_CACHE='default')
+class TestRoleListResponseCache(APITestCase):
+    url = '/api/v1/roles/?owner__username=mynamespace'
+
+    def setUp(self):
+        super().setUp()
+        caches['default'].clear()
+        namespace = models.Namespace.objects.create(name='mynamespace')
+        provider_ns = models.ProviderNamespace.objects.create(
+            name='mynamespace', namespace=namespace,
+            provider=models.Provider.objects.get(name='GitHub'))
+        self.repository = models.Repository.objects.create(
+            provider_namespace=provider_ns, name='myrole',
+            original_name='myrole')
+        models.Content.objects.create(
+            namespace=namespace, repository=self.repository, name='myrole',
+            content_type=models.ContentType.get(constants.ContentType.ROLE),
+            is_valid=True)
+
+    def _get_roles(self):
+        response = self.client.get(self.url)
+        assert response.status_code == http_codes.HTTP_200_OK
+        return response.json()['results']
+
+    def test_invalidated_on_repository_update(self):
+        roles = self._get_roles()
+        assert roles[0]['summary_fields']['repository']['deprecated'] is False
+
+        self.repository.deprecated = True
+        self.repository.save()
+        roles = self._get_roles()
+        assert roles[0]['summary_fields']['repository']['deprecated'] is True
+
+    def test_invalidated_on_repository_delete(self):
+        assert len(self._get_roles()) == 1
+
+        self.repository.delete()
+        assert self._get_roles() == []
@@ -34,6 +34,7 @@ from galaxy.api import base
 from galaxy.api import exceptions
 from galaxy.api.v2 import serializers
 from galaxy.main import models
+from galaxy.main import response_cache
 from galaxy.worker import tasks
 from galaxy.common import tasking
 
@@ -69,15 +70,15 @@ class ArtifactMaxSizeError(exceptions.ValidationError):
     default_code = 'invalid.artifact_exceeds_max_size'
 
 
-class CollectionDetailView(base.APIView):
+class CollectionDetailView(base.ResponseCacheMixin, base.RetrieveAPIView):
     permission_classes = (AllowAny, )
+    serializer_class = serializers.CollectionSerializer
 
-    def get(self, request, *args, **kwargs):
+    def get_object(self):
         """Return a collection."""
         collection = self._get_collection()
-        serializer = serializers.CollectionSerializer(
-            collection, context={'request': request})
-        return Response(serializer.data)
+        self.add_cache_tags(response_cache.collection_tag(collection.pk))
+        return collection
 
     def _get_collection(self):
         """Get collection from either id, or namespace and name."""
@@ -17,12 +17,11 @@
 
 
 from django.shortcuts import get_object_or_404
-from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
-import semantic_version
 
 from galaxy.api import base
 from galaxy.main import models
+from galaxy.main import response_cache
 from galaxy.api.v2 import serializers
 from galaxy.api.v2.pagination import DefaultPagination
 
@@ -34,31 +33,27 @@ __all__ = (
 )
 
 
-class VersionListView(base.ListAPIView):
+class VersionListView(base.ResponseCacheMixin, base.ListAPIView):
     permission_classes = (AllowAny, )
     serializer_class = serializers.VersionSummarySerializer
     pagination_class = DefaultPagination
 
     def get_queryset(self):
-        """Return list of versions for a specific collection."""
-        collection = self._get_collection()
-        return models.CollectionVersion.objects.filter(collection=collection)
-
-    def list(self, request, *args, **kwargs):
-        """Override drf ListModelMixin to sort versions by semver."""
-        queryset = self.filter_queryset(self.get_queryset())
-
-        data = sorted(queryset,
-                      key=lambda x: semantic_version.Version(x.version),
-                      reverse=True)
-
-        page = self.paginate_queryset(data)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+        """Return list of versions for a specific collection.
 
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        Versions are sorted by semantic version precedence, highest first.
+        """
+        collection = self._get_collection()
+        self.add_cache_tags(response_cache.collection_tag(collection.pk))
+        ordering = [
+            '-' + f for f in models.CollectionVersion.SEMVER_ORDERING]
+        return (
+            models.CollectionVersion.objects
+            .filter(collection=collection)
+            .select_related('collection__namespace')
+            .only('version', 'collection__name', 'collection__namespace__name')
+            .order_by(*ordering)
+        )
 
     def _get_collection(self):
         """Get collection from either id, or namespace and name."""
@@ -72,15 +67,16 @@ class VersionListView(base.ListAPIView):
         return get_object_or_404(models.Collection, namespace=ns, name=name)
 
 
-class VersionDetailView(base.APIView):
+class VersionDetailView(base.ResponseCacheMixin, base.RetrieveAPIView):
     permission_classes = (AllowAny, )
+    serializer_class = serializers.VersionDetailSerializer
 
-    def get(self, request, *args, **kwargs):
+    def get_object(self):
         """Return a collection version."""
         version = self._get_version()
-        serializer = serializers.VersionDetailSerializer(
-            version, context={'request': self.request})
-        return Response(serializer.data)
+        self.add_cache_tags(
+            response_cache.collection_tag(version.collection_id))
+        return version
 
     def _get_version(self):
         """
@@ -108,7 +104,8 @@ class VersionDetailView(base.APIView):
 
 
 # TODO(cutwater): Whith #1858 this view is considered for removal.
-class CollectionArtifactView(base.RetrieveAPIView):
+class CollectionArtifactView(base.ResponseCacheMixin,
+                             base.RetrieveAPIView):
     permission_classes = (AllowAny, )
     serializer_class = serializers.CollectionArtifactSerializer
 
@@ -123,5 +120,7 @@ class CollectionArtifactView(base.RetrieveAPIView):
                 collection__name__iexact=self.kwargs['name'],
                 version__exact=self.kwargs['version'],
             )
+        self.add_cache_tags(
+            response_cache.collection_tag(version.collection_id))
 
         return version.get_content_artifact()
@@ -88,7 +88,7 @@ class GenericAPIView(generics.GenericAPIView, APIView):
     """
 
     def get_queryset(self):
-        qs = self.model.objects.all().distinct()
+        qs = self.model.objects.all()
         return qs
 
     def get_description_context(self):
@@ -238,9 +238,7 @@ class SubListAPIView(ListAPIView):
     def get_queryset(self):
         parent = self.get_parent_object()
         self.check_parent_access(parent)
-        qs = self.model.objects.all().distinct()
-        sublist_qs = getattr(parent, self.relationship).distinct()
-        return qs & sublist_qs
+        return getattr(parent, self.relationship).all()
 
 
 class RetrieveAPIView(generics.RetrieveAPIView, GenericAPIView):
@@ -20,7 +20,10 @@ import logging
 from rest_framework.response import Response
 from django.http import Http404
 
-from galaxy.main.models import Content
+from galaxy.api.base import ResponseCacheMixin
+from galaxy.main import response_cache
+from galaxy.main.downloads import download_counter
+from galaxy.main.models import Content, Repository
 
 from .views import filter_role_queryset
 from .base_views import ListAPIView, RetrieveAPIView
@@ -37,20 +40,22 @@ logger = logging.getLogger(__name__)
 
 # Keeping these views until Ansible < 2.5 deprecation
 
-class RoleList(ListAPIView):
+class RoleList(ResponseCacheMixin, ListAPIView):
     model = Content
     serializer_class = serializers.RoleListSerializer
     throttle_scope = 'download_count'
 
     def list(self, request, *args, **kwargs):
         if request.query_params.get('owner__username'):
+            self.add_cache_tags(response_cache.namespace_tag(
+                request.query_params['owner__username']))
             params = {}
             for key, val in request.query_params.items():
                 if key == 'owner__username':
                     params['namespace__name__iexact'] = val
                 elif key == 'name':
                     params['name__iexact'] = val
-                elif key not in ('page', 'page_size'):
+                elif key not in ('page', 'page_size', 'cursor'):
                     params[key] = val
             qs = self.get_queryset()
             qs = qs.filter(**params)
@@ -59,25 +64,18 @@ class RoleList(ListAPIView):
             if request.query_params.get('name'):
                 content = qs.first()
                 if content is not None:
-                    content.repository.download_count += 1
-                    content.repository.save()
-
                     name = '{}.{}'.format(
                         content.namespace.name,
                         content.repository.name
                     )
-
-                    data = {
-                        'measurement': 'content_download',
-                        'fields': {
-                            'content_name': name,
-                            'content_id': content.repository.id,
-                            'download_count': content.repository.download_count
-                        }
+                    self._count_download(
+                        content.repository_id, name,
+                        content.repository.download_count)
+                    self.response_cache_meta = {
+                        'repository_id': content.repository_id,
+                        'content_name': name,
                     }
 
-                    serializers.influx_insert_internal(data)
-
             if page is not None:
                 serializer = self.get_serializer(page, many=True)
                 return self.get_paginated_response(serializer.data)
@@ -91,6 +89,30 @@ class RoleList(ListAPIView):
             'platforms', 'tags', 'repository__versions', 'dependencies')
         return filter_role_queryset(qs)
 
+    def response_cache_hit(self, meta):
+        # Role downloads are counted on cache hits as well
+        if meta:
+            download_count = Repository.objects.filter(
+                pk=meta['repository_id']
+            ).values_list('download_count', flat=True).first()
+            self._count_download(
+                meta['repository_id'], meta['content_name'],
+                download_count or 0)
+
+    def _count_download(self, repository_id, content_name, download_count):
+        download_counter.increment_repository(repository_id)
+
+        data = {
+            'measurement': 'content_download',
+            'fields': {
+                'content_name': content_name,
+                'content_id': repository_id,
+                'download_count': download_count
+            }
+        }
+
+        serializers.influx_insert_internal(data)
+
 
 class RoleDetail(RetrieveAPIView):
     model = Content
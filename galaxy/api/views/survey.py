@@ -15,17 +15,19 @@
 # You should have received a copy of the Apache License
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 
+import copy
 import logging
 
+from django.db import transaction
+
 from galaxy.main import models
+from galaxy.main import survey_scores
 from galaxy.api import serializers
 from . import base_views
 from galaxy.main.celerytasks import user_notifications
 
 from rest_framework.response import Response
 
-from galaxy.common.survey import calculate_survey_score
-
 logger = logging.getLogger(__name__)
 
 __all__ = [
@@ -69,13 +71,17 @@ class CollectionSurveyDetail(base_views.RetrieveUpdateDestroyAPIView):
 
     def update(self, request, *args, **kwargs):
         request.data['collection'] = request.data['content_id']
-        serializer = self.get_serializer(
-            instance=self.get_object(),
-            data=request.data
-        )
-
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
+        with transaction.atomic():
+            instance = lock_survey(self.get_object())
+            previous = copy.copy(instance)
+            serializer = self.get_serializer(
+                instance=instance,
+                data=request.data
+            )
+
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+            survey_scores.replace(previous, instance)
         update_collection_score(serializer.validated_data['collection'])
 
         return Response(serializer.data)
@@ -114,26 +120,34 @@ class RepositorySurveyDetail(base_views.RetrieveUpdateDestroyAPIView):
 
     def update(self, request, *args, **kwargs):
         request.data['repository'] = request.data['content_id']
-        serializer = self.get_serializer(
-            instance=self.get_object(),
-            data=request.data
-        )
-
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
+        with transaction.atomic():
+            instance = lock_survey(self.get_object())
+            previous = copy.copy(instance)
+            serializer = self.get_serializer(
+                instance=instance,
+                data=request.data
+            )
+
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+            survey_scores.replace(previous, instance)
         update_repo_score(serializer.validated_data['repository'])
 
         return Response(serializer.data)
 
 
-def update_repo_score(repo):
-    surveys = models.RepositorySurvey.objects.filter(repository=repo)
+def lock_survey(survey):
+    """
+    Reloads a survey locked for update, so that concurrent updates
+    apply score deltas against the answers they actually replace.
+    """
+    return type(survey).objects.select_for_update().get(pk=survey.pk)
 
-    score = calculate_survey_score(surveys)
 
-    repo.community_score = score
-    repo.community_survey_count = len(surveys)
-    repo.save()
+def update_repo_score(repo):
+    # Aggregates are updated in the database by `survey_scores`
+    repo.refresh_from_db(
+        fields=('community_score', 'community_survey_count'))
 
     namespace = repo.provider_namespace.namespace.name
 
@@ -151,13 +165,8 @@ def update_repo_score(repo):
 
 
 def update_collection_score(collection):
-    surveys = models.CollectionSurvey.objects.filter(collection=collection)
-
-    score = calculate_survey_score(surveys)
-
-    collection.community_score = score
-    collection.community_survey_count = len(surveys)
-    collection.save()
+    collection.refresh_from_db(
+        fields=('community_score', 'community_survey_count'))
 
     # TODO(newswangerd): make logger work on collections
     # namespace = repo.provider_namespace.namespace.name
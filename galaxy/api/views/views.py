@@ -21,7 +21,7 @@ from allauth.socialaccount.models import SocialToken
 from django.conf import settings
 from django.core.exceptions import PermissionDenied, ObjectDoesNotExist
 from django.urls import reverse
-from django.db.models import Count, Max
+from django.db.models import Max, Sum
 from django.http import Http404, HttpResponseBadRequest
 from django.shortcuts import get_object_or_404
 
@@ -42,13 +42,16 @@ from rest_framework import filters as drf_filters
 
 from galaxy import constants
 from galaxy.accounts.models import CustomUser as User
+from galaxy.api.base import ResponseCacheMixin
 from galaxy.api.permissions import ModelAccessPermission
 from galaxy.api import filters as galaxy_filters
 from galaxy.api import serializers
 from galaxy.api import tasks
 from galaxy.api.views import base_views
+from galaxy.main import response_cache
 from galaxy.main.celerytasks import tasks as celerytasks
 from galaxy.main import models
+from galaxy.main.downloads import download_counter
 from galaxy.common import version, sanitize_content_name
 
 logger = logging.getLogger(__name__)
@@ -297,12 +300,11 @@ class RoleDownloads(base_views.APIView):
 
     def post(self, request, pk):
         obj = get_object_or_404(models.Content, pk=pk)
-        obj.download_count += 1
-        obj.save()
+        download_counter.increment_repository(obj.repository_id)
         return Response(status=status.HTTP_201_CREATED)
 
 
-class RoleVersionList(base_views.ListAPIView):
+class RoleVersionList(ResponseCacheMixin, base_views.ListAPIView):
     model = models.RepositoryVersion
     serializer_class = serializers.RoleVersionSerializer
 
@@ -312,6 +314,8 @@ class RoleVersionList(base_views.ListAPIView):
             content = models.Content.objects.get(pk=id)
         except ObjectDoesNotExist:
             return Response(status=status.HTTP_404_NOT_FOUND)
+        self.add_cache_tags(
+            response_cache.repository_tag(content.repository_id))
         qs = content.repository.versions.all()
         qs = self.filter_queryset(qs)
         page = self.paginate_queryset(qs)
@@ -329,7 +333,7 @@ class ImportTaskList(base_views.ListCreateAPIView):
     serializer_class = serializers.ImportTaskSerializer
     filter_backends = (
         galaxy_filters.ActiveOnlyBackend,
-        galaxy_filters._FieldLookupBackend,
+        galaxy_filters.FieldLookupBackend,
         drf_filters.SearchFilter,
         galaxy_filters.OrderByBackend,
     )
@@ -648,8 +652,9 @@ class TopContributorsList(base_views.ListAPIView):
     serializer_class = serializers.TopContributorsSerializer
 
     def list(self, request, *args, **kwargs):
-        qs = (models.Content.objects.values('namespace')
-              .annotate(count=Count('id'))
+        qs = (models.NamespaceContentCount.objects.values('namespace')
+              .annotate(count=Sum('count'))
+              .filter(count__gt=0)
               .order_by('-count', 'namespace'))
 
         page = self.paginate_queryset(qs)
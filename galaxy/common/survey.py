@@ -24,23 +24,36 @@ SURVEY_FIElDS = (
 )
 
 
+def get_survey_answers(survey):
+    """
+    Returns a sum and a number of answered questions of a single survey.
+    """
+    answers = [getattr(survey, k) for k in SURVEY_FIElDS]
+    answers = [a for a in answers if a is not None]
+    return sum(answers), len(answers)
+
+
+def calculate_score(answer_sum, answer_count):
+    """
+    Converts a sum and a number of answers to a 0-5 scale score.
+    Returns None if nothing has been answered.
+    """
+    if not answer_count:
+        return None
+    # Each answer is scaled from 1-5 to 0-1, averaged and converted to 0-5
+    return (answer_sum - answer_count) / answer_count * 5 / 4
+
+
 def calculate_survey_score(surveys):
     """
     :param surveys: queryset container all of the surveys for a collection or a
     repository
     """
-    score = 0
-
+    answer_sum = 0
     answer_count = 0
-    survey_score = 0.0
     for survey in surveys:
-        for k in SURVEY_FIElDS:
-            data = getattr(survey, k)
-            if data is not None:
-                answer_count += 1
-                survey_score += (data - 1) / 4
-
-    # Average and convert to 0-5 scale
-    score = (survey_score / answer_count) * 5
+        survey_sum, survey_count = get_survey_answers(survey)
+        answer_sum += survey_sum
+        answer_count += survey_count
 
-    return score
+    return calculate_score(answer_sum, answer_count)
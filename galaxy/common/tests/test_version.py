@@ -16,6 +16,7 @@
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 
 import pkg_resources
+import semantic_version
 import unittest
 from unittest import mock
 
@@ -66,3 +67,20 @@ class TestGetVersion(unittest.TestCase):
 
         self.assertEqual(version.get_package_version('test'), '1.0.0')
         self.git_describe_mock.assert_called_once()
+
+
+class TestGetSemverSortKey(unittest.TestCase):
+
+    def test_release_version(self):
+        self.assertEqual(version.get_semver_sort_key('1.2.3'),
+                         (1, 2, 3, ['2']))
+
+    def test_sort_by_precedence(self):
+        versions = [
+            '1.0.0', '1.0.0-alpha', '1.0.0-alpha.1', '1.0.0-alpha.beta',
+            '1.0.0-beta', '1.0.0-beta.2', '1.0.0-beta.11', '1.0.0-rc.1',
+            '2.0.0', '2.1.0', '2.1.1', '2.10.0', '0.9.0+build.1',
+        ]
+        expected = sorted(versions, key=semantic_version.Version)
+        result = sorted(versions, key=version.get_semver_sort_key)
+        self.assertEqual(result, expected)
@@ -17,8 +17,18 @@
 
 import subprocess
 
+import semantic_version
+
 TAG_PREFIX = 'v'
 
+# Prefixes of encoded pre-release identifiers. Numeric identifiers have
+# lower precedence than alphanumeric ones, and a release version has higher
+# precedence than any of its pre-releases.
+PRERELEASE_NUMERIC_PREFIX = '0'
+PRERELEASE_ALPHANUMERIC_PREFIX = '1'
+RELEASE_KEY = '2'
+PRERELEASE_NUMERIC_WIDTH = 20
+
 
 def get_package_version(package):
     """
@@ -87,3 +97,37 @@ def get_team_members():
     ]
 
     return members
+
+
+def get_semver_sort_key(version):
+    """
+    Returns a key for ordering semantic versions by precedence in database.
+
+    The key is a tuple of major, minor and patch integers and a list
+    of encoded pre-release identifiers. Pre-release identifiers are encoded
+    so that they compare as strings according to semantic versioning
+    precedence rules regardless of database collation: numeric identifiers
+    are zero-padded, alphanumeric identifiers are hex-encoded. A release
+    version is encoded as a single identifier, that is greater than any
+    pre-release identifier. Build metadata is ignored.
+
+    :param version: A version string or `semantic_version.Version` object.
+    :return tuple: (major, minor, patch, prerelease)
+    """
+    if not isinstance(version, semantic_version.Version):
+        version = semantic_version.Version(version)
+
+    if not version.prerelease:
+        prerelease = [RELEASE_KEY]
+    else:
+        prerelease = []
+        for ident in version.prerelease:
+            if ident.isdigit():
+                prerelease.append(
+                    PRERELEASE_NUMERIC_PREFIX
+                    + ident.zfill(PRERELEASE_NUMERIC_WIDTH))
+            else:
+                prerelease.append(
+                    PRERELEASE_ALPHANUMERIC_PREFIX
+                    + ident.encode('ascii').hex())
+    return version.major, version.minor, version.patch, prerelease
@@ -15,9 +15,13 @@
 # You should have received a copy of the Apache License
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 
+import functools
+import hashlib
 import os
+import signal
 import subprocess
 import logging
+import threading
 
 
 logger = logging.getLogger(__name__)
@@ -28,10 +32,52 @@ FLAKE8_IGNORE_ERRORS = 'E402'
 FLAKE8_SELECT_ERRORS = 'E,F,W'
 
 
+class LinterTimeout(Exception):
+    pass
+
+
+@functools.lru_cache(maxsize=None)
+def _get_command_version(cmd):
+    try:
+        proc = subprocess.run(
+            [cmd, '--version'], stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT, timeout=60)
+    except (OSError, subprocess.SubprocessError):
+        logger.warning(f'Cannot determine {cmd} version')
+        return None
+    return proc.stdout.decode('utf-8').strip()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_file_hash(path):
+    with open(path, 'rb') as fp:
+        return hashlib.sha256(fp.read()).hexdigest()
+
+
 class BaseLinter(object):
 
-    def __init__(self, workdir=None):
+    # Maximum linter run time in seconds
+    timeout = 300
+    # Indicates that linter can check files of multiple content items in
+    # a single run. Output lines must be prefixed with a file path.
+    batch = False
+    # Linter configuration file path
+    config = None
+
+    def __init__(self, workdir=None, timeout=None):
         self.root = workdir
+        if timeout is not None:
+            self.timeout = timeout
+        self.returncode = None
+
+    @classmethod
+    def get_version(cls):
+        """Returns linter version string, or None if it is unknown."""
+        return _get_command_version(cls.cmd)
+
+    @classmethod
+    def get_config_hash(cls):
+        return _get_file_hash(cls.config) if cls.config else None
 
     def check_files(self, paths):
         if isinstance(paths, str):
@@ -42,11 +88,55 @@ class BaseLinter(object):
     def _check_files(self, paths):
         pass
 
+    def _run(self, cmd):
+        """Runs linter command and yields output lines as they arrive.
+
+        :raises LinterTimeout: If the command does not complete within
+            `timeout` seconds. The command is killed.
+        """
+        logger.debug('CMD: ' + ' '.join(cmd))
+        # Linter is started in a new session, so that it can be killed
+        # along with its child processes.
+        proc = subprocess.Popen(cmd, cwd=self.root, stdout=subprocess.PIPE,
+                                start_new_session=True)
+        timed_out = threading.Event()
+
+        def kill():
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+        def on_timeout():
+            timed_out.set()
+            kill()
+
+        timer = threading.Timer(self.timeout, on_timeout)
+        timer.start()
+        try:
+            for line in proc.stdout:
+                # TODO(cutwater): Replace `.decode('utf-8')` call with
+                # subprocess parameter `encoding` after dropping
+                # Python 2.7 support.
+                yield line.decode('utf-8')
+            self.returncode = proc.wait()
+        finally:
+            timer.cancel()
+            # Generator may be closed before the output is consumed.
+            if proc.poll() is None:
+                kill()
+                proc.wait()
+            proc.stdout.close()
+        if timed_out.is_set():
+            raise LinterTimeout(
+                f'{self.id} did not complete in {self.timeout} seconds')
+
 
 class Flake8Linter(BaseLinter):
 
     id = 'flake8'
     cmd = 'flake8'
+    batch = True
 
     def _check_files(self, paths):
         cmd = [self.cmd, '--exit-zero', '--isolated',
@@ -54,13 +144,8 @@ class Flake8Linter(BaseLinter):
                '--select', FLAKE8_SELECT_ERRORS,
                '--max-line-length', str(FLAKE8_MAX_LINE_LENGTH),
                '--'] + paths
-        logger.debug('CMD: ' + ' '.join(cmd))
-        proc = subprocess.Popen(cmd, cwd=self.root, stdout=subprocess.PIPE)
-        for line in proc.stdout:
-            # TODO(cutwater): Replace `.decode('utf-8')` call with subprocess
-            # parameter `encoding` after dropping Python 2.7 support.
-            yield line.decode('utf-8').strip()
-        proc.wait()
+        for line in self._run(cmd):
+            yield line.strip()
 
     def parse_id_and_desc(self, message):
         try:
@@ -85,17 +170,13 @@ class YamlLinter(BaseLinter):
 
     id = 'yamllint'
     cmd = 'yamllint'
+    batch = True
     config = os.path.join(LINTERS_DIR, 'yamllint.yaml')
 
     def _check_files(self, paths):
         cmd = [self.cmd, '-f', 'parsable', '-c', self.config, '--'] + paths
-        logger.debug('CMD: ' + ' '.join(cmd))
-        proc = subprocess.Popen(cmd, cwd=self.root, stdout=subprocess.PIPE)
-        for line in proc.stdout:
-            # TODO(cutwater): Replace `.decode('utf-8')` call with subprocess
-            # parameter `encoding` after dropping Python 2.7 support.
-            yield line.decode('utf-8').strip()
-        proc.wait()
+        for line in self._run(cmd):
+            yield line.strip()
 
     def parse_id_and_desc(self, message):
         try:
@@ -123,20 +204,15 @@ class AnsibleLinter(BaseLinter):
 
     def _check_files(self, paths):
         cmd = [self.cmd, '-p'] + paths
-        logger.debug('CMD: ' + ' '.join(cmd))
-        proc = subprocess.Popen(cmd, cwd=self.root, stdout=subprocess.PIPE)
-
-        for line in proc.stdout:
-            # TODO(cutwater): Replace `.decode('utf-8')` call with subprocess
-            # parameter `encoding` after dropping Python 2.7 support.
-            line_list = line.decode('utf-8').split(' ')
+        for line in self._run(cmd):
+            line_list = line.split(' ')
             rel_path = ['.'] + line_list[0].split('/')[3:]
             line_list[0] = '/'.join(rel_path)
             line = ' '.join(line_list)
             yield line.strip()
 
         # returncode 1 is app exception, 0 is no linter err, 2 is linter err
-        if proc.wait() not in (0, 2):
+        if self.returncode not in (0, 2):
             yield 'Exception running ansible-lint, could not complete linting'
 
     def parse_id_and_desc(self, message):
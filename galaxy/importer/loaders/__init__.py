@@ -16,6 +16,7 @@
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 
 from .apb import APBLoader
+from .base import run_linters  # noqa: F401
 from .module import ModuleLoader
 from .module_utils import ModuleUtilsLoader
 from .plugin import PluginLoader
@@ -16,12 +16,15 @@
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 
 import abc
+import collections
+import concurrent.futures
 import logging
 import os
 import re
 
 from galaxy import constants
 from galaxy.importer import exceptions as exc
+from galaxy.importer.linters import LinterTimeout
 from galaxy.importer.utils import readme as readmeutils
 from galaxy.importer.utils import lint as lintutils
 from galaxy.worker import logutils
@@ -29,6 +32,12 @@ from galaxy.worker import logutils
 
 default_logger = logging.getLogger(__name__)
 
+# Maximum number of linters running concurrently for a content item.
+MAX_LINTER_WORKERS = 4
+
+# Results of linters, shared by imports running in the same process.
+lint_cache = lintutils.LintResultCache(max_entries=1024)
+
 
 class BaseLoader(metaclass=abc.ABCMeta):
     content_types = None
@@ -85,31 +94,43 @@ class BaseLoader(metaclass=abc.ABCMeta):
     def load(self):
         pass
 
-    def lint(self):
-        if not self.linters:
-            return
-
+    def get_linters(self):
         linters = self.linters
+        if not linters:
+            return []
         if not isinstance(linters, (list, tuple)):
             linters = [linters]
+        return list(linters)
+
+    def lint(self, results=None):
+        """Logs linter issues.
+
+        :param results: Linter results computed by `run_linters`. If not
+            set, linters are run.
+        :return: True if no linter reported issues, None if content type
+            has no linters.
+        """
+        if not self.linters:
+            return
+        if results is None:
+            results = run_linters([self])[0]
 
         all_linters_ok = True
-        for linter_cls in linters:
-            linter_ok = True
-            linter_obj = linter_cls(self.root)
-            for message in linter_obj.check_files(self.rel_path):
-                if linter_ok:
-                    self.log.info('{} Warnings:'.format(linter_obj.id))
-                    linter_ok = False
-                error_id, rule_desc = linter_obj.parse_id_and_desc(message)
+        for linter_cls, issues, timeout_error in results:
+            if issues or timeout_error:
+                self.log.info('{} Warnings:'.format(linter_cls.id))
+                all_linters_ok = False
+            else:
+                self.log.info('{} OK.'.format(linter_cls.id))
+            for message, error_id, rule_desc in issues:
                 if error_id:
                     self._on_lint_issue(
                         linter_cls.id, error_id, rule_desc, message)
                 else:
                     self.log.warning(message)
-                all_linters_ok = False
-            if linter_ok:
-                self.log.info('{} OK.'.format(linter_obj.id))
+            if timeout_error:
+                self._on_lint_issue(
+                    linter_cls.id, 'timeout', str(timeout_error))
 
         return all_linters_ok
 
@@ -133,3 +154,109 @@ class BaseLoader(metaclass=abc.ABCMeta):
 
 def make_module_name(path):
     return os.path.splitext(os.path.basename(path))[0]
+
+
+def run_linters(loaders):
+    """Runs linters of multiple content items.
+
+    Linters supporting batches (see `BaseLinter.batch`) are run once
+    for all content items, e.g. flake8 is run once for all modules.
+    Linters are run concurrently. Results of content, that was linted
+    before, are taken from cache.
+
+    :param loaders: A list of content loaders sharing a repository root.
+    :return: For each loader a list of (linter_cls, issues, timeout_error)
+        tuples in order of loader linters, where issues is a list of
+        (message, error_id, rule_desc) tuples.
+    """
+    results = [{} for _ in loaders]
+    pending = collections.OrderedDict()
+    for index, loader in enumerate(loaders):
+        linters = loader.get_linters()
+        if not linters:
+            continue
+        files_digest = lintutils.get_files_digest(loader.root, loader.rel_path)
+        for linter_cls in linters:
+            cache_key = _get_cache_key(
+                linter_cls, loader.rel_path, files_digest)
+            issues = lint_cache.get(cache_key) if cache_key else None
+            if issues is not None:
+                results[index][linter_cls] = (issues, None)
+            else:
+                pending.setdefault((linter_cls, loader.root), []).append(
+                    (index, cache_key))
+
+    jobs = []
+    for (linter_cls, root), items in pending.items():
+        if linter_cls.batch:
+            jobs.append((linter_cls, root, items))
+        else:
+            jobs.extend((linter_cls, root, [item]) for item in items)
+
+    def run_job(job):
+        linter_cls, root, items = job
+        return _run_linter(
+            linter_cls, root, [loaders[index].rel_path for index, _ in items])
+
+    if jobs:
+        max_workers = min(len(jobs), MAX_LINTER_WORKERS)
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+            job_results = list(executor.map(run_job, jobs))
+    else:
+        job_results = []
+
+    for (linter_cls, _, items), (issues, timeout_error) in zip(
+            jobs, job_results):
+        for (index, cache_key), item_issues in zip(items, issues):
+            results[index][linter_cls] = (item_issues, timeout_error)
+            if cache_key is not None and timeout_error is None:
+                lint_cache.set(cache_key, tuple(item_issues))
+
+    return [
+        [(linter_cls, *results[index][linter_cls])
+         for linter_cls in loader.get_linters()]
+        for index, loader in enumerate(loaders)
+    ]
+
+
+def _get_cache_key(linter_cls, rel_path, files_digest):
+    version = linter_cls.get_version()
+    if version is None:
+        return None
+    return (linter_cls.id, version, linter_cls.get_config_hash(),
+            rel_path, files_digest)
+
+
+def _run_linter(linter_cls, root, paths):
+    """Runs a linter over paths and parses its output as it arrives.
+
+    :return: A tuple of issues for each path and a timeout error if the
+        linter did not complete in time.
+    """
+    linter_obj = linter_cls(root)
+    issues = [[] for _ in paths]
+    try:
+        for message in linter_obj.check_files(paths):
+            error_id, rule_desc = linter_obj.parse_id_and_desc(message)
+            for index in _match_message_paths(message, paths):
+                issues[index].append((message, error_id, rule_desc))
+    except LinterTimeout as e:
+        return issues, e
+    return issues, None
+
+
+def _match_message_paths(message, paths):
+    """Returns indexes of paths a linter message refers to.
+
+    Messages that don't refer to any of paths are related to all of them.
+    """
+    if len(paths) == 1:
+        return [0]
+    msg_path = os.path.normpath(message.split(':', 1)[0])
+    indexes = []
+    for index, path in enumerate(paths):
+        path = os.path.normpath(path)
+        if (path == os.curdir or msg_path == path
+                or msg_path.startswith(path + os.sep)):
+            indexes.append(index)
+    return indexes or list(range(len(paths)))
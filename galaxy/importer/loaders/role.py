@@ -29,6 +29,7 @@ from galaxy.importer.loaders import base
 from galaxy.importer.utils import lint as lintutils
 from galaxy.importer import exceptions as exc
 from galaxy.main import models as m_models
+from galaxy.main import platforms as m_platforms
 
 
 ROLE_META_FILES = [
@@ -79,6 +80,9 @@ CONTENT_SEVERITY = {
     'ansible-lint_e602': 4,
     'yamllint_yaml_error': 4,
     'yamllint_yaml_warning': 1,
+    # Linter did not complete in time, see `BaseLinter.timeout`
+    'ansible-lint_timeout': 3,
+    'yamllint_timeout': 3,
 }
 METADATA_SEVERITY_TYPE = 'metadata'
 METADATA_SEVERITY = {
@@ -464,14 +468,13 @@ class RoleLoader(base.BaseLoader):
     def _check_platforms(self):
         self.log.info('Checking role platforms')
         confirmed_platforms = []
+        platform_index = m_platforms.get_platform_index()
 
         for platform in self.data['platforms']:
             name = platform.name
             versions = platform.versions
             if 'all' in versions:
-                platform_objs = m_models.Platform.objects.filter(
-                    name__iexact=name
-                )
+                platform_objs = platform_index.get_platforms(name)
                 if not platform_objs:
                     msg = u'Invalid platform: "{}-all", skipping.'.format(name)
                     self._on_lint_issue('importer', 'IMPORTER101', msg)
@@ -481,11 +484,8 @@ class RoleLoader(base.BaseLoader):
                 continue
 
             for version in versions:
-                try:
-                    p = m_models.Platform.objects.get(
-                        name__iexact=name, release__iexact=str(version)
-                    )
-                except m_models.Platform.DoesNotExist:
+                p = platform_index.get_platform(name, version)
+                if p is None:
                     msg = (u'Invalid platform: "{0}-{1}", skipping.'
                            .format(name, version))
                     self._on_lint_issue('importer', 'IMPORTER101', msg)
@@ -497,11 +497,11 @@ class RoleLoader(base.BaseLoader):
     def _check_cloud_platforms(self):
         self.log.info('Checking role cloud platforms')
         confirmed_platforms = []
+        platform_index = m_platforms.get_platform_index()
 
         for name in self.data['cloud_platforms']:
-            try:
-                c = m_models.CloudPlatform.objects.get(name__iexact=name)
-            except m_models.CloudPlatform.DoesNotExist:
+            c = platform_index.get_cloud_platform(name)
+            if c is None:
                 msg = u'Invalid cloud platform: "{0}", skipping'.format(name)
                 self._on_lint_issue('importer', 'IMPORTER102', msg)
             else:
@@ -512,13 +512,24 @@ class RoleLoader(base.BaseLoader):
     def _check_dependencies(self):
         self.log.info('Checking role dependencies')
         confirmed_deps = []
-
-        for dep in self.data['dependencies'] or []:
-            try:
-                dep_role = m_models.Content.objects.get(
-                    namespace__name=dep.namespace, name=dep.name)
-                confirmed_deps.append(dep_role)
-            except Exception:
+        deps = self.data['dependencies'] or []
+
+        dep_roles = collections.defaultdict(list)
+        if deps:
+            query = m_models.Content.objects.filter(
+                namespace__name__in={dep.namespace for dep in deps},
+                name__in={dep.name for dep in deps},
+            ).select_related('namespace')
+            for content in query:
+                dep_roles[(content.namespace.name, content.name)].append(
+                    content)
+
+        for dep in deps:
+            matches = dep_roles.get((dep.namespace, dep.name), [])
+            # Dependency must match exactly one content object.
+            if len(matches) == 1:
+                confirmed_deps.append(matches[0])
+            else:
                 msg = u"Error loading dependency: '{}'".format(
                     '.'.join([d for d in dep]))
                 self._on_lint_issue('importer', 'IMPORTER103', msg)
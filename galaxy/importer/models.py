@@ -69,9 +69,11 @@ class Repository(object):
     """Represents repository metadata."""
 
     def __init__(self, branch, commit, format, contents,
-                 readme=None, name=None, description=None, quality_score=None):
+                 readme=None, name=None, description=None, quality_score=None,
+                 tags=None):
         self.branch = branch
         self.commit = commit
+        self.tags = tags
         self.format = format
         self.contents = contents
         self.readme = readme
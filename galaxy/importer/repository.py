@@ -24,17 +24,21 @@ from galaxy.importer import models
 from galaxy.importer.utils import git
 from galaxy.importer.finders import RoleFinder
 from galaxy.importer import exceptions as exc
+from galaxy.worker import logutils
 
 
 default_logger = logging.getLogger(__name__)
 
 
 def import_repository(
-    url, branch=None, temp_dir=None, logger=None, repo_obj=None
+    url, branch=None, temp_dir=None, logger=None, repo_obj=None,
+    mirror_cache=None,
 ):
+    logutils.flush_task_logs(logger or default_logger)
     with git.make_clone_dir(temp_dir) as clone_dir:
         try:
-            git.clone_repository(url, clone_dir, branch=branch)
+            git.clone_repository(
+                url, clone_dir, branch=branch, mirror_cache=mirror_cache)
         except Exception as e:
             raise exc.RepositoryError(e)
         return load_repository(clone_dir, logger, repo_obj)
@@ -70,6 +74,7 @@ class RepositoryLoader(object):
     def load(self):
         branch = git.get_current_branch(directory=self.path)
         commit = git.get_commit_info(directory=self.path)
+        tags = git.get_tags(directory=self.path)
         role = self._find_contents()
         loader_result = list(self._load_contents(role))
 
@@ -82,6 +87,7 @@ class RepositoryLoader(object):
         return models.Repository(
             branch=branch,
             commit=commit,
+            tags=tags,
             format=constants.RepositoryFormat.ROLE,
             contents=[role],
             name=metadata_role_name,
@@ -123,6 +129,12 @@ class RepositoryLoader(object):
             'the collection import workflow.')
 
     def _load_contents(self, contents):
+        """Loads, lints and scores content items.
+
+        Content items are loaded first and then linted with shared
+        linter runs.
+        """
+        loaded = []
         for content_type, rel_path, extra in contents:
             self.log.info(f'===== LOADING {content_type.name} =====')
             loader_cls = loaders.get_loader(content_type)
@@ -131,10 +143,16 @@ class RepositoryLoader(object):
 
             content = loader.load()
             self.log.info(' ')
+            loaded.append((loader, content))
+
+        logutils.flush_task_logs(self.log)
+        lint_results = loaders.run_linters([loader for loader, _ in loaded])
 
+        for (loader, content), linter_results in zip(loaded, lint_results):
             name = ': {}'.format(content.name) if content.name else ''
-            self.log.info(f'===== LINTING {content_type.name}{name} =====')
-            lint_result = loader.lint()
+            self.log.info(
+                f'===== LINTING {loader.content_type.name}{name} =====')
+            lint_result = loader.lint(linter_results)
             content.scores = loader.score()
             self.log.info(' ')
 
@@ -0,0 +1,126 @@
+# (c) 2012-2019, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+import os
+import subprocess
+
+import pytest
+
+from galaxy.importer.utils import git
+
+
+def _run(cmd, cwd):
+    return subprocess.check_output(cmd, cwd=cwd).decode('utf-8').strip()
+
+
+def _commit(repo, filename, content):
+    with open(os.path.join(repo, filename), 'w') as fp:
+        fp.write(content)
+    _run(['git', 'add', filename], repo)
+    _run(['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com',
+          'commit', '--quiet', '-m', filename], repo)
+    return _run(['git', 'rev-parse', 'HEAD'], repo)
+
+
+@pytest.fixture
+def remote(tmp_path):
+    repo = str(tmp_path / 'remote')
+    os.makedirs(repo)
+    _run(['git', 'init', '--quiet', repo], repo)
+    _run(['git', 'checkout', '--quiet', '-b', 'main'], repo)
+    _commit(repo, 'README.md', 'readme')
+    return repo
+
+
+def _clone(cache, remote, tmp_path, name, branch=None):
+    directory = str(tmp_path / name)
+    os.makedirs(directory)
+    git.clone_repository(remote, directory, branch=branch, mirror_cache=cache)
+    return directory
+
+
+def test_clone_from_mirror(remote, tmp_path):
+    cache = git.MirrorCache(str(tmp_path / 'mirrors'))
+    clone_dir = _clone(cache, remote, tmp_path, 'clone1')
+    assert git.get_current_branch(clone_dir) == 'main'
+
+    _run(['git', 'checkout', '--quiet', '-b', 'devel'], remote)
+    commit = _commit(remote, 'CHANGELOG.md', 'changes')
+    _run(['git', 'tag', 'v1.0.0'], remote)
+
+    clone_dir = _clone(cache, remote, tmp_path, 'clone2', branch='devel')
+    assert git.get_current_branch(clone_dir) == 'devel'
+    assert git.get_commit_info(directory=clone_dir).sha == commit
+    assert _run(['git', 'tag'], clone_dir) == 'v1.0.0'
+    assert len(os.listdir(str(tmp_path / 'mirrors'))) == 2
+
+
+def test_clone_fallback(remote, tmp_path, mocker):
+    cache = git.MirrorCache(str(tmp_path / 'mirrors'))
+    mocker.patch.object(cache, '_update_mirror',
+                        side_effect=OSError('disk is full'))
+    clone_dir = _clone(cache, remote, tmp_path, 'clone')
+    assert git.get_current_branch(clone_dir) == 'main'
+
+
+def test_get_remote_head(remote):
+    assert git._get_remote_head(remote) == 'refs/heads/main'
+
+    # HEAD branch is ambiguous, if another branch points to the same commit
+    _run(['git', 'branch', 'devel'], remote)
+    assert git._get_remote_head(remote) is None
+
+
+def test_clone_unresolved_head(remote, tmp_path):
+    _run(['git', 'branch', 'devel'], remote)
+    cache = git.MirrorCache(str(tmp_path / 'mirrors'))
+    clone_dir = _clone(cache, remote, tmp_path, 'clone')
+    assert git.get_current_branch(clone_dir) == 'main'
+    assert not os.path.exists(cache.path)
+
+
+def test_mirror_eviction(remote, tmp_path):
+    other = str(tmp_path / 'other')
+    _run(['git', 'clone', '--quiet', remote, other], str(tmp_path))
+
+    cache = git.MirrorCache(str(tmp_path / 'mirrors'), max_size=1)
+    _clone(cache, remote, tmp_path, 'clone1')
+    _clone(cache, other, tmp_path, 'clone2')
+
+    mirror = os.path.basename(cache._get_mirror_path(other))
+    assert sorted(os.listdir(cache.path)) == [mirror, mirror + '.lock']
+
+
+def test_get_tags(remote):
+    commit = _run(['git', 'rev-parse', 'HEAD'], remote)
+    _run(['git', 'tag', 'v1.0.0'], remote)
+    _run(['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com',
+          'tag', '-a', '-m', 'release', '1.1.0'], remote)
+    tree = _run(['git', 'rev-parse', 'HEAD^{tree}'], remote)
+    _run(['git', 'tag', 'tree', tree], remote)
+
+    tags = sorted(git.get_tags(directory=remote))
+    assert [(t.name, t.sha) for t in tags] == [
+        ('1.1.0', commit), ('v1.0.0', commit)]
+    timestamp = int(_run(['git', 'log', '-1', '--format=%at'], remote))
+    assert [t.date.timestamp() for t in tags] == [timestamp, timestamp]
+    assert tags[0].date.tzinfo is not None
+
+
+def test_parse_raw_date():
+    date = git._parse_raw_date('1546300800 -0130')
+    assert date.isoformat() == '2018-12-31T22:30:00-01:30'
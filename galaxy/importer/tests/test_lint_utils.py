@@ -0,0 +1,57 @@
+# (c) 2012-2019, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+import os
+
+from galaxy.importer.utils import lint as lintutils
+
+
+def test_lint_result_cache_lru():
+    cache = lintutils.LintResultCache(max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert len(cache) == 2
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as fp:
+        fp.write(content)
+
+
+def test_files_digest(tmpdir):
+    root = str(tmpdir)
+    _write(os.path.join(root, 'roles', 'a', 'tasks', 'main.yml'), '---\n')
+    _write(os.path.join(root, 'roles', 'a', 'meta', 'main.yml'), '---\n')
+    _write(os.path.join(root, 'roles', 'b', 'tasks', 'main.yml'), '---\n')
+
+    digest = lintutils.get_files_digest(root, 'roles/a')
+    assert digest == lintutils.get_files_digest(root, 'roles/a')
+    assert digest != lintutils.get_files_digest(root, 'roles/b')
+
+    _write(os.path.join(root, 'roles', 'a', '.git', 'HEAD'), 'ref')
+    _write(os.path.join(root, 'roles', 'b', 'tasks', 'main.yml'), 'x: 1\n')
+    assert digest == lintutils.get_files_digest(root, 'roles/a')
+
+    _write(os.path.join(root, 'roles', 'a', 'tasks', 'main.yml'), 'x: 1\n')
+    assert digest != lintutils.get_files_digest(root, 'roles/a')
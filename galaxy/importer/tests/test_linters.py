@@ -21,6 +21,7 @@ import shutil
 import pytest
 
 from galaxy.importer import linters
+from galaxy.importer.loaders import base as loaders_base
 
 
 FLAKE8_TEST_FILE_OK = """
@@ -190,3 +191,70 @@ def test_ansiblelint_fail_app(temp_root):
         result = list(linter.check_files(['.']))
         expected = 'exception running ansible-lint'
     assert expected in ' '.join(result).lower()
+
+
+class SleepLinter(linters.BaseLinter):
+
+    id = 'sleep'
+
+    def _check_files(self, paths):
+        for line in self._run(['sh', '-c', 'echo started; sleep 10']):
+            yield line.strip()
+
+
+def test_linter_timeout():
+    linter = SleepLinter(timeout=0.5)
+    result = []
+    with pytest.raises(linters.LinterTimeout):
+        for line in linter.check_files('.'):
+            result.append(line)
+    assert result == ['started']
+
+
+class BatchLinter(linters.BaseLinter):
+
+    id = 'batch'
+    batch = True
+    runs = []
+
+    @classmethod
+    def get_version(cls):
+        return None
+
+    def _check_files(self, paths):
+        self.runs.append(paths)
+        for path in paths:
+            yield f'{path}:1:1: E1 issue'
+        yield 'warning'
+
+    def parse_id_and_desc(self, message):
+        parts = message.split(' ')
+        if len(parts) < 2:
+            return None, None
+        return parts[1], parts[2]
+
+
+class BatchLoader(loaders_base.BaseLoader):
+
+    linters = BatchLinter
+
+    def load(self):
+        pass
+
+
+def test_run_linters_batch():
+    BatchLinter.runs = []
+    batch_loaders = [
+        BatchLoader(None, path, '/tmp')
+        for path in ('plugins/modules/a.py', 'plugins/modules/b.py')]
+
+    results = loaders_base.run_linters(batch_loaders)
+
+    assert BatchLinter.runs == [['plugins/modules/a.py',
+                                 'plugins/modules/b.py']]
+    assert results == [
+        [(BatchLinter, [('plugins/modules/a.py:1:1: E1 issue', 'E1', 'issue'),
+                        ('warning', None, None)], None)],
+        [(BatchLinter, [('plugins/modules/b.py:1:1: E1 issue', 'E1', 'issue'),
+                        ('warning', None, None)], None)],
+    ]
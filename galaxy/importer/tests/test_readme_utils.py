@@ -50,7 +50,7 @@ def call_render(raw_text, mimetype):
 
 def test_render_simple():
     html = call_render(TEXT_SIMPLE, 'text/x-rst')
-    assert html == ''
+    assert html == '<p>{}</p>\n'.format(TEXT_SIMPLE)
 
     html = call_render(TEXT_SIMPLE, 'text/markdown')
     assert html == '<p>{}</p>'.format(TEXT_SIMPLE)
@@ -58,7 +58,6 @@ def test_render_simple():
 
 def test_render_bad_tag():
     html = call_render(TEXT_BAD_TAG, 'text/x-rst')
-    assert html == ''
     assert '<script>' not in html
 
     html = call_render(TEXT_BAD_TAG, 'text/markdown')
@@ -67,15 +66,14 @@ def test_render_bad_tag():
 
 def test_render_bad_html_hidden_in_md():
     html = call_render(TEXT_BAD_HTML_IN_MD, 'text/x-rst')
-    assert html == ''
-    assert 'javascript' not in html
+    assert 'href="javascript' not in html
 
     html = call_render(TEXT_BAD_HTML_IN_MD, 'text/markdown')
     assert 'javascript' not in html
 
 
 def test_render_formatting():
-    html = call_render(TEXT_FORMATTING, 'text/x-rst')
+    html = call_render(TEXT_FORMATTING, 'text/plain')
     assert html == ''
 
     html = call_render(TEXT_FORMATTING, 'text/markdown')
@@ -87,3 +85,38 @@ def test_render_formatting():
     assert '<blockquote>\n<p>NOTE:' in html
     assert 'Tool \'feature\' is <em>beta</em>' in html
     assert '<ul>\n<li>Item1</li>' in html
+
+
+TEXT_RST_FORMATTING = '''
+Role
+====
+
+`Tool <https://www.example.com>`_ installed in ``$PATH``
+
+Installation
+------------
+
+::
+
+    package_version: "1.2.0"
+
+.. raw:: html
+
+    <script>alert(1)</script>
+
+.. include:: /etc/passwd
+
+* Item1
+* Item2
+'''
+
+
+def test_render_rst_formatting():
+    html = call_render(TEXT_RST_FORMATTING, 'text/x-rst')
+    assert '<h1>Role</h1>' in html
+    assert '<a href="https://www.example.com">Tool</a>' in html
+    assert '<h2>Installation</h2>' in html
+    assert '<pre>package_version: &quot;1.2.0&quot;</pre>' in html
+    assert '<li><p>Item1</p></li>' in html
+    assert 'script' not in html
+    assert 'root' not in html
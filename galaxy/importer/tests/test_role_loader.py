@@ -15,12 +15,14 @@
 # You should have received a copy of the Apache License
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 
+import logging
 import unittest
 from unittest import mock
 
 import pytest
 
 from galaxy import constants
+from galaxy.importer import linters
 from galaxy.importer import models
 from galaxy.importer import loaders
 from galaxy.importer.loaders import role as role_loader
@@ -178,3 +180,19 @@ class TestRoleLoader(unittest.TestCase):
         assert role_meta['author'] == 'John Smith'
         assert role_meta['min_ansible_version'] == '2.4.0'
         assert role_meta['min_ansible_container_version'] is None
+
+    def test_lint_timeout(self):
+        logger = mock.Mock()
+        loader = loaders.RoleLoader(
+            constants.ContentType.ROLE, 'roles/test_role', '/tmp/repo',
+            metadata_path='meta.yaml', logger=logger)
+
+        loader.lint([
+            (linters.YamlLinter, [], None),
+            (linters.AnsibleLinter, [], linters.LinterTimeout('timed out')),
+        ])
+
+        warnings = [args[1] for args, _ in logger.log.call_args_list
+                    if args[0] == logging.WARNING]
+        assert warnings == ['timed out']
+        assert loader.score()['content'] == 4.75
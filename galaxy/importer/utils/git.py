@@ -19,15 +19,22 @@ import os
 import errno
 import collections
 import contextlib
+import datetime
+import fcntl
+import hashlib
+import logging
 import tempfile
 import shutil
 import subprocess
+import time
 
 import dateutil.parser as dt_parser
 
 
 TIMEOUT_RETCODE = 124
 
+logger = logging.getLogger(__name__)
+
 
 class RepositoryNotExist(Exception):
     """Repository does not exist exception."""
@@ -60,39 +67,219 @@ def make_clone_dir(basedir=None):
                 raise
 
 
-def clone_repository(clone_url, directory, branch=None):
+def _get_remote_head(clone_url):
+    """Checks that remote repository exists and returns its HEAD branch.
+
+    HEAD branch is resolved by matching the sha of remote HEAD against
+    remote branches, as `git ls-remote --symref` is not available in
+    older git versions.
+
+    :return: Default branch reference (e.g. `refs/heads/master`) or None
+        if HEAD branch cannot be resolved unambiguously.
+    :raises RepositoryNotExist: If repository does not exist.
+    """
+    # NOTE: Checking that remote repository exists. If trying to clone
+    # without this check `git clone` will hang on waiting for
+    # authentication user input.
+    # This code should be removed once git version is upgrade.
+    # Starting from version 2.3 git provides GIT_TERMINAL_PROMPT environment
+    # variable, that causes immediate exit of `git clone` command.
+    cmd = ['timeout', '10', 'git', 'ls-remote', clone_url,
+           'HEAD', 'refs/heads/*']
+    try:
+        output = subprocess.check_output(cmd).decode('utf-8')
+    except subprocess.CalledProcessError as e:
+        if e.returncode == TIMEOUT_RETCODE:
+            raise RepositoryNotExist("Repository '{0}' does not exist"
+                                     .format(clone_url))
+        else:
+            raise
+
+    refs = [line.split('\t', 1) for line in output.splitlines()]
+    head_sha = next((sha for sha, ref in refs if ref == 'HEAD'), None)
+    branches = [ref for sha, ref in refs
+                if sha == head_sha and ref.startswith('refs/heads/')]
+    if len(branches) == 1:
+        return branches[0]
+    return None
+
+
+def clone_repository(clone_url, directory, branch=None, mirror_cache=None):
     """Clones a git repository to destination directory.
 
     :param str clone_url: The repository URL to clone from.
     :param str directory: The name of a directory to clone into.
     :param str branch: Branch name to checkout. If not specified,
         a default branch is checked out.
+    :param MirrorCache mirror_cache: Optional cache of repository mirrors.
+        If cloning from a mirror fails, or a default branch is requested
+        but cannot be resolved, repository is cloned from remote.
     :raises subprocess.CalledProcessError: If git command finished with
         non-zero exit code.
     :raises RepositoryNotExist: If repository does not exist.
     """
-    # NOTE: Checking that remote repository exists. If trying to clone
-    # without this check `git clone` will hang on waiting for
-    # authentication user input.
-    # This code should be removed once git version is upgrade.
-    # Starting from version 2.3 git provides GIT_TERMINAL_PROMPT environment
-    # variable, that causes immediate exit of `git clone` command.
-    cmd = ['timeout', '10', 'git', 'ls-remote', clone_url]
-    with open(os.devnull, 'w') as null_file:
+    head = _get_remote_head(clone_url)
+
+    if mirror_cache is not None and (branch or head):
         try:
-            subprocess.check_call(cmd, stdout=null_file)
-        except subprocess.CalledProcessError as e:
-            if e.returncode == TIMEOUT_RETCODE:
-                raise RepositoryNotExist("Repository '{0}' does not exist"
-                                         .format(clone_url))
-            else:
-                raise
+            mirror_cache.clone(clone_url, directory, branch=branch, head=head)
+            return
+        except (subprocess.CalledProcessError, OSError) as e:
+            logger.warning(f'Failed to clone repository "{clone_url}" '
+                           f'from mirror: {e}')
+            shutil.rmtree(directory, ignore_errors=True)
+            os.makedirs(directory, exist_ok=True)
 
+    with open(os.devnull, 'w') as null_file:
         cmd = ['git', 'clone', '--quiet', '--depth', '1']
         if branch:
             cmd += ['--branch', branch]
         cmd += [clone_url, directory]
         subprocess.check_call(cmd, stdout=null_file)
+        # Shallow clone includes only tags pointing to the fetched commit.
+        cmd = ['git', 'fetch', '--quiet', '--depth', '1', '--tags', 'origin']
+        subprocess.check_call(cmd, cwd=directory, stdout=null_file)
+
+
+class MirrorCache:
+    """A cache of bare repository mirrors.
+
+    A mirror of branches and tags is kept for each clone URL and updated
+    with an incremental fetch. Repositories are cloned from a mirror
+    locally, with object files hardlinked. Least recently used mirrors
+    are removed when total size of mirrors exceeds `max_size`.
+
+    Concurrent processes are synchronized with file locks.
+
+    :param str path: Directory to store mirrors in.
+    :param int max_size: Maximum total size of mirrors in bytes.
+    """
+
+    FETCH_REFSPECS = ('+refs/heads/*:refs/heads/*', '+refs/tags/*:refs/tags/*')
+
+    def __init__(self, path, max_size=None):
+        self.path = path
+        self.max_size = max_size
+
+    def clone(self, clone_url, directory, branch=None, head=None):
+        """Updates mirror of a repository and clones it.
+
+        :param str head: Default branch reference of the remote repository.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        mirror = self._get_mirror_path(clone_url)
+        with self._lock(mirror):
+            self._update_mirror(mirror, clone_url, head)
+            cmd = ['git', 'clone', '--quiet', '--local']
+            if branch:
+                cmd += ['--branch', branch]
+            cmd += [mirror, directory]
+            _git(cmd)
+            # Mark mirror as recently used
+            os.utime(mirror)
+        self.evict(keep=mirror)
+
+    def evict(self, keep=None):
+        """Removes least recently used mirrors exceeding maximum size."""
+        if not self.max_size:
+            return
+        mirrors = []
+        total_size = 0
+        for name in os.listdir(self.path):
+            path = os.path.join(self.path, name)
+            if not name.endswith('.git') or not os.path.isdir(path):
+                continue
+            size = _get_dir_size(path)
+            total_size += size
+            mirrors.append((os.path.getmtime(path), path, size))
+
+        for _, path, size in sorted(mirrors):
+            if total_size <= self.max_size:
+                break
+            if path == keep:
+                continue
+            with self._lock(path, blocking=False) as locked:
+                if not locked:
+                    continue
+                shutil.rmtree(path, ignore_errors=True)
+                # Removed while locked, see `_lock`
+                os.unlink(path + '.lock')
+            total_size -= size
+
+    def _get_mirror_path(self, clone_url):
+        digest = hashlib.sha256(clone_url.encode('utf-8')).hexdigest()
+        return os.path.join(self.path, digest + '.git')
+
+    @contextlib.contextmanager
+    def _lock(self, mirror, blocking=True):
+        """Locks a mirror with a lock file next to it.
+
+        Lock files of evicted mirrors are removed by the lock holder,
+        so a lock acquired on a file that has been removed or replaced
+        in the meantime is retried.
+        """
+        lock_path = mirror + '.lock'
+        flags = fcntl.LOCK_EX
+        if not blocking:
+            flags |= fcntl.LOCK_NB
+        while True:
+            with open(lock_path, 'a') as lock_file:
+                try:
+                    fcntl.flock(lock_file, flags)
+                except BlockingIOError:
+                    yield False
+                    return
+                try:
+                    current = os.stat(lock_path).st_ino
+                except FileNotFoundError:
+                    current = None
+                if current != os.fstat(lock_file.fileno()).st_ino:
+                    continue
+                try:
+                    yield True
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                return
+
+    def _update_mirror(self, mirror, clone_url, head):
+        if not os.path.isdir(mirror):
+            tmp_mirror = tempfile.mkdtemp(dir=self.path, suffix='.tmp')
+            try:
+                _git(['git', 'init', '--quiet', '--bare', tmp_mirror])
+                _git(['git', 'remote', 'add', 'origin', clone_url],
+                     cwd=tmp_mirror)
+                os.rename(tmp_mirror, mirror)
+            except Exception:
+                shutil.rmtree(tmp_mirror, ignore_errors=True)
+                raise
+
+        start = time.monotonic()
+        _git(['git', 'fetch', '--quiet', '--prune', '--no-tags', 'origin',
+              *self.FETCH_REFSPECS], cwd=mirror)
+        logger.debug(f'Fetched "{clone_url}" into mirror in '
+                     f'{time.monotonic() - start:.2f} seconds')
+        if head:
+            _git(['git', 'symbolic-ref', 'HEAD', head], cwd=mirror)
+
+
+def _git(cmd, cwd=None):
+    # GIT_TERMINAL_PROMPT is supported since git 2.3. Older versions ask
+    # for credentials with GIT_ASKPASS program, that answers with an empty
+    # string, so the command fails instead of waiting for user input.
+    env = dict(os.environ, GIT_TERMINAL_PROMPT='0', GIT_ASKPASS='true')
+    with open(os.devnull, 'w') as null_file:
+        subprocess.check_call(cmd, cwd=cwd, stdout=null_file, env=env)
+
+
+def _get_dir_size(path):
+    size = 0
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                size += os.lstat(os.path.join(dirpath, filename)).st_size
+            except OSError:
+                pass
+    return size
 
 
 def get_current_branch(directory=None):
@@ -126,6 +313,53 @@ CommitInfo = collections.namedtuple(
     'CommitInfo', (v[0] for v in _LOG_FORMAT))
 
 
+TagInfo = collections.namedtuple('TagInfo', ('name', 'sha', 'date'))
+
+# Annotated tags are dereferenced to commits with `*` prefixed fields.
+# Only formats supported by git 1.8 are used.
+_TAG_FORMAT = '%1f'.join([
+    '%(refname)',
+    '%(objectname)',
+    '%(*objectname)',
+    '%(authordate:raw)',
+    '%(*authordate:raw)',
+])
+
+
+def _parse_raw_date(value):
+    """Parses date in git raw format (e.g. `1546300800 +0100`)."""
+    timestamp, offset = value.split()
+    minutes = int(offset[1:3]) * 60 + int(offset[3:5])
+    if offset[0] == '-':
+        minutes = -minutes
+    tz = datetime.timezone(datetime.timedelta(minutes=minutes))
+    return datetime.datetime.fromtimestamp(int(timestamp), tz)
+
+
+def get_tags(directory=None):
+    """Returns tags with commits they point to.
+
+    Tags that don't point to a commit are skipped.
+
+    :param directory: Repository directory.
+    :returns: List of tags with commit sha and commit author date.
+    :rtype: List[TagInfo]
+    """
+    cmd = ['git', 'for-each-ref', '--format=' + _TAG_FORMAT, 'refs/tags']
+    output = subprocess.check_output(cmd, cwd=directory).decode('utf-8')
+
+    tags = []
+    for line in output.splitlines():
+        name, sha, deref_sha, date, deref_date = line.split('\x1f')
+        if deref_sha:
+            sha, date = deref_sha, deref_date
+        if not date:
+            continue
+        name = name[len('refs/tags/'):]
+        tags.append(TagInfo(name, sha, _parse_raw_date(date)))
+    return tags
+
+
 def get_raw_commit_info(commit_id='HEAD', directory=None, date_format=None):
     """Returns metadata for the specified commit.
 
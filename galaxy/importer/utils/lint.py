@@ -15,6 +15,11 @@
 # You should have received a copy of the Apache License
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 
+import collections
+import hashlib
+import os
+import threading
+
 import attr
 
 
@@ -34,3 +39,71 @@ class LintRecord:
     message = attr.ib(type=str)
     severity = attr.ib(type=int, default=0)
     score_type = attr.ib(type=str, default=None)
+
+
+class LintResultCache:
+    """An LRU cache of linter results.
+
+    Results are keyed by linter id, linter version, linter configuration
+    hash and a digest of linted files content, so results of unchanged
+    content are reused across imports.
+
+    :param max_entries: Maximum number of cached results.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return None
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+def get_files_digest(root, path):
+    """Returns a digest of paths and content of files under path.
+
+    :param root: Repository root directory.
+    :param path: File or directory path relative to root.
+    """
+    digest = hashlib.sha256()
+    abs_path = os.path.join(root, path)
+    if os.path.isdir(abs_path):
+        filenames = []
+        for dirpath, dirnames, files in os.walk(abs_path):
+            dirnames[:] = [d for d in dirnames if d != '.git']
+            filenames.extend(os.path.join(dirpath, f) for f in files)
+    else:
+        filenames = [abs_path]
+
+    for filename in sorted(filenames):
+        if not os.path.isfile(filename):
+            continue
+        file_digest = hashlib.sha256()
+        with open(filename, 'rb') as fp:
+            for chunk in iter(lambda: fp.read(65536), b''):
+                file_digest.update(chunk)
+        rel_name = os.path.relpath(filename, abs_path)
+        digest.update(rel_name.encode('utf-8', 'surrogateescape'))
+        digest.update(b'\0')
+        digest.update(file_digest.digest())
+    return digest.hexdigest()
@@ -23,6 +23,7 @@ import os
 import markdown
 import bleach
 from bleach_allowlist import markdown_tags, markdown_attrs
+from docutils import core as docutils_core
 
 README_NAME = 'README'
 README_EXTENSIONS = [
@@ -36,6 +37,22 @@ README_MIMETYPES = {
 }
 README_MAX_SIZE = 512 * 1024  # 512 KiB
 
+# Version of README renderer output. Must be incremented when rendered
+# HTML changes, so that cached renders are invalidated.
+RENDERER_VERSION = 1
+
+ALLOWED_TAGS = markdown_tags + ['pre', 'table', 'thead', 'th', 'tr', 'td']
+
+RST_SETTINGS = {
+    'doctitle_xform': False,
+    'embed_stylesheet': False,
+    'file_insertion_enabled': False,
+    'raw_enabled': False,
+    'report_level': 5,
+    'halt_level': 5,
+    'warning_stream': False,
+}
+
 ReadmeFile = collections.namedtuple(
     'ReadmeFile', ['text', 'mimetype', 'hash']
 )
@@ -86,19 +103,23 @@ def get_readme(directory, root_dir=None, filename=None):
 
 
 def render_html(readme_file):
-    html = ''
     if readme_file.mimetype == 'text/x-rst':
-        pass
+        unsafe_html = docutils_core.publish_parts(
+            readme_file.text,
+            writer_name='html5',
+            settings_overrides=RST_SETTINGS,
+        )['body']
     elif readme_file.mimetype == 'text/markdown':
         unsafe_html = markdown.markdown(readme_file.text, extensions=['extra'])
-
-        # note on bleach coming after markdown, and bleach_allowlist
-        # https://github.com/Python-Markdown/markdown/issues/225
-        html = bleach.clean(
-            unsafe_html,
-            tags=markdown_tags + ['pre', 'table', 'thead', 'th', 'tr', 'td'],
-            attributes=markdown_attrs,
-            styles=[],
-            strip=True
-        )
-    return html
+    else:
+        return ''
+
+    # note on bleach coming after markdown, and bleach_allowlist
+    # https://github.com/Python-Markdown/markdown/issues/225
+    return bleach.clean(
+        unsafe_html,
+        tags=ALLOWED_TAGS,
+        attributes=markdown_attrs,
+        styles=[],
+        strip=True
+    )
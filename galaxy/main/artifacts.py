@@ -0,0 +1,112 @@
+# (c) 2012-2019, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+"""Cache of resolved collection artifacts.
+
+Published artifacts are immutable, so artifact lookups by a download
+filename are cached on first download for `GALAXY_ARTIFACT_CACHE_TIMEOUT`
+seconds. The cache is not filled on publish, since import workers don't
+share the default per-process cache with API processes. Deleting
+a collection version evicts its artifact from the `GALAXY_ARTIFACT_CACHE`
+cache, which reaches other processes only if the cache is shared by them.
+"""
+
+import typing as t
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from pulpcore.app import models as pulp_models
+
+from galaxy.common.schema import CollectionFilename
+
+
+__all__ = (
+    'ResolvedArtifact',
+    'evict_artifact',
+    'resolve_artifact',
+)
+
+CACHE_KEY_PREFIX = 'galaxy:artifact:'
+
+
+class ResolvedArtifact(t.NamedTuple):
+    version_id: t.Any
+    collection_id: int
+    relative_path: str
+    storage_name: str
+    sha256: str
+    size: int
+
+
+def _get_cache():
+    return caches[settings.GALAXY_ARTIFACT_CACHE]
+
+
+def _cache_key(namespace: str, name: str, version: str) -> str:
+    # Namespace and collection names are matched case insensitively.
+    filename = CollectionFilename(namespace.lower(), name.lower(), version)
+    return CACHE_KEY_PREFIX + str(filename)
+
+
+def resolve_artifact(
+        filename: CollectionFilename) -> t.Optional[ResolvedArtifact]:
+    """Returns an artifact of a collection version.
+
+    :return: Resolved artifact or None if collection version or its
+        artifact does not exist.
+    """
+    key = _cache_key(filename.namespace, filename.name, str(filename.version))
+    cache = _get_cache()
+    resolved = cache.get(key)
+    if resolved is not None:
+        return ResolvedArtifact(*resolved)
+
+    prefix = 'content__collectionversion__'
+    row = pulp_models.ContentArtifact.objects.filter(**{
+        prefix + 'collection__namespace__name__iexact': filename.namespace,
+        prefix + 'collection__name__iexact': filename.name,
+        prefix + 'version__exact': str(filename.version),
+    }).values_list(
+        'content',
+        prefix + 'collection',
+        'relative_path',
+        'artifact__file',
+        'artifact__sha256',
+        'artifact__size',
+    ).first()
+    if row is None:
+        return None
+
+    resolved = ResolvedArtifact(*row)
+    cache.set(key, tuple(resolved), settings.GALAXY_ARTIFACT_CACHE_TIMEOUT)
+    return resolved
+
+
+def evict_artifact(version) -> None:
+    """Removes an artifact of a collection version from cache.
+
+    The artifact is evicted immediately and once again after the current
+    transaction is committed, in case it was cached by a concurrent
+    request in the meantime.
+    """
+    collection = version.collection
+    key = _cache_key(
+        collection.namespace.name, collection.name, version.version)
+    cache = _get_cache()
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
@@ -22,10 +22,12 @@ import celery
 import github
 
 from django.db import transaction
+from django.db.models import F
 from django.utils import timezone
 from django.core.exceptions import ObjectDoesNotExist
 
 from galaxy.main.models import Content, ImportTask
+from galaxy.main import downloads
 from galaxy.main import models
 from galaxy import constants
 
@@ -303,8 +305,16 @@ def clear_stuck_imports():
                     u'seeing this message you may '
                     u'have a syntax error in your "meta/main.yml" file.')
             )
-            ri.save()
+            # Counters may be incremented concurrently by a running import
+            ri.error_count = F('error_count') + 1
+            ri.save(update_fields=['state', 'error_count', 'modified'])
             transaction.commit()
     except Exception as exc:
         LOG.error(u"Clear Stuck Imports ERROR: {}".format(exc))
         raise
+
+
+@celery.task(name="galaxy.main.celerytasks.tasks.apply_download_counts")
+def apply_download_counts():
+    updated = downloads.apply_pending()
+    LOG.info(u"Apply Download Counts: {} counters updated".format(updated))
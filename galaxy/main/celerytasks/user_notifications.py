@@ -16,11 +16,13 @@
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 
 import logging
+import smtplib
 
 import celery
 from django.contrib.sites.models import Site
 from django.conf import settings
 from django.core import mail
+from django.db.models import OuterRef, QuerySet, Subquery
 from allauth.account.models import EmailAddress
 
 from galaxy.main import models
@@ -55,45 +57,88 @@ class NotificationManger(object):
 
         return text + footer
 
+    def get_recipients(self):
+        """Returns user preferences and primary emails of recipients.
+
+        :return: A list of (user_id, preferences, email) tuples.
+        """
+        preferences = self.preferences_list
+        if not isinstance(preferences, QuerySet):
+            preferences = models.UserPreferences.objects.filter(
+                pk__in=[p.pk for p in preferences])
+        primary_email = EmailAddress.objects.filter(
+            user=OuterRef('user'), primary=True).values('email')[:1]
+        return list(preferences.annotate(
+            primary_email=Subquery(primary_email),
+        ).values_list('user', 'preferences', 'primary_email'))
+
     def send(self, email_message):
-        for user in self.preferences_list:
-
-            # Create in app notification
-            try:
-                if user.preferences['ui_' + self.preferences_name]:
-                    models.UserNotification.objects.create(
-                        user=user.user,
-                        type=self.preferences_name,
-                        message=self.db_message,
-                        repository=self.repo,
-                        collection=self.collection,
-                    )
-            except Exception as e:
-                LOG.error(e)
-
-            # Create email notification
-            try:
-                if user.preferences[self.preferences_name]:
-                    email = EmailAddress.objects.filter(
-                        primary=True,
-                        user=user.user,
-                    )
-
-                    mail.send_mail(
-                        self.subject,
-                        email_message,
-                        settings.GALAXY_NOTIFICATION_EMAIL,
-                        [email[0].email],
-                        fail_silently=False
-                    )
-            except Exception as e:
-                LOG.error(e)
+        ui_preference_name = 'ui_' + self.preferences_name
+
+        notifications = []
+        emails = []
+        for user_id, preferences, email in self.get_recipients():
+            if preferences.get(ui_preference_name):
+                notifications.append(models.UserNotification(
+                    user_id=user_id,
+                    type=self.preferences_name,
+                    message=self.db_message,
+                    repository=self.repo,
+                    collection=self.collection,
+                ))
+            if preferences.get(self.preferences_name):
+                if email:
+                    emails.append(email)
+                else:
+                    LOG.warning(
+                        f'User {user_id} has no primary email address')
+
+        # Create in app notifications
+        try:
+            models.UserNotification.objects.bulk_create(notifications)
+        except Exception as e:
+            LOG.error(e)
+
+        # Send email notifications
+        chunk_size = settings.GALAXY_NOTIFICATION_EMAIL_CHUNK_SIZE
+        for i in range(0, len(emails), chunk_size):
+            send_emails.delay(
+                self.subject, email_message, emails[i:i + chunk_size])
 
     def notify(self, context):
         email = self.render_email(context)
         self.send(email)
 
 
+@celery.task(
+    bind=True,
+    max_retries=5,
+    default_retry_delay=60,
+    rate_limit=settings.GALAXY_NOTIFICATION_EMAIL_RATE_LIMIT,
+)
+def send_emails(self, subject, message, recipients):
+    """Sends an email to each recipient over a single connection.
+
+    If sending fails, the task is retried for the recipients,
+    that have not received the email yet.
+    """
+    sent = 0
+    try:
+        with mail.get_connection(fail_silently=False) as connection:
+            for recipient in recipients:
+                mail.EmailMessage(
+                    subject,
+                    message,
+                    settings.GALAXY_NOTIFICATION_EMAIL,
+                    [recipient],
+                    connection=connection,
+                ).send()
+                sent += 1
+    except (smtplib.SMTPException, OSError) as e:
+        LOG.warning(f'Failed to send notification emails: {e}')
+        raise self.retry(args=(subject, message, recipients[sent:]), exc=e)
+
+
 def email_verification(email, code, username):
     url = settings.GALAXY_URL.format(
         site=Site.objects.get_current().domain
@@ -0,0 +1,118 @@
+# (c) 2012-2019, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+"""Per-namespace and per-repository content type counters.
+
+Counters are updated in the transaction, that creates or deletes content
+(see `galaxy.main.signals.handlers`), with a single statement per
+counter table. `reconcile` recalculates counters from the `Content` table.
+"""
+
+from django.db import connection, transaction
+
+from galaxy.main import models
+
+
+__all__ = (
+    'decrement',
+    'increment',
+    'reconcile',
+)
+
+# Counter model and name of a content column, that references a counted
+# object.
+COUNTERS = (
+    (models.NamespaceContentCount, 'namespace_id'),
+    (models.RepositoryContentCount, 'repository_id'),
+)
+
+INCREMENT_QUERY = '''
+INSERT INTO {table} ({column}, content_type_id, count)
+VALUES (%s, %s, 1)
+ON CONFLICT ({column}, content_type_id)
+DO UPDATE SET count = {table}.count + 1
+'''
+
+# Counters are not inserted on decrement, because counted objects may be
+# deleted along with content.
+DECREMENT_QUERY = '''
+UPDATE {table} SET count = count - 1
+WHERE {column} = %s AND content_type_id = %s
+'''
+
+RECONCILE_QUERY = '''
+WITH actual AS (
+    SELECT {column}, content_type_id, COUNT(*) AS count
+    FROM {content_table}
+    GROUP BY {column}, content_type_id
+), upserted AS (
+    INSERT INTO {table} ({column}, content_type_id, count)
+    SELECT {column}, content_type_id, count FROM actual
+    ON CONFLICT ({column}, content_type_id)
+    DO UPDATE SET count = EXCLUDED.count
+    WHERE {table}.count <> EXCLUDED.count
+    RETURNING 1
+), deleted AS (
+    DELETE FROM {table} t
+    WHERE NOT EXISTS (
+        SELECT 1 FROM actual a
+        WHERE a.{column} = t.{column}
+          AND a.content_type_id = t.content_type_id
+    )
+    RETURNING 1
+)
+SELECT (SELECT COUNT(*) FROM upserted) + (SELECT COUNT(*) FROM deleted)
+'''
+
+
+def _update(query, content):
+    with connection.cursor() as cursor:
+        for model, column in COUNTERS:
+            cursor.execute(
+                query.format(table=model._meta.db_table, column=column),
+                [getattr(content, column), content.content_type_id])
+
+
+def increment(content) -> None:
+    """Counts a created content object."""
+    _update(INCREMENT_QUERY, content)
+
+
+def decrement(content) -> None:
+    """Uncounts a deleted content object."""
+    _update(DECREMENT_QUERY, content)
+
+
+def reconcile() -> int:
+    """Recalculates all counters.
+
+    Content changes are blocked while counters are recalculated.
+
+    :return: Number of corrected counters.
+    """
+    corrected = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute('LOCK TABLE {} IN SHARE MODE'.format(
+            models.Content._meta.db_table))
+        for model, column in COUNTERS:
+            cursor.execute(RECONCILE_QUERY.format(
+                table=model._meta.db_table,
+                column=column,
+                content_table=models.Content._meta.db_table,
+            ))
+            corrected += cursor.fetchone()[0]
+    return corrected
@@ -0,0 +1,158 @@
+# (c) 2012-2019, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+"""Collection dependency resolution.
+
+Versions of all collections referenced by a set of dependencies are
+loaded with a single query. Parsed versions and specifiers are cached.
+"""
+
+import collections
+import enum
+import functools
+import typing as t
+
+import semantic_version as semver
+
+from galaxy.main import models
+
+
+__all__ = (
+    'DependencyReport',
+    'DependencyStatus',
+    'resolve_dependencies',
+)
+
+
+class DependencyStatus(enum.Enum):
+    OK = 'ok'
+    INVALID = 'invalid'
+    NAMESPACE_NOT_FOUND = 'namespace_not_found'
+    COLLECTION_NOT_FOUND = 'collection_not_found'
+    VERSION_NOT_FOUND = 'version_not_found'
+
+
+class DependencyReport(t.NamedTuple):
+    """Resolution result of a single dependency.
+
+    :var name: Dependency name in `namespace.name` format.
+    :var version_spec: Requested version specifier.
+    :var status: Resolution status.
+    :var version: The highest version matching the specifier.
+    """
+
+    name: str
+    version_spec: str
+    status: DependencyStatus
+    version: t.Optional[str] = None
+
+    @property
+    def is_resolved(self) -> bool:
+        return self.status is DependencyStatus.OK
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_version(version: str) -> semver.Version:
+    return semver.Version(version)
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_spec(version_spec: str) -> semver.Spec:
+    return semver.Spec(version_spec)
+
+
+def _split_name(name):
+    parts = name.split('.')
+    if len(parts) != 2 or not all(parts):
+        raise ValueError(f'Invalid dependency name: {name}')
+    return tuple(parts)
+
+
+def _load_versions(names):
+    """Loads versions of collections referenced by dependencies.
+
+    :param names: A set of (namespace, name) tuples.
+    :return: A dictionary, that maps (namespace, name) of existing
+        collections to a list of their versions.
+    """
+    versions = collections.defaultdict(list)
+    if not names:
+        return versions
+
+    qs = models.Collection.objects.filter(
+        namespace__name__in={ns_name for ns_name, _ in names},
+        name__in={name for _, name in names},
+    ).values_list('namespace__name', 'name', 'versions__version')
+    for ns_name, name, version in qs:
+        if (ns_name, name) not in names:
+            continue
+        collection_versions = versions[(ns_name, name)]
+        if version is not None:
+            collection_versions.append(version)
+    return versions
+
+
+def _load_namespaces(ns_names):
+    if not ns_names:
+        return set()
+    return set(models.Namespace.objects.filter(
+        name__in=ns_names).values_list('name', flat=True))
+
+
+def resolve_dependencies(
+        dependencies: t.Mapping[str, str]) -> t.List[DependencyReport]:
+    """Resolves collection dependencies.
+
+    :param dependencies: A dictionary, that maps dependency names in
+        `namespace.name` format to version specifiers.
+    :return: A list of reports in order of dependencies.
+    """
+    parsed = collections.OrderedDict()
+    for name, version_spec in dependencies.items():
+        try:
+            parsed[name] = (_split_name(name), _parse_spec(version_spec))
+        except (TypeError, ValueError):
+            parsed[name] = None
+
+    names = {value[0] for value in parsed.values() if value is not None}
+    versions = _load_versions(names)
+    # Namespaces are loaded only to report missing collections.
+    namespaces = _load_namespaces(
+        {ns_name for ns_name, _ in names - versions.keys()})
+
+    reports = []
+    for name, version_spec in dependencies.items():
+        if parsed[name] is None:
+            status, version = DependencyStatus.INVALID, None
+        else:
+            status, version = _resolve(namespaces, versions, *parsed[name])
+        reports.append(
+            DependencyReport(name, version_spec, status, version))
+    return reports
+
+
+def _resolve(namespaces, versions, name, spec):
+    if name not in versions:
+        ns_name, _ = name
+        if ns_name not in namespaces:
+            return DependencyStatus.NAMESPACE_NOT_FOUND, None
+        return DependencyStatus.COLLECTION_NOT_FOUND, None
+
+    version = spec.select(_parse_version(v) for v in versions[name])
+    if version is None:
+        return DependencyStatus.VERSION_NOT_FOUND, None
+    return DependencyStatus.OK, str(version)
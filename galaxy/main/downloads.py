@@ -0,0 +1,235 @@
+# (c) 2012-2019, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+"""Write-behind download counters.
+
+Download counts are incremented in two stages:
+
+1. Increments are aggregated in process memory and written to
+   the `DownloadCountDelta` table with a single bulk insert by
+   a background thread. Inserting deltas does not lock counted rows.
+2. Pending deltas are applied to `download_count` columns with a single
+   ``UPDATE ... FROM`` statement per table, that deletes applied deltas
+   in the same transaction. This is done by the periodic
+   `apply_download_counts` celery task (or `flush_download_counts`
+   management command), not in request handling processes.
+
+Deltas written to the database survive process crashes and are applied
+exactly once. Only increments buffered in memory since the last flush,
+at most `GALAXY_DOWNLOAD_COUNT_FLUSH_INTERVAL` seconds of downloads,
+may be lost if a process is killed.
+"""
+
+import atexit
+import collections
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+import prometheus_client
+
+from galaxy.main import models
+
+
+__all__ = (
+    'DownloadCounter',
+    'apply_pending',
+    'download_counter',
+)
+
+log = logging.getLogger(__name__)
+
+TARGET_TABLES = collections.OrderedDict([
+    (models.DownloadCountDelta.TARGET_COLLECTION,
+     models.Collection._meta.db_table),
+    (models.DownloadCountDelta.TARGET_REPOSITORY,
+     models.Repository._meta.db_table),
+])
+
+# Arbitrary key of a PostgreSQL advisory lock, that prevents concurrent
+# application of pending deltas.
+APPLY_LOCK_ID = 0x6761_6478  # 'gadx'
+
+APPLY_DELTAS_QUERY = '''
+WITH deltas AS (
+    DELETE FROM {deltas_table}
+    WHERE target = %s
+    RETURNING object_id, delta
+)
+UPDATE {table} AS t
+SET download_count = t.download_count + d.delta
+FROM (
+    SELECT object_id, SUM(delta) AS delta
+    FROM deltas
+    GROUP BY object_id
+) AS d
+WHERE t.id = d.object_id
+'''
+
+buffered_increments = prometheus_client.Gauge(
+    'galaxy_download_count_buffered',
+    'Number of download count increments buffered in memory.',
+)
+flushed_increments = prometheus_client.Counter(
+    'galaxy_download_count_flushed_total',
+    'Number of download count increments written to the database.',
+)
+applied_counters = prometheus_client.Counter(
+    'galaxy_download_count_applied_total',
+    'Number of download counters updated from pending deltas.',
+)
+
+
+class DownloadCounter:
+    """Buffers download count increments in memory.
+
+    Buffered increments are flushed by a background thread every
+    `flush_interval` seconds, as soon as number of buffered increments
+    reaches `flush_size`, and on process exit. The thread is started with
+    the first increment in a process, so that forked worker processes
+    start their own threads.
+
+    If `flush_interval` is 0, increments are not buffered: they are
+    written and applied to counters immediately by the calling thread.
+    """
+
+    def __init__(self, flush_interval=None, flush_size=None):
+        if flush_interval is None:
+            flush_interval = settings.GALAXY_DOWNLOAD_COUNT_FLUSH_INTERVAL
+        if flush_size is None:
+            flush_size = settings.GALAXY_DOWNLOAD_COUNT_FLUSH_SIZE
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+
+        self._lock = threading.Lock()
+        self._buffer = collections.Counter()
+        self._buffered = 0
+        self._wakeup = threading.Event()
+        self._thread_pid = None
+
+    def increment_collection(self, collection_id):
+        self._increment(
+            models.DownloadCountDelta.TARGET_COLLECTION, collection_id)
+
+    def increment_repository(self, repository_id):
+        self._increment(
+            models.DownloadCountDelta.TARGET_REPOSITORY, repository_id)
+
+    def _increment(self, target, object_id):
+        with self._lock:
+            self._buffer[(target, object_id)] += 1
+            self._buffered += 1
+            buffered_increments.inc()
+            should_flush = self._buffered >= self.flush_size
+        if not self.flush_interval:
+            if self.flush():
+                apply_pending(wait=False)
+            return
+        self._ensure_flush_thread()
+        if should_flush:
+            self._wakeup.set()
+
+    def _ensure_flush_thread(self):
+        pid = os.getpid()
+        if self._thread_pid == pid:
+            return
+        with self._lock:
+            if self._thread_pid == pid:
+                return
+            self._thread_pid = pid
+        threading.Thread(
+            target=self._run, name='download-counter', daemon=True,
+        ).start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            # The thread holds its own database connection, which is
+            # not managed by request handling.
+            close_old_connections()
+            try:
+                self.flush()
+            except Exception:
+                log.exception('Failed to flush download count increments.')
+
+    def flush(self):
+        """Writes buffered increments to the database.
+
+        If writing fails, increments are returned to the buffer and
+        will be written with the next flush.
+
+        :return: Number of flushed increments.
+        """
+        with self._lock:
+            deltas, self._buffer = self._buffer, collections.Counter()
+            buffered, self._buffered = self._buffered, 0
+        if not deltas:
+            return 0
+
+        try:
+            with transaction.atomic():
+                models.DownloadCountDelta.objects.bulk_create([
+                    models.DownloadCountDelta(
+                        target=target, object_id=object_id, delta=delta)
+                    for (target, object_id), delta in deltas.items()
+                ])
+        except Exception:
+            log.exception('Failed to write download count increments.')
+            with self._lock:
+                self._buffer.update(deltas)
+                self._buffered += buffered
+            return 0
+
+        buffered_increments.dec(buffered)
+        flushed_increments.inc(buffered)
+        return buffered
+
+
+@transaction.atomic
+def apply_pending(wait=True):
+    """Applies pending download count deltas to counters.
+
+    :param wait: If False and deltas are being applied by another process,
+        return immediately.
+    :return: Number of updated counters or None if lock was not acquired.
+    """
+    with connection.cursor() as cursor:
+        if wait:
+            cursor.execute('SELECT pg_advisory_xact_lock(%s)',
+                           [APPLY_LOCK_ID])
+        else:
+            cursor.execute('SELECT pg_try_advisory_xact_lock(%s)',
+                           [APPLY_LOCK_ID])
+            if not cursor.fetchone()[0]:
+                return None
+
+        updated = 0
+        for target, table in TARGET_TABLES.items():
+            cursor.execute(APPLY_DELTAS_QUERY.format(
+                deltas_table=models.DownloadCountDelta._meta.db_table,
+                table=table,
+            ), [target])
+            updated += cursor.rowcount
+    applied_counters.inc(updated)
+    return updated
+
+
+download_counter = DownloadCounter()
+atexit.register(download_counter.flush)
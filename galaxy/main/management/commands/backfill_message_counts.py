@@ -0,0 +1,95 @@
+# (c) 2012-2019, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db import transaction
+
+from galaxy import constants
+from galaxy.main import models
+
+
+IMPORT_TASK_QUERY = '''
+UPDATE main_importtask t
+SET error_count = c.error_count,
+    warning_count = c.warning_count,
+    info_count = c.info_count
+FROM (
+    SELECT task_id,
+           COUNT(*) FILTER (WHERE message_type = %(error)s) AS error_count,
+           COUNT(*) FILTER (WHERE message_type = %(warning)s) AS warning_count,
+           COUNT(*) FILTER (WHERE message_type = %(info)s) AS info_count
+    FROM main_importtaskmessage
+    WHERE task_id > %(start)s AND task_id <= %(end)s
+    GROUP BY task_id
+) c
+WHERE t.id = c.task_id
+'''
+
+COLLECTION_IMPORT_QUERY = '''
+UPDATE main_collectionimport t
+SET error_count = c.error_count,
+    warning_count = c.warning_count,
+    info_count = c.info_count
+FROM (
+    SELECT task_ptr_id,
+           COUNT(m) FILTER (WHERE m->>'level' = 'ERROR') AS error_count,
+           COUNT(m) FILTER (WHERE m->>'level' = 'WARNING') AS warning_count,
+           COUNT(m) FILTER (WHERE m->>'level' = 'INFO') AS info_count
+    FROM main_collectionimport
+    LEFT JOIN LATERAL jsonb_array_elements(messages) m ON TRUE
+    WHERE task_ptr_id > %(start)s AND task_ptr_id <= %(end)s
+    GROUP BY task_ptr_id
+) c
+WHERE t.task_ptr_id = c.task_ptr_id
+'''
+
+
+class Command(BaseCommand):
+    help = ('Recalculates message counters of repository and collection '
+            'import tasks from stored messages.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=10000,
+            help='Number of tasks updated in a single transaction.')
+
+    def handle(self, *args, **options):
+        params = {
+            'error': constants.ImportTaskMessageType.ERROR.value,
+            'warning': constants.ImportTaskMessageType.WARNING.value,
+            'info': constants.ImportTaskMessageType.INFO.value,
+        }
+        for model, query in [
+            (models.ImportTask, IMPORT_TASK_QUERY),
+            (models.CollectionImport, COLLECTION_IMPORT_QUERY),
+        ]:
+            total = self._backfill(
+                model, query, params, options['batch_size'])
+            self.stdout.write(
+                f'Updated {total} {model._meta.verbose_name} objects.')
+
+    def _backfill(self, model, query, params, batch_size):
+        max_pk = model.objects.order_by('-pk').values_list(
+            'pk', flat=True).first() or 0
+        total = 0
+        for start in range(0, max_pk, batch_size):
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(query, dict(
+                    params, start=start, end=start + batch_size))
+                total += cursor.rowcount
+        return total
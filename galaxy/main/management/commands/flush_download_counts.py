@@ -0,0 +1,29 @@
+# (c) 2012-2019, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+from django.core.management.base import BaseCommand
+
+from galaxy.main import downloads
+
+
+class Command(BaseCommand):
+    help = ('Applies pending download count increments, written by web '
+            'workers, to collection and repository download counters.')
+
+    def handle(self, *args, **kwargs):
+        updated = downloads.apply_pending()
+        self.stdout.write(f'Updated {updated} counters.')
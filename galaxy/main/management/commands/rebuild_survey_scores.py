@@ -0,0 +1,30 @@
+# (c) 2012-2019, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+from django.core.management.base import BaseCommand
+
+from galaxy.main import survey_scores
+
+
+class Command(BaseCommand):
+    help = ('Recalculates community survey aggregates and scores of '
+            'repositories and collections from existing surveys.')
+
+    def handle(self, *args, **options):
+        corrected = survey_scores.rebuild()
+        self.stdout.write(
+            f'Corrected {corrected} repository and collection scores.')
@@ -0,0 +1,78 @@
+# (c) 2012-2019, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+import os
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from galaxy.importer.utils import readme as readme_utils
+from galaxy.main import models
+from galaxy.main import readmes
+
+
+class Command(BaseCommand):
+    help = ('Renders README files that were rendered by GitHub API or '
+            'by an outdated version of the local renderer.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count(),
+            help='Number of rendering processes.')
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Number of README objects processed at once.')
+
+    def handle(self, *args, **options):
+        stale = models.Readme.objects.filter(
+            Q(renderer_version__isnull=True)
+            | Q(renderer_version__lt=readmes.RENDERER_VERSION)
+        ).order_by('pk')
+
+        total = 0
+        last_pk = 0
+        while True:
+            batch = list(stale.filter(pk__gt=last_pk).values_list(
+                'pk', 'raw', 'raw_hash', 'mimetype')[:options['batch_size']])
+            if not batch:
+                break
+            last_pk = batch[-1][0]
+
+            files = [readme_utils.ReadmeFile(
+                text=raw, mimetype=readmes.get_mimetype(mimetype),
+                hash=raw_hash) for _, raw, raw_hash, mimetype in batch]
+            rendered = readmes.render_readmes(
+                files, workers=options['workers'])
+
+            now = timezone.now()
+            models.Readme.objects.bulk_update([
+                models.Readme(
+                    pk=pk,
+                    html=rendered[(f.hash, f.mimetype)],
+                    renderer_version=readmes.RENDERER_VERSION,
+                    modified=now,
+                ) for (pk, *_), f in zip(batch, files)
+            ], ['html', 'renderer_version', 'modified'])
+            total += len(batch)
+            self.stdout.write(f'Rendered {total} README files.')
+
+        deleted, _ = models.RenderedReadme.objects.filter(
+            renderer_version__lt=readmes.RENDERER_VERSION).delete()
+        self.stdout.write(
+            f'Rendered {total} README files, '
+            f'removed {deleted} outdated cache entries.')
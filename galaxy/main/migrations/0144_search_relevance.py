@@ -0,0 +1,236 @@
+from django.db import migrations
+from django.db import models
+
+# Static parts of a search relevance. These functions must be kept in sync
+# with the formulas documented in `galaxy.api.internal.search`.
+#
+# Collection relevance:
+#   R = 0.2 * log(Q + 1) + 0.1 * v
+#
+# Content download rank and relevance:
+#                ln((0.002 * c + 0.005) * d + 1)
+#   Dr = 0.4 * -----------------------------------
+#              ln((0.002 * c + 0.005) * d + 1) + 1
+#   R = Dr + 0.2 * log(Q + 1)
+CREATE_RELEVANCE_FUNCTIONS = '''
+CREATE OR REPLACE FUNCTION collection_search_relevance(
+    quality_score DOUBLE PRECISION, is_vendor BOOLEAN)
+    RETURNS DOUBLE PRECISION AS
+$$
+    SELECT log(coalesce($1, 0) + 1) * 0.2
+           + CASE WHEN $2 THEN 0.1 ELSE 0 END;
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION content_search_download_rank(
+    download_count INTEGER, community_score DOUBLE PRECISION)
+    RETURNS DOUBLE PRECISION AS
+$$
+    SELECT dl / (1 + dl) * 0.4
+    FROM (
+        SELECT ln((coalesce($2, 0) * 0.002 + 0.005) * $1 + 1) AS dl
+    ) AS t;
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION content_search_quality_rank(
+    quality_score DOUBLE PRECISION)
+    RETURNS DOUBLE PRECISION AS
+$$
+    SELECT log(coalesce($1, 0) + 1) * 0.2;
+$$ LANGUAGE sql IMMUTABLE;
+'''
+
+DROP_RELEVANCE_FUNCTIONS = '''
+DROP FUNCTION IF EXISTS collection_search_relevance(
+    DOUBLE PRECISION, BOOLEAN);
+DROP FUNCTION IF EXISTS content_search_download_rank(
+    INTEGER, DOUBLE PRECISION);
+DROP FUNCTION IF EXISTS content_search_quality_rank(DOUBLE PRECISION);
+'''
+
+# Collection relevance depends on a latest version quality score and
+# a namespace vendor flag. It is recalculated on each collection update,
+# since Django saves all model fields and would otherwise overwrite it with
+# a stale value. Changes in the referenced rows are propagated by
+# touching related collection rows.
+CREATE_COLLECTION_RELEVANCE_TRIGGERS = '''
+CREATE OR REPLACE FUNCTION update_collection_search_relevance()
+    RETURNS TRIGGER AS
+$$
+BEGIN
+    NEW.search_relevance := collection_search_relevance(
+        (SELECT quality_score FROM main_collectionversion
+         WHERE id = NEW.latest_version_id),
+        (SELECT is_vendor FROM main_namespace
+         WHERE id = NEW.namespace_id)
+    );
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER update_search_relevance
+    BEFORE INSERT OR UPDATE
+    ON main_collection
+    FOR EACH ROW
+EXECUTE PROCEDURE update_collection_search_relevance();
+
+CREATE OR REPLACE FUNCTION on_namespace_update_search_relevance()
+    RETURNS TRIGGER AS
+$$
+BEGIN
+    IF OLD.is_vendor IS DISTINCT FROM NEW.is_vendor THEN
+        UPDATE main_collection SET search_relevance = 0
+        WHERE namespace_id = NEW.id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER update_collection_search_relevance
+    AFTER UPDATE
+    ON main_namespace
+    FOR EACH ROW
+EXECUTE PROCEDURE on_namespace_update_search_relevance();
+
+CREATE OR REPLACE FUNCTION on_collectionversion_update_search_relevance()
+    RETURNS TRIGGER AS
+$$
+BEGIN
+    IF OLD.quality_score IS DISTINCT FROM NEW.quality_score THEN
+        UPDATE main_collection SET search_relevance = 0
+        WHERE latest_version_id = NEW.id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER update_collection_search_relevance
+    AFTER UPDATE
+    ON main_collectionversion
+    FOR EACH ROW
+EXECUTE PROCEDURE on_collectionversion_update_search_relevance();
+'''
+
+DROP_COLLECTION_RELEVANCE_TRIGGERS = '''
+DROP TRIGGER IF EXISTS update_collection_search_relevance
+    ON main_collectionversion;
+DROP FUNCTION IF EXISTS on_collectionversion_update_search_relevance();
+DROP TRIGGER IF EXISTS update_collection_search_relevance ON main_namespace;
+DROP FUNCTION IF EXISTS on_namespace_update_search_relevance();
+DROP TRIGGER IF EXISTS update_search_relevance ON main_collection;
+DROP FUNCTION IF EXISTS update_collection_search_relevance();
+'''
+
+# Content relevance depends on repository download count, community score
+# and quality score. Same as for collections it is recalculated on each
+# content update and propagated from repository updates.
+CREATE_CONTENT_RELEVANCE_TRIGGERS = '''
+CREATE OR REPLACE FUNCTION update_content_search_relevance()
+    RETURNS TRIGGER AS
+$$
+DECLARE repo RECORD;
+BEGIN
+    SELECT download_count, community_score, quality_score INTO repo
+    FROM main_repository WHERE id = NEW.repository_id;
+
+    NEW.search_download_rank := content_search_download_rank(
+        repo.download_count, repo.community_score);
+    NEW.search_relevance := (
+        NEW.search_download_rank
+        + content_search_quality_rank(repo.quality_score)
+    );
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER update_search_relevance
+    BEFORE INSERT OR UPDATE
+    ON main_content
+    FOR EACH ROW
+EXECUTE PROCEDURE update_content_search_relevance();
+
+CREATE OR REPLACE FUNCTION on_repository_update_search_relevance()
+    RETURNS TRIGGER AS
+$$
+BEGIN
+    IF OLD.download_count IS DISTINCT FROM NEW.download_count
+       OR OLD.community_score IS DISTINCT FROM NEW.community_score
+       OR OLD.quality_score IS DISTINCT FROM NEW.quality_score THEN
+        UPDATE main_content SET search_relevance = 0
+        WHERE repository_id = NEW.id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER update_content_search_relevance
+    AFTER UPDATE
+    ON main_repository
+    FOR EACH ROW
+EXECUTE PROCEDURE on_repository_update_search_relevance();
+'''
+
+DROP_CONTENT_RELEVANCE_TRIGGERS = '''
+DROP TRIGGER IF EXISTS update_content_search_relevance ON main_repository;
+DROP FUNCTION IF EXISTS on_repository_update_search_relevance();
+DROP TRIGGER IF EXISTS update_search_relevance ON main_content;
+DROP FUNCTION IF EXISTS update_content_search_relevance();
+'''
+
+# Triggers recalculate relevance on any update, so we only need to touch
+# existing rows.
+POPULATE_SEARCH_RELEVANCE = '''
+UPDATE main_collection SET search_relevance = 0;
+UPDATE main_content SET search_relevance = 0;
+'''
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('main', '0143_collection_on_delete'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='collection',
+            name='search_relevance',
+            field=models.FloatField(default=0.0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='content',
+            name='search_download_rank',
+            field=models.FloatField(default=0.0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='content',
+            name='search_relevance',
+            field=models.FloatField(default=0.0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='collection',
+            index=models.Index(
+                fields=['search_relevance'],
+                name='main_collec_search__c0ef7a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='content',
+            index=models.Index(
+                fields=['search_relevance'],
+                name='main_conten_search__f96b60_idx'),
+        ),
+        migrations.RunSQL(
+            sql=CREATE_RELEVANCE_FUNCTIONS,
+            reverse_sql=DROP_RELEVANCE_FUNCTIONS,
+        ),
+        migrations.RunSQL(
+            sql=CREATE_COLLECTION_RELEVANCE_TRIGGERS,
+            reverse_sql=DROP_COLLECTION_RELEVANCE_TRIGGERS,
+        ),
+        migrations.RunSQL(
+            sql=CREATE_CONTENT_RELEVANCE_TRIGGERS,
+            reverse_sql=DROP_CONTENT_RELEVANCE_TRIGGERS,
+        ),
+        migrations.RunSQL(
+            sql=POPULATE_SEARCH_RELEVANCE,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,69 @@
+from django.contrib.postgres import fields as psql_fields
+from django.db import migrations
+from django.db import models
+
+from galaxy.common.version import get_semver_sort_key
+
+
+def set_version_sort_key(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    CollectionVersion = apps.get_model('main', 'CollectionVersion')
+    versions = CollectionVersion.objects.using(db_alias).only('version')
+    for version in versions.iterator():
+        (version.version_major, version.version_minor, version.version_patch,
+         version.version_prerelease) = get_semver_sort_key(version.version)
+        version.save(update_fields=[
+            'version_major',
+            'version_minor',
+            'version_patch',
+            'version_prerelease',
+        ])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('main', '0144_search_relevance'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='collectionversion',
+            name='version_major',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='collectionversion',
+            name='version_minor',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='collectionversion',
+            name='version_patch',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='collectionversion',
+            name='version_prerelease',
+            field=psql_fields.ArrayField(
+                base_field=models.CharField(max_length=256),
+                default=list,
+                editable=False,
+                size=None),
+        ),
+        migrations.RunPython(
+            code=set_version_sort_key,
+            reverse_code=migrations.RunPython.noop,
+        ),
+        migrations.AddIndex(
+            model_name='collectionversion',
+            index=models.Index(
+                fields=[
+                    'collection',
+                    'version_major',
+                    'version_minor',
+                    'version_patch',
+                    'version_prerelease',
+                ],
+                name='main_collec_collect_5609a2_idx'),
+        ),
+    ]
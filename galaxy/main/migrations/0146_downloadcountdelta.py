@@ -0,0 +1,26 @@
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('main', '0145_collectionversion_semver'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DownloadCountDelta',
+            fields=[
+                ('id', models.AutoField(
+                    auto_created=True, primary_key=True,
+                    serialize=False, verbose_name='ID')),
+                ('target', models.CharField(
+                    choices=[('collection', 'Collection'),
+                             ('repository', 'Repository')],
+                    max_length=16)),
+                ('object_id', models.IntegerField()),
+                ('delta', models.IntegerField()),
+                ('created', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('main', '0146_downloadcountdelta'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='readme',
+            name='renderer_version',
+            field=models.IntegerField(null=True),
+        ),
+        migrations.CreateModel(
+            name='RenderedReadme',
+            fields=[
+                ('id', models.AutoField(
+                    auto_created=True, primary_key=True,
+                    serialize=False, verbose_name='ID')),
+                ('raw_hash', models.CharField(max_length=128)),
+                ('mimetype', models.CharField(max_length=32)),
+                ('renderer_version', models.IntegerField()),
+                ('html', models.TextField(blank=True)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'unique_together': {
+                    ('raw_hash', 'mimetype', 'renderer_version')},
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('main', '0147_renderedreadme'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importtask',
+            name='error_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='importtask',
+            name='warning_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='importtask',
+            name='info_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='collectionimport',
+            name='error_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='collectionimport',
+            name='warning_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='collectionimport',
+            name='info_count',
+            field=models.IntegerField(default=0),
+        ),
+    ]
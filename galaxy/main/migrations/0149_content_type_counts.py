@@ -0,0 +1,64 @@
+from django.db import migrations
+from django.db import models
+import django.db.models.deletion
+
+
+POPULATE_COUNTS_SQL = '''
+INSERT INTO main_namespacecontentcount (namespace_id, content_type_id, count)
+SELECT namespace_id, content_type_id, COUNT(*)
+FROM main_content
+GROUP BY namespace_id, content_type_id;
+
+INSERT INTO main_repositorycontentcount (repository_id, content_type_id, count)
+SELECT repository_id, content_type_id, COUNT(*)
+FROM main_content
+GROUP BY repository_id, content_type_id;
+'''
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('main', '0148_message_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NamespaceContentCount',
+            fields=[
+                ('id', models.AutoField(
+                    auto_created=True, primary_key=True,
+                    serialize=False, verbose_name='ID')),
+                ('count', models.IntegerField(default=0)),
+                ('content_type', models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='+', to='main.ContentType')),
+                ('namespace', models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='content_type_counts',
+                    to='main.Namespace')),
+            ],
+            options={
+                'unique_together': {('namespace', 'content_type')},
+            },
+        ),
+        migrations.CreateModel(
+            name='RepositoryContentCount',
+            fields=[
+                ('id', models.AutoField(
+                    auto_created=True, primary_key=True,
+                    serialize=False, verbose_name='ID')),
+                ('count', models.IntegerField(default=0)),
+                ('content_type', models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='+', to='main.ContentType')),
+                ('repository', models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='content_type_counts',
+                    to='main.Repository')),
+            ],
+            options={
+                'unique_together': {('repository', 'content_type')},
+            },
+        ),
+        migrations.RunSQL(POPULATE_COUNTS_SQL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,74 @@
+from django.db import migrations
+from django.db import models
+
+
+POPULATE_AGGREGATES_SQL = '''
+WITH aggregates AS (
+    SELECT {column} AS target_id,
+           COUNT(*) AS survey_count,
+           SUM(COALESCE(docs, 0) + COALESCE(ease_of_use, 0)
+               + COALESCE(does_what_it_says, 0) + COALESCE(works_as_is, 0)
+               + COALESCE(used_in_production, 0)) AS answer_sum,
+           SUM((docs IS NOT NULL)::int + (ease_of_use IS NOT NULL)::int
+               + (does_what_it_says IS NOT NULL)::int
+               + (works_as_is IS NOT NULL)::int
+               + (used_in_production IS NOT NULL)::int) AS answer_count
+    FROM {survey_table}
+    GROUP BY {column}
+)
+UPDATE {table} t
+SET community_survey_count = a.survey_count,
+    community_answer_sum = a.answer_sum,
+    community_answer_count = a.answer_count,
+    community_score = CASE WHEN a.answer_count > 0
+        THEN (a.answer_sum - a.answer_count)::float8
+             / a.answer_count * 5 / 4
+    END
+FROM aggregates a
+WHERE a.target_id = t.id;
+'''
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('main', '0149_content_type_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='collection',
+            name='community_answer_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='collection',
+            name='community_answer_sum',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='repository',
+            name='community_answer_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='repository',
+            name='community_answer_sum',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunSQL(
+            POPULATE_AGGREGATES_SQL.format(
+                table='main_repository',
+                survey_table='main_repositorysurvey',
+                column='repository_id',
+            ),
+            migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            POPULATE_AGGREGATES_SQL.format(
+                table='main_collection',
+                survey_table='main_collectionsurvey',
+                column='collection_id',
+            ),
+            migrations.RunSQL.noop,
+        ),
+    ]
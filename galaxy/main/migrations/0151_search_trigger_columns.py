@@ -0,0 +1,100 @@
+from django.db import migrations
+
+# Repository counters are updated frequently (download counts are applied
+# every minute, community scores on each survey). Propagate their changes
+# by setting content relevance computed from the repository row, only for
+# content rows where it changed. Content triggers are limited to columns
+# they read, so such updates don't recalculate content search vectors.
+CREATE_REPOSITORY_RELEVANCE_FUNCTION = '''
+CREATE OR REPLACE FUNCTION on_repository_update_search_relevance()
+    RETURNS TRIGGER AS
+$$
+DECLARE download_rank DOUBLE PRECISION;
+DECLARE relevance DOUBLE PRECISION;
+BEGIN
+    IF OLD.download_count IS DISTINCT FROM NEW.download_count
+       OR OLD.community_score IS DISTINCT FROM NEW.community_score
+       OR OLD.quality_score IS DISTINCT FROM NEW.quality_score THEN
+        download_rank := content_search_download_rank(
+            NEW.download_count, NEW.community_score);
+        relevance := (
+            download_rank + content_search_quality_rank(NEW.quality_score));
+        UPDATE main_content
+        SET search_download_rank = download_rank,
+            search_relevance = relevance
+        WHERE repository_id = NEW.id
+          AND (search_download_rank, search_relevance)
+              IS DISTINCT FROM (download_rank, relevance);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+'''
+
+RESTORE_REPOSITORY_RELEVANCE_FUNCTION = '''
+CREATE OR REPLACE FUNCTION on_repository_update_search_relevance()
+    RETURNS TRIGGER AS
+$$
+BEGIN
+    IF OLD.download_count IS DISTINCT FROM NEW.download_count
+       OR OLD.community_score IS DISTINCT FROM NEW.community_score
+       OR OLD.quality_score IS DISTINCT FROM NEW.quality_score THEN
+        UPDATE main_content SET search_relevance = 0
+        WHERE repository_id = NEW.id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+'''
+
+# Django saves all model fields, so content saves still fire both triggers.
+# Setting `search_vector` explicitly still refreshes the vector.
+LIMIT_CONTENT_TRIGGERS = '''
+DROP TRIGGER update_search_relevance ON main_content;
+CREATE TRIGGER update_search_relevance
+    BEFORE INSERT OR UPDATE OF repository_id
+    ON main_content
+    FOR EACH ROW
+EXECUTE PROCEDURE update_content_search_relevance();
+
+DROP TRIGGER update_search_vector ON main_content;
+CREATE TRIGGER update_search_vector
+    BEFORE INSERT
+        OR UPDATE OF name, description, namespace_id, readme_id, search_vector
+    ON main_content
+    FOR EACH ROW
+EXECUTE PROCEDURE on_content_update_search_vector_trigger();
+'''
+
+RESTORE_CONTENT_TRIGGERS = '''
+DROP TRIGGER update_search_relevance ON main_content;
+CREATE TRIGGER update_search_relevance
+    BEFORE INSERT OR UPDATE
+    ON main_content
+    FOR EACH ROW
+EXECUTE PROCEDURE update_content_search_relevance();
+
+DROP TRIGGER update_search_vector ON main_content;
+CREATE TRIGGER update_search_vector
+    BEFORE INSERT OR UPDATE
+    ON main_content
+    FOR EACH ROW
+EXECUTE PROCEDURE on_content_update_search_vector_trigger();
+'''
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('main', '0150_survey_aggregates'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=CREATE_REPOSITORY_RELEVANCE_FUNCTION,
+            reverse_sql=RESTORE_REPOSITORY_RELEVANCE_FUNCTION,
+        ),
+        migrations.RunSQL(
+            sql=LIMIT_CONTENT_TRIGGERS,
+            reverse_sql=RESTORE_CONTENT_TRIGGERS,
+        ),
+    ]
@@ -35,6 +35,11 @@ from .content import (  # noqa: F401
     Tag,
     Video,
 )
+from .counters import (  # noqa: F401
+    DownloadCountDelta,
+    NamespaceContentCount,
+    RepositoryContentCount,
+)
 from .importing import (  # noqa: F401
     ImportTask,
     ImportTaskMessage,
@@ -49,6 +54,7 @@ from .provider import (  # noqa: F401
 from .repository import (  # noqa: F401
     RepositorySurvey,
     Readme,
+    RenderedReadme,
     Repository,
     RepositoryVersion,
     Stargazer,
@@ -26,6 +26,7 @@ from django.conf import settings
 from django.db import models
 from pulpcore.app import models as pulp_models
 
+from galaxy.common.version import get_semver_sort_key
 from galaxy.importer.utils import lint as lintutils
 from . import mixins
 from .namespace import Namespace
@@ -43,7 +44,11 @@ class Collection(mixins.TimestampsMixin, models.Model):
     :var download_count: Number of collection downloads.
     :var comminity_score: Total community score.
     :var community_survey_count: Number of community surveys.
+    :var community_answer_sum: Sum of answers to community surveys.
+    :var community_answer_count: Number of answers to community surveys.
     :var tags: List of a last collection version tags.
+    :var search_relevance: Precomputed static part of search relevance.
+        Maintained by database triggers, see `main.0144_search_relevance`.
     """
 
     namespace = models.ForeignKey(Namespace, on_delete=models.PROTECT)
@@ -55,6 +60,8 @@ class Collection(mixins.TimestampsMixin, models.Model):
     download_count = models.IntegerField(default=0)
     community_score = models.FloatField(null=True)
     community_survey_count = models.IntegerField(default=0)
+    community_answer_sum = models.IntegerField(default=0)
+    community_answer_count = models.IntegerField(default=0)
 
     # References
     latest_version = models.ForeignKey(
@@ -67,6 +74,7 @@ class Collection(mixins.TimestampsMixin, models.Model):
 
     # Search indexes
     search_vector = psql_search.SearchVectorField(default='')
+    search_relevance = models.FloatField(default=0.0, editable=False)
 
     class Meta:
         unique_together = (
@@ -74,12 +82,18 @@ class Collection(mixins.TimestampsMixin, models.Model):
             'name',
         )
         indexes = [
-            psql_indexes.GinIndex(fields=['search_vector'])
+            psql_indexes.GinIndex(fields=['search_vector']),
+            models.Index(fields=['search_relevance']),
         ]
 
     def __str__(self):
         return '{}.{}'.format(self.namespace.name, self.name)
 
+    def get_latest_version(self):
+        """Returns a version with the highest semantic version precedence."""
+        ordering = ['-' + f for f in CollectionVersion.SEMVER_ORDERING]
+        return self.versions.order_by(*ordering).first()
+
     def inc_download_count(self):
         Collection.objects.filter(pk=self.pk).update(
             download_count=models.F('download_count') + 1)
@@ -95,10 +109,23 @@ class CollectionVersion(mixins.TimestampsMixin, pulp_models.Content):
     :var metadata: Collection metadata in JSON format.
     :var contents: Collection contents in JSON format.
     :var collection: A reference to a related collection object.
+    :var version_major: Major version number.
+    :var version_minor: Minor version number.
+    :var version_patch: Patch version number.
+    :var version_prerelease: Encoded pre-release identifiers,
+        see `galaxy.common.version.get_semver_sort_key`.
     """
 
     TYPE = 'collection-version'
 
+    # Fields in order of semantic version precedence.
+    SEMVER_ORDERING = (
+        'version_major',
+        'version_minor',
+        'version_patch',
+        'version_prerelease',
+    )
+
     # Fields
     version = models.CharField(max_length=64)
     hidden = models.BooleanField(default=False)
@@ -114,6 +141,13 @@ class CollectionVersion(mixins.TimestampsMixin, pulp_models.Content):
     readme_text = models.TextField(blank=True)
     readme_html = models.TextField(blank=True)
 
+    # Semantic version sort key
+    version_major = models.IntegerField(default=0, editable=False)
+    version_minor = models.IntegerField(default=0, editable=False)
+    version_patch = models.IntegerField(default=0, editable=False)
+    version_prerelease = psql_fields.ArrayField(
+        models.CharField(max_length=256), default=list, editable=False)
+
     # References
     collection = models.ForeignKey(
         Collection, on_delete=models.CASCADE, related_name='versions')
@@ -127,6 +161,15 @@ class CollectionVersion(mixins.TimestampsMixin, pulp_models.Content):
             'collection',
             'version',
         )
+        indexes = [
+            models.Index(fields=[
+                'collection',
+                'version_major',
+                'version_minor',
+                'version_patch',
+                'version_prerelease',
+            ]),
+        ]
 
     def __str__(self):
         return '{}.{}-{}'.format(
@@ -135,6 +178,11 @@ class CollectionVersion(mixins.TimestampsMixin, pulp_models.Content):
             self.version
         )
 
+    def save(self, *args, **kwargs):
+        (self.version_major, self.version_minor, self.version_patch,
+         self.version_prerelease) = get_semver_sort_key(self.version)
+        super().save(*args, **kwargs)
+
     def get_content_artifact(self) -> pulp_models.ContentArtifact:
         """Returns a ContentArtifact object related to collection version."""
         return pulp_models.ContentArtifact.objects.filter(content=self).first()
@@ -147,7 +195,7 @@ class CollectionVersion(mixins.TimestampsMixin, pulp_models.Content):
             s.strip('/') for s in (prefix, ca.relative_path))
 
 
-class CollectionImport(Task):
+class CollectionImport(mixins.MessageCountersMixin, Task):
     """Collection import task info."""
 
     name = models.CharField(max_length=64)
@@ -161,26 +209,27 @@ class CollectionImport(Task):
         CollectionVersion, null=True, on_delete=models.SET_NULL,
         related_name='import_tasks')
 
-    def add_log_record(self, record: logging.LogRecord):
-        self.messages.append({
+    @staticmethod
+    def make_log_message(record: logging.LogRecord) -> dict:
+        return {
             'message': record.msg,
             'level': record.levelname,
             'time': record.created,
-        })
+        }
+
+    @staticmethod
+    def make_lint_message(lint_record: lintutils.LintRecord) -> dict:
+        return attr.asdict(lint_record)
+
+    def add_log_record(self, record: logging.LogRecord):
+        self.messages.append(self.make_log_message(record))
 
     def add_lint_record(self, lint_record: lintutils.LintRecord) -> None:
-        self.lint_records.append(attr.asdict(lint_record))
+        self.lint_records.append(self.make_lint_message(lint_record))
 
     def get_message_stats(self):
         """Returns total number of errors and warnings."""
-        # TODO(cutwater): Replace with SQL query
-        errors, warnings = 0, 0
-        for msg in self.messages:
-            if msg['level'] == 'ERROR':
-                errors += 1
-            elif msg['level'] == 'WARNING':
-                warnings += 1
-        return errors, warnings
+        return self.error_count, self.warning_count
 
 
 class CollectionSurvey(SurveyBase):
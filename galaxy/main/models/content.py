@@ -43,7 +43,8 @@ class Content(CommonModelNameNotUnique):
         ]
         ordering = ['namespace', 'repository', 'name', 'content_type']
         indexes = [
-            psql_indexes.GinIndex(fields=['search_vector'])
+            psql_indexes.GinIndex(fields=['search_vector']),
+            models.Index(fields=['search_relevance']),
         ]
     # Foreign keys
     # -------------------------------------------------------------------------
@@ -195,6 +196,12 @@ class Content(CommonModelNameNotUnique):
 
     search_vector = psql_search.SearchVectorField()
 
+    # Static parts of search relevance, maintained by database triggers.
+    # See `main.0144_search_relevance` and `main.0151_search_trigger_columns`
+    # migrations for details.
+    search_download_rank = models.FloatField(default=0.0, editable=False)
+    search_relevance = models.FloatField(default=0.0, editable=False)
+
     # Other functions and properties
     # -------------------------------------------------------------------------
 
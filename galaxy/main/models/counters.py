@@ -0,0 +1,86 @@
+# (c) 2012-2019, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+from django.db import models
+
+
+class DownloadCountDelta(models.Model):
+    """
+    Download count increment pending to be applied to a counter.
+
+    Increments are written by `galaxy.main.downloads.DownloadCounter`
+    and applied to counters in batches. Counted objects are referenced
+    without foreign keys to avoid locking hot collection and repository
+    rows on insert.
+
+    :var target: Type of a counted object.
+    :var object_id: Primary key of a counted object.
+    :var delta: Number of downloads.
+    """
+
+    TARGET_COLLECTION = 'collection'
+    TARGET_REPOSITORY = 'repository'
+    TARGET_CHOICES = (
+        (TARGET_COLLECTION, 'Collection'),
+        (TARGET_REPOSITORY, 'Repository'),
+    )
+
+    target = models.CharField(max_length=16, choices=TARGET_CHOICES)
+    object_id = models.IntegerField()
+    delta = models.IntegerField()
+    created = models.DateTimeField(auto_now_add=True)
+
+
+class ContentTypeCount(models.Model):
+    """
+    Number of content objects of a content type.
+
+    Counters are maintained by `galaxy.main.content_counts` when content
+    is created or deleted.
+    """
+
+    content_type = models.ForeignKey(
+        'ContentType',
+        related_name='+',
+        on_delete=models.CASCADE,
+    )
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+
+class NamespaceContentCount(ContentTypeCount):
+    namespace = models.ForeignKey(
+        'Namespace',
+        related_name='content_type_counts',
+        on_delete=models.CASCADE,
+    )
+
+    class Meta:
+        unique_together = ('namespace', 'content_type')
+
+
+class RepositoryContentCount(ContentTypeCount):
+    repository = models.ForeignKey(
+        'Repository',
+        related_name='content_type_counts',
+        on_delete=models.CASCADE,
+    )
+
+    class Meta:
+        unique_together = ('repository', 'content_type')
@@ -5,9 +5,10 @@ from django.utils import timezone
 
 from galaxy import constants
 from .base import PrimordialModel
+from .mixins import MessageCountersMixin
 
 
-class ImportTask(PrimordialModel):
+class ImportTask(MessageCountersMixin, PrimordialModel):
     class Meta:
         ordering = ('-id',)
         get_latest_by = 'created'
@@ -88,7 +89,7 @@ class ImportTask(PrimordialModel):
     def start(self):
         self.state = ImportTask.STATE_RUNNING
         self.started = timezone.now()
-        self.save()
+        self.save(update_fields=['state', 'started', 'modified'])
 
     def finish_success(self, message=None):
         self.state = ImportTask.STATE_SUCCESS
@@ -96,7 +97,8 @@ class ImportTask(PrimordialModel):
         if message:
             self.messages.create(message_type=ImportTaskMessage.TYPE_SUCCESS,
                                  message_text=message)
-        self.save()
+        # Message counters are updated by log handlers.
+        self.save(update_fields=['state', 'finished', 'modified'])
 
     def finish_failed(self, reason=None):
         self.state = ImportTask.STATE_FAILED
@@ -106,7 +108,7 @@ class ImportTask(PrimordialModel):
             # Use TruncatingCharField or TextField for message field
             self.messages.create(message_type=ImportTaskMessage.TYPE_FAILED,
                                  message_text=str(reason)[:256])
-        self.save()
+        self.save(update_fields=['state', 'finished', 'modified'])
 
 
 class ImportTaskMessage(PrimordialModel):
@@ -17,6 +17,8 @@
 
 from django.db import models
 
+from galaxy import constants
+
 
 class TimestampsMixin(models.Model):
 
@@ -25,3 +27,35 @@ class TimestampsMixin(models.Model):
 
     class Meta:
         abstract = True
+
+
+class MessageCountersMixin(models.Model):
+    """Numbers of import task messages by type.
+
+    Counters are incremented by import task log handlers,
+    see `galaxy.worker.logutils`.
+    """
+
+    COUNTER_FIELDS = {
+        constants.ImportTaskMessageType.ERROR.value: 'error_count',
+        constants.ImportTaskMessageType.WARNING.value: 'warning_count',
+        constants.ImportTaskMessageType.INFO.value: 'info_count',
+    }
+
+    error_count = models.IntegerField(default=0)
+    warning_count = models.IntegerField(default=0)
+    info_count = models.IntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+    def count_message(self, message_type):
+        """Increments a counter of message type in memory.
+
+        :return: Name of incremented counter field, or None if messages
+            of the type are not counted.
+        """
+        field = self.COUNTER_FIELDS.get(message_type)
+        if field is not None:
+            setattr(self, field, getattr(self, field) + 1)
+        return field
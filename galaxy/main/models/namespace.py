@@ -20,7 +20,6 @@ from django.db import models
 from django.urls import reverse
 
 from .base import CommonModel
-from .content import Content
 
 
 class Namespace(CommonModel):
@@ -74,10 +73,9 @@ class Namespace(CommonModel):
 
     @property
     def content_counts(self):
-        return Content.objects \
-            .filter(namespace=self.pk) \
-            .values('content_type__name') \
-            .annotate(count=models.Count('content_type__name')) \
+        return self.content_type_counts \
+            .filter(count__gt=0) \
+            .values('content_type__name', 'count') \
             .order_by('content_type__name')
 
     def is_owner(self, user):
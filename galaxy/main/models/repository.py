@@ -90,6 +90,13 @@ class Repository(BaseModel):
     community_survey_count = models.IntegerField(
         default=0
     )
+    # Running totals of survey answers, see `galaxy.main.survey_scores`
+    community_answer_sum = models.IntegerField(
+        default=0
+    )
+    community_answer_count = models.IntegerField(
+        default=0
+    )
 
     quality_score = models.FloatField(
         null=True,
@@ -121,10 +128,9 @@ class Repository(BaseModel):
 
     @property
     def content_counts(self):
-        return Content.objects \
-            .filter(repository=self.pk) \
-            .values('content_type__name') \
-            .annotate(count=models.Count('content_type__name')) \
+        return self.content_type_counts \
+            .filter(count__gt=0) \
+            .values('content_type__name', 'count') \
             .order_by('content_type__name')
 
     def get_absolute_url(self):
@@ -207,6 +213,9 @@ class Readme(BaseModel):
         max_length=128, null=False, blank=False)
     mimetype = models.CharField(max_length=32, blank=False)
     html = models.TextField(null=False, blank=False)
+    # Version of a local renderer `html` was rendered with. Null if
+    # rendered by GitHub API.
+    renderer_version = models.IntegerField(null=True)
 
     def safe_delete(self):
         ref_count = (
@@ -220,6 +229,23 @@ class Readme(BaseModel):
         return True
 
 
+class RenderedReadme(models.Model):
+    """Content addressed cache of rendered README files.
+
+    Identical README files of different repositories and content objects
+    are rendered once per renderer version.
+    """
+
+    class Meta:
+        unique_together = ('raw_hash', 'mimetype', 'renderer_version')
+
+    raw_hash = models.CharField(max_length=128)
+    mimetype = models.CharField(max_length=32)
+    renderer_version = models.IntegerField()
+    html = models.TextField(blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+
 # TODO(cutwater): This model is probably obsolete and should be removed.
 class Stargazer(BaseModel):
     class Meta:
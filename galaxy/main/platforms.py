@@ -0,0 +1,119 @@
+# (c) 2012-2019, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+"""In-process cache of platform reference data.
+
+Platform and cloud platform tables are small and rarely change, so they
+are loaded into case insensitive indexes and reused by imports.
+Changes of the tables replace a version token stored in the
+`GALAXY_PLATFORM_CACHE` cache, that invalidates indexes loaded by all
+processes sharing the cache. Processes, that do not share the cache
+(e.g. with the default local memory cache), reload their indexes
+after `GALAXY_PLATFORM_INDEX_TTL` seconds.
+"""
+
+import collections
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from galaxy.main import models
+
+
+__all__ = (
+    'PlatformIndex',
+    'get_platform_index',
+    'invalidate',
+)
+
+VERSION_CACHE_KEY = 'galaxy:platforms:version'
+
+_lock = threading.Lock()
+_index = None
+_index_version = None
+_index_loaded = None
+
+
+class PlatformIndex:
+    """Case insensitive index of platforms and cloud platforms."""
+
+    def __init__(self, platforms, cloud_platforms):
+        self._platforms = collections.defaultdict(list)
+        self._releases = {}
+        for platform in platforms:
+            name, release = platform.name.lower(), platform.release.lower()
+            self._platforms[name].append(platform)
+            self._releases.setdefault((name, release), platform)
+        self._cloud_platforms = {}
+        for cloud_platform in cloud_platforms:
+            self._cloud_platforms.setdefault(
+                cloud_platform.name.lower(), cloud_platform)
+
+    def get_platforms(self, name):
+        """Returns all releases of a platform."""
+        return list(self._platforms.get(name.lower(), ()))
+
+    def get_platform(self, name, release):
+        return self._releases.get((name.lower(), str(release).lower()))
+
+    def get_cloud_platform(self, name):
+        return self._cloud_platforms.get(name.lower())
+
+
+def _get_cache():
+    return caches[settings.GALAXY_PLATFORM_CACHE]
+
+
+def get_platform_index():
+    """Returns platform index, loading it if platforms changed or
+    the index expired."""
+    global _index, _index_version, _index_loaded
+
+    version = _get_cache().get(VERSION_CACHE_KEY)
+    now = time.monotonic()
+    with _lock:
+        if (_index is not None and _index_version == version
+                and now - _index_loaded < settings.GALAXY_PLATFORM_INDEX_TTL):
+            return _index
+    index = PlatformIndex(
+        models.Platform.objects.all(),
+        models.CloudPlatform.objects.all(),
+    )
+    with _lock:
+        _index, _index_version, _index_loaded = index, version, now
+    return index
+
+
+def _reset_version():
+    _get_cache().set(VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+
+
+def invalidate():
+    """Invalidates platform indexes.
+
+    Index of the current process is dropped immediately, indexes of other
+    processes sharing the cache are invalidated when the current
+    transaction is committed.
+    """
+    global _index
+    with _lock:
+        _index = None
+    transaction.on_commit(_reset_version)
@@ -0,0 +1,106 @@
+# (c) 2012-2019, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+"""Local README rendering.
+
+Rendered HTML is stored in a content addressed cache keyed by README
+hash, mimetype and renderer version, so that identical README files
+are rendered once.
+"""
+
+from concurrent import futures
+
+from galaxy.importer.utils import readme as readme_utils
+from galaxy.main import models
+
+
+__all__ = (
+    'RENDERER_VERSION',
+    'get_mimetype',
+    'render_readme',
+    'render_readmes',
+)
+
+RENDERER_VERSION = readme_utils.RENDERER_VERSION
+
+# README files without extension are rendered as markdown.
+DEFAULT_MIMETYPE = 'text/markdown'
+
+
+def get_mimetype(mimetype):
+    return mimetype or DEFAULT_MIMETYPE
+
+
+def render_readme(readme):
+    """Renders README file to HTML.
+
+    :param readme: A `galaxy.importer.utils.readme.ReadmeFile` object.
+    :return: Rendered HTML.
+    """
+    readme = readme._replace(mimetype=get_mimetype(readme.mimetype))
+    return render_readmes([readme])[(readme.hash, readme.mimetype)]
+
+
+def render_readmes(readmes, workers=None):
+    """Renders multiple README files to HTML.
+
+    Files missing in the render cache are rendered and stored in the cache.
+
+    :param readmes: An iterable of `ReadmeFile` objects.
+    :param workers: Number of processes to render files in. If not set,
+        files are rendered in the current process.
+    :return: A dictionary of rendered HTML by (hash, mimetype) key.
+    """
+    pending = {}
+    for readme in readmes:
+        readme = readme._replace(mimetype=get_mimetype(readme.mimetype))
+        pending.setdefault((readme.hash, readme.mimetype), readme)
+    if not pending:
+        return {}
+
+    cached = models.RenderedReadme.objects.filter(
+        raw_hash__in={raw_hash for raw_hash, _ in pending},
+        renderer_version=RENDERER_VERSION,
+    ).values_list('raw_hash', 'mimetype', 'html')
+    result = {}
+    for raw_hash, mimetype, html in cached:
+        if pending.pop((raw_hash, mimetype), None) is not None:
+            result[(raw_hash, mimetype)] = html
+    if not pending:
+        return result
+
+    missing = list(pending.values())
+    if workers and workers > 1 and len(missing) > 1:
+        with futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            rendered = list(executor.map(
+                readme_utils.render_html, missing,
+                chunksize=max(len(missing) // (workers * 4), 1)))
+    else:
+        rendered = [readme_utils.render_html(r) for r in missing]
+
+    models.RenderedReadme.objects.bulk_create([
+        models.RenderedReadme(
+            raw_hash=readme.hash,
+            mimetype=readme.mimetype,
+            renderer_version=RENDERER_VERSION,
+            html=html,
+        ) for readme, html in zip(missing, rendered)
+    ], ignore_conflicts=True)
+
+    for readme, html in zip(missing, rendered):
+        result[(readme.hash, readme.mimetype)] = html
+    return result
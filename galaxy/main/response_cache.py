@@ -0,0 +1,172 @@
+# (c) 2012-2019, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+"""Cache of rendered anonymous API responses.
+
+Responses are cached by a normalized request URL and tagged with objects
+they were rendered from. Each tag has a generation token stored in the
+cache. Invalidating a tag replaces its token, which makes all responses
+tagged with it stale, regardless of a URL they were cached by.
+"""
+
+import hashlib
+import typing as t
+import uuid
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+import prometheus_client
+
+
+__all__ = (
+    'CachedResponse',
+    'collection_tag',
+    'get_response',
+    'get_tag_tokens',
+    'invalidate',
+    'is_enabled',
+    'make_etag',
+    'make_key',
+    'namespace_tag',
+    'repository_tag',
+    'set_response',
+)
+
+RESPONSE_KEY_PREFIX = 'galaxy:response:'
+TAG_KEY_PREFIX = 'galaxy:response-tag:'
+
+lookups = prometheus_client.Counter(
+    'galaxy_response_cache_lookups_total',
+    'Number of cached API response lookups.',
+    ['view', 'result'],
+)
+not_modified = prometheus_client.Counter(
+    'galaxy_response_cache_not_modified_total',
+    'Number of API responses answered with 304 Not Modified.',
+    ['view'],
+)
+invalidations = prometheus_client.Counter(
+    'galaxy_response_cache_invalidations_total',
+    'Number of invalidated API response cache tags.',
+)
+
+
+class CachedResponse(t.NamedTuple):
+    content: bytes
+    content_type: str
+    etag: str
+    # Generation tokens of tags at the time the response was rendered.
+    tags: t.Dict[str, str]
+    # View specific data, e.g. for counting downloads on cache hits.
+    meta: t.Dict[str, t.Any]
+
+
+def is_enabled() -> bool:
+    return bool(settings.GALAXY_RESPONSE_CACHE)
+
+
+def _get_cache():
+    return caches[settings.GALAXY_RESPONSE_CACHE]
+
+
+def collection_tag(collection_id) -> str:
+    return f'collection:{collection_id}'
+
+
+def namespace_tag(name: str) -> str:
+    # Namespace names are matched case insensitively.
+    return f'namespace:{name.lower()}'
+
+
+def repository_tag(repository_id) -> str:
+    return f'repository:{repository_id}'
+
+
+def make_key(scheme: str, host: str, path: str, query, media_type: str):
+    """Returns a cache key of a request.
+
+    Query parameters are sorted, so that their order does not produce
+    separate cache entries. Host is a part of the key, because responses
+    include absolute URLs.
+    """
+    params = sorted(
+        (key, value) for key, values in query.lists() for value in values)
+    url = f'{scheme}://{host}{path}?{urlencode(params)}'
+    digest = hashlib.sha256(f'{media_type} {url}'.encode()).hexdigest()
+    return RESPONSE_KEY_PREFIX + digest
+
+
+def make_etag(content: bytes) -> str:
+    return '"{}"'.format(hashlib.sha256(content).hexdigest()[:32])
+
+
+def get_tag_tokens(tags: t.Iterable[str]) -> t.Dict[str, str]:
+    """Returns current generation tokens of tags.
+
+    Tokens are created for tags that have none yet.
+    """
+    cache = _get_cache()
+    keys = {TAG_KEY_PREFIX + tag: tag for tag in tags}
+    tokens = cache.get_many(keys)
+    missing = [key for key in keys if key not in tokens]
+    if missing:
+        for key in missing:
+            # Concurrently created tokens take precedence.
+            cache.add(key, uuid.uuid4().hex, None)
+        tokens.update(cache.get_many(missing))
+    return {keys[key]: token for key, token in tokens.items()}
+
+
+def get_response(key: str) -> t.Optional[CachedResponse]:
+    """Returns a cached response, or None if it is missing or stale."""
+    cache = _get_cache()
+    cached = cache.get(key)
+    if cached is None:
+        return None
+    response = CachedResponse(*cached)
+    tokens = cache.get_many(
+        [TAG_KEY_PREFIX + tag for tag in response.tags])
+    for tag, token in response.tags.items():
+        if tokens.get(TAG_KEY_PREFIX + tag) != token:
+            return None
+    return response
+
+
+def set_response(key: str, response: CachedResponse) -> None:
+    _get_cache().set(
+        key, tuple(response), settings.GALAXY_RESPONSE_CACHE_TIMEOUT)
+
+
+def _reset_tokens(keys):
+    _get_cache().set_many({key: uuid.uuid4().hex for key in keys}, None)
+
+
+def invalidate(*tags: str) -> None:
+    """Invalidates cached responses tagged with any of tags.
+
+    Tokens are replaced immediately and once again after the current
+    transaction is committed, in case a concurrent request cached
+    a response rendered from uncommitted state in the meantime.
+    """
+    if not is_enabled() or not tags:
+        return
+    keys = [TAG_KEY_PREFIX + tag for tag in tags]
+    _reset_tokens(keys)
+    transaction.on_commit(lambda: _reset_tokens(keys))
+    invalidations.inc(len(tags))
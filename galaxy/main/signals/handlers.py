@@ -18,14 +18,19 @@
 import logging
 
 from django.dispatch import receiver
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.contrib.auth import get_user_model
 
 from allauth.account.signals import user_logged_in
 from allauth.socialaccount import models as auth_models
 
 from galaxy import constants
+from galaxy.main import artifacts
+from galaxy.main import content_counts
 from galaxy.main import models
+from galaxy.main import platforms
+from galaxy.main import response_cache
+from galaxy.main import survey_scores
 
 
 logger = logging.getLogger(__name__)
@@ -112,3 +117,61 @@ def import_task_post_save(sender, **kwargs):
         repo = instance.repository
         repo.is_enabled = True
         repo.save()
+
+
+@receiver(post_save, sender=models.Content)
+def content_post_save(sender, instance, created, **kwargs):
+    if created:
+        content_counts.increment(instance)
+
+
+@receiver(post_delete, sender=models.Content)
+def content_post_delete(sender, instance, **kwargs):
+    content_counts.decrement(instance)
+
+
+@receiver(post_save, sender=models.RepositorySurvey)
+@receiver(post_save, sender=models.CollectionSurvey)
+def survey_post_save(sender, instance, created, **kwargs):
+    # Modified surveys are accounted by API views, that know previous answers
+    if created:
+        survey_scores.add(instance)
+
+
+@receiver(post_delete, sender=models.RepositorySurvey)
+@receiver(post_delete, sender=models.CollectionSurvey)
+def survey_post_delete(sender, instance, **kwargs):
+    survey_scores.remove(instance)
+
+
+@receiver(pre_delete, sender=models.CollectionVersion)
+def collection_version_pre_delete(sender, instance, **kwargs):
+    """Evicts deleted collection versions from artifact and response caches."""
+    artifacts.evict_artifact(instance)
+    response_cache.invalidate(
+        response_cache.collection_tag(instance.collection_id))
+
+
+@receiver(post_save, sender=models.Repository)
+@receiver(pre_delete, sender=models.Repository)
+def repository_changed_handler(sender, instance, **kwargs):
+    """Invalidates cached role lists and versions of a repository.
+
+    Covers changes, that don't start an import, e.g. deprecation.
+    """
+    if not response_cache.is_enabled():
+        return
+    tags = [response_cache.repository_tag(instance.pk)]
+    namespace = instance.provider_namespace.namespace
+    if namespace is not None:
+        tags.append(response_cache.namespace_tag(namespace.name))
+    response_cache.invalidate(*tags)
+
+
+@receiver(post_save, sender=models.Platform)
+@receiver(post_delete, sender=models.Platform)
+@receiver(post_save, sender=models.CloudPlatform)
+@receiver(post_delete, sender=models.CloudPlatform)
+def platform_changed_handler(sender, **kwargs):
+    """Invalidates cached platform indexes."""
+    platforms.invalidate()
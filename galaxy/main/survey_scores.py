@@ -0,0 +1,159 @@
+# (c) 2012-2019, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+"""Incremental community score aggregation.
+
+Repositories and collections keep a number of surveys, a sum and a number
+of survey answers. Survey changes are applied to them as deltas with
+a single ``UPDATE`` statement, that also recalculates a community score,
+so that concurrent surveys and unrelated updates of a target row do not
+overwrite each other. `rebuild` recalculates aggregates from surveys.
+"""
+
+from django.db import connection, transaction
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Cast
+
+from galaxy.common.survey import SURVEY_FIElDS, get_survey_answers
+from galaxy.main import models
+
+
+__all__ = (
+    'add',
+    'rebuild',
+    'remove',
+    'replace',
+)
+
+# Survey model mapped to a target model and a survey column,
+# that references a target.
+TARGETS = {
+    models.RepositorySurvey: (models.Repository, 'repository_id'),
+    models.CollectionSurvey: (models.Collection, 'collection_id'),
+}
+
+REBUILD_QUERY = '''
+WITH aggregates AS (
+    SELECT {column} AS target_id,
+           COUNT(*) AS survey_count,
+           SUM({answer_sum}) AS answer_sum,
+           SUM({answer_count}) AS answer_count
+    FROM {survey_table}
+    GROUP BY {column}
+), updated AS (
+    UPDATE {table} t
+    SET community_survey_count = c.survey_count,
+        community_answer_sum = c.answer_sum,
+        community_answer_count = c.answer_count,
+        community_score = c.score
+    FROM (
+        SELECT t2.id,
+               COALESCE(a.survey_count, 0) AS survey_count,
+               COALESCE(a.answer_sum, 0) AS answer_sum,
+               COALESCE(a.answer_count, 0) AS answer_count,
+               CASE WHEN a.answer_count > 0
+                    THEN (a.answer_sum - a.answer_count)::float8
+                         / a.answer_count * 5 / 4
+               END AS score
+        FROM {table} t2
+        LEFT JOIN aggregates a ON a.target_id = t2.id
+    ) c
+    WHERE t.id = c.id
+      AND (t.community_survey_count <> c.survey_count
+           OR t.community_answer_sum <> c.answer_sum
+           OR t.community_answer_count <> c.answer_count
+           OR t.community_score IS DISTINCT FROM c.score)
+    RETURNING 1
+)
+SELECT COUNT(*) FROM updated
+'''
+
+
+def _apply(survey, answer_sum, answer_count, survey_count):
+    model, column = TARGETS[type(survey)]
+    new_sum = F('community_answer_sum') + answer_sum
+    new_count = F('community_answer_count') + answer_count
+    # Column references on the right side of SET are evaluated against
+    # the current row version, so the score is calculated from new totals.
+    model.objects.filter(pk=getattr(survey, column)).update(
+        community_survey_count=F('community_survey_count') + survey_count,
+        community_answer_sum=new_sum,
+        community_answer_count=new_count,
+        community_score=Case(
+            When(
+                community_answer_count__gt=-answer_count,
+                then=Cast(new_sum - new_count, FloatField())
+                / Cast(new_count, FloatField()) * 5 / 4,
+            ),
+            default=Value(None),
+            output_field=FloatField(),
+        ),
+    )
+
+
+def add(survey) -> None:
+    """Accounts a created survey in its target score."""
+    _apply(survey, *get_survey_answers(survey), 1)
+
+
+def remove(survey) -> None:
+    """Removes a deleted survey from its target score."""
+    answer_sum, answer_count = get_survey_answers(survey)
+    _apply(survey, -answer_sum, -answer_count, -1)
+
+
+def replace(old, new) -> None:
+    """Replaces answers of a modified survey in its target score.
+
+    :param old: A copy of the survey made before it was modified.
+    :param new: The modified survey.
+    """
+    _, column = TARGETS[type(new)]
+    if getattr(old, column) != getattr(new, column):
+        remove(old)
+        add(new)
+        return
+    old_sum, old_count = get_survey_answers(old)
+    new_sum, new_count = get_survey_answers(new)
+    if (old_sum, old_count) != (new_sum, new_count):
+        _apply(new, new_sum - old_sum, new_count - old_count, 0)
+
+
+def rebuild() -> int:
+    """Recalculates aggregates of all repositories and collections.
+
+    Survey changes are blocked while aggregates are recalculated.
+
+    :return: Number of corrected repositories and collections.
+    """
+    answer_sum = ' + '.join(f'COALESCE({f}, 0)' for f in SURVEY_FIElDS)
+    answer_count = ' + '.join(
+        f'({f} IS NOT NULL)::int' for f in SURVEY_FIElDS)
+    corrected = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        for survey_model, (model, column) in TARGETS.items():
+            survey_table = survey_model._meta.db_table
+            cursor.execute(f'LOCK TABLE {survey_table} IN SHARE MODE')
+            cursor.execute(REBUILD_QUERY.format(
+                table=model._meta.db_table,
+                column=column,
+                survey_table=survey_table,
+                answer_sum=answer_sum,
+                answer_count=answer_count,
+            ))
+            corrected += cursor.fetchone()[0]
+    return corrected
@@ -0,0 +1,88 @@
+# (c) 2012-2019, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+import io
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from galaxy import constants
+from galaxy.main import content_counts
+from galaxy.main import models
+
+
+class TestContentCounts(TestCase):
+
+    def setUp(self):
+        self.namespace = models.Namespace.objects.create(name='alice')
+        provider = models.Provider.objects.get(name='GitHub')
+        provider_ns = models.ProviderNamespace.objects.create(
+            name='alice', namespace=self.namespace, provider=provider)
+        self.repository = models.Repository.objects.create(
+            provider_namespace=provider_ns, name='multi',
+            original_name='multi')
+        self.role_type = models.ContentType.get(constants.ContentType.ROLE)
+        self.module_type = models.ContentType.get(
+            constants.ContentType.MODULE)
+
+    def _create_content(self, name, content_type):
+        return models.Content.objects.create(
+            namespace=self.namespace, repository=self.repository,
+            name=name, content_type=content_type)
+
+    def _counts(self):
+        return (
+            {c['content_type__name']: c['count']
+             for c in self.namespace.content_counts},
+            {c['content_type__name']: c['count']
+             for c in self.repository.content_counts},
+        )
+
+    def test_counted_on_create_and_delete(self):
+        self._create_content('role1', self.role_type)
+        self._create_content('role2', self.role_type)
+        module = self._create_content('module1', self.module_type)
+
+        expected = {'role': 2, 'module': 1}
+        assert self._counts() == (expected, expected)
+
+        module.delete()
+        assert self._counts() == ({'role': 2}, {'role': 2})
+
+    def test_reconcile(self):
+        self._create_content('role1', self.role_type)
+        self._create_content('module1', self.module_type)
+        models.NamespaceContentCount.objects.filter(
+            content_type=self.role_type).update(count=5)
+        models.RepositoryContentCount.objects.filter(
+            content_type=self.module_type).delete()
+
+        assert content_counts.reconcile() == 2
+
+        expected = {'role': 1, 'module': 1}
+        assert self._counts() == (expected, expected)
+        assert content_counts.reconcile() == 0
+
+    def test_reconcile_command(self):
+        self._create_content('role1', self.role_type)
+        models.NamespaceContentCount.objects.update(count=0)
+
+        out = io.StringIO()
+        call_command('reconcile_content_counts', stdout=out)
+
+        assert out.getvalue() == 'Corrected 1 content counters.\n'
+        assert self._counts()[0] == {'role': 1}
@@ -0,0 +1,75 @@
+# (c) 2012-2019, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+from django.test import TestCase
+
+from galaxy.main import models
+from galaxy.main.dependencies import (
+    DependencyReport,
+    DependencyStatus,
+    resolve_dependencies,
+)
+
+
+class TestResolveDependencies(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        ns = models.Namespace.objects.create(name='alice')
+        apache = models.Collection.objects.create(namespace=ns, name='apache')
+        for version in ('0.9.0', '1.0.0', '1.1.0'):
+            models.CollectionVersion.objects.create(
+                collection=apache, version=version)
+        models.Collection.objects.create(namespace=ns, name='empty')
+        other_ns = models.Namespace.objects.create(name='bob')
+        models.Collection.objects.create(namespace=other_ns, name='nginx')
+
+    def test_report(self):
+        reports = resolve_dependencies({
+            'alice.apache': '>=1.0.0',
+            'alice.empty': '*',
+            'alice.nginx': '*',
+            'dne.apache': '*',
+            'alice.apache.extra': '*',
+            'alice.apache ': 'not-a-spec',
+        })
+        assert reports == [
+            DependencyReport(
+                'alice.apache', '>=1.0.0', DependencyStatus.OK, '1.1.0'),
+            DependencyReport(
+                'alice.empty', '*', DependencyStatus.VERSION_NOT_FOUND),
+            DependencyReport(
+                'alice.nginx', '*', DependencyStatus.COLLECTION_NOT_FOUND),
+            DependencyReport(
+                'dne.apache', '*', DependencyStatus.NAMESPACE_NOT_FOUND),
+            DependencyReport(
+                'alice.apache.extra', '*', DependencyStatus.INVALID),
+            DependencyReport(
+                'alice.apache ', 'not-a-spec', DependencyStatus.INVALID),
+        ]
+
+    def test_single_query(self):
+        with self.assertNumQueries(1):
+            reports = resolve_dependencies({
+                'alice.apache': '1.0.0',
+                'alice.empty': '*',
+            })
+        assert [r.is_resolved for r in reports] == [True, False]
+
+    def test_empty(self):
+        with self.assertNumQueries(0):
+            assert resolve_dependencies({}) == []
@@ -0,0 +1,93 @@
+# (c) 2012-2019, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+from unittest import mock
+
+from django.test import TestCase
+
+from galaxy.main import downloads
+from galaxy.main import models
+
+
+class TestDownloadCounter(TestCase):
+
+    def setUp(self):
+        namespace = models.Namespace.objects.create(name='mynamespace')
+        self.collection = models.Collection.objects.create(
+            namespace=namespace, name='mycollection')
+        self.counter = downloads.DownloadCounter(
+            flush_interval=3600, flush_size=1000)
+        # Background thread uses its own database connection, that does
+        # not see test data.
+        patcher = mock.patch.object(self.counter, '_ensure_flush_thread')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_increments_are_buffered(self):
+        self.counter.increment_collection(self.collection.pk)
+        self.counter.increment_collection(self.collection.pk)
+
+        self.collection.refresh_from_db()
+        assert self.collection.download_count == 0
+        assert not models.DownloadCountDelta.objects.exists()
+
+    def test_flush_writes_deltas(self):
+        for _ in range(3):
+            self.counter.increment_collection(self.collection.pk)
+
+        assert self.counter.flush() == 3
+        assert models.DownloadCountDelta.objects.get().delta == 3
+
+        # Deltas are applied periodically, not by the flush
+        self.collection.refresh_from_db()
+        assert self.collection.download_count == 0
+
+        assert downloads.apply_pending() == 1
+        self.collection.refresh_from_db()
+        assert self.collection.download_count == 3
+        assert not models.DownloadCountDelta.objects.exists()
+
+    def test_flush_size_wakes_flush_thread(self):
+        self.counter.flush_size = 2
+        self.counter.increment_collection(self.collection.pk)
+        assert not self.counter._wakeup.is_set()
+
+        self.counter.increment_collection(self.collection.pk)
+        assert self.counter._wakeup.is_set()
+        assert not models.DownloadCountDelta.objects.exists()
+
+    def test_unbuffered(self):
+        self.counter.flush_interval = 0
+        self.counter.increment_collection(self.collection.pk)
+
+        self.collection.refresh_from_db()
+        assert self.collection.download_count == 1
+        self.counter._ensure_flush_thread.assert_not_called()
+
+    def test_apply_pending_deltas(self):
+        models.DownloadCountDelta.objects.bulk_create([
+            models.DownloadCountDelta(
+                target=models.DownloadCountDelta.TARGET_COLLECTION,
+                object_id=self.collection.pk,
+                delta=delta,
+            ) for delta in (2, 5)
+        ])
+
+        assert downloads.apply_pending() == 1
+
+        self.collection.refresh_from_db()
+        assert self.collection.download_count == 7
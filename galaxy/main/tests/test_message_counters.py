@@ -0,0 +1,87 @@
+# (c) 2012-2019, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+import datetime
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from galaxy.main import models
+from galaxy.main.celerytasks import tasks
+
+
+class TestMessageCounters(TestCase):
+
+    def setUp(self):
+        owner = get_user_model().objects.create(username='alice')
+        namespace = models.Namespace.objects.create(name='alice')
+        provider = models.Provider.objects.get(name='GitHub')
+        provider_ns = models.ProviderNamespace.objects.create(
+            name='alice', namespace=namespace, provider=provider)
+        repository = models.Repository.objects.create(
+            provider_namespace=provider_ns, name='apache',
+            original_name='apache')
+        self.task = models.ImportTask.objects.create(
+            repository=repository, owner=owner)
+
+    def test_count_message(self):
+        assert self.task.count_message(
+            models.ImportTaskMessage.TYPE_WARNING) == 'warning_count'
+        assert self.task.count_message(
+            models.ImportTaskMessage.TYPE_SUCCESS) is None
+        assert (self.task.error_count, self.task.warning_count,
+                self.task.info_count) == (0, 1, 0)
+
+    def test_finish_keeps_counters(self):
+        models.ImportTask.objects.filter(pk=self.task.pk).update(
+            error_count=2)
+
+        self.task.start()
+        self.task.finish_success('Done')
+
+        self.task.refresh_from_db()
+        assert self.task.state == models.ImportTask.STATE_SUCCESS
+        assert self.task.error_count == 2
+
+    def test_clear_stuck_imports(self):
+        models.ImportTask.objects.filter(pk=self.task.pk).update(
+            created=timezone.now() - datetime.timedelta(hours=2),
+            error_count=1)
+
+        tasks.clear_stuck_imports()
+
+        self.task.refresh_from_db()
+        assert self.task.state == models.ImportTask.STATE_FAILED
+        assert self.task.error_count == 2
+
+    def test_backfill_command(self):
+        for message_type in (models.ImportTaskMessage.TYPE_ERROR,
+                             models.ImportTaskMessage.TYPE_WARNING,
+                             models.ImportTaskMessage.TYPE_WARNING,
+                             models.ImportTaskMessage.TYPE_SUCCESS):
+            self.task.messages.create(
+                message_type=message_type, message_text='message')
+
+        call_command('backfill_message_counts', batch_size=1,
+                     stdout=io.StringIO())
+
+        self.task.refresh_from_db()
+        assert (self.task.error_count, self.task.warning_count,
+                self.task.info_count) == (1, 2, 0)
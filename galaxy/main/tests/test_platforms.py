@@ -0,0 +1,79 @@
+# (c) 2012-2019, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from galaxy.main import models
+from galaxy.main import platforms
+
+
+class TestPlatformIndex(TestCase):
+
+    def setUp(self):
+        models.Platform.objects.all().delete()
+        models.CloudPlatform.objects.all().delete()
+        self.el7 = models.Platform.objects.create(name='EL', release='7')
+        self.el8 = models.Platform.objects.create(name='EL', release='8')
+        self.trusty = models.Platform.objects.create(
+            name='Ubuntu', release='trusty')
+        self.aws = models.CloudPlatform.objects.create(name='AWS')
+
+    def test_lookup(self):
+        index = platforms.get_platform_index()
+
+        assert index.get_platforms('el') == [self.el7, self.el8]
+        assert index.get_platforms('Debian') == []
+        assert index.get_platform('ubuntu', 'TRUSTY') == self.trusty
+        assert index.get_platform('EL', 7) == self.el7
+        assert index.get_platform('EL', 9) is None
+        assert index.get_cloud_platform('aws') == self.aws
+        assert index.get_cloud_platform('GCE') is None
+
+    def test_index_is_cached(self):
+        index = platforms.get_platform_index()
+        with self.assertNumQueries(0):
+            assert platforms.get_platform_index() is index
+
+    def test_invalidated_on_change(self):
+        index = platforms.get_platform_index()
+        el9 = models.Platform.objects.create(name='EL', release='9')
+
+        new_index = platforms.get_platform_index()
+        assert new_index is not index
+        assert new_index.get_platform('el', '9') == el9
+
+        self.aws.delete()
+        assert platforms.get_platform_index().get_cloud_platform('AWS') is None
+
+    @override_settings(GALAXY_PLATFORM_INDEX_TTL=60)
+    @mock.patch('galaxy.main.platforms.time.monotonic')
+    def test_reloaded_after_ttl(self, monotonic):
+        monotonic.return_value = 1000.0
+        index = platforms.get_platform_index()
+
+        # Bulk updates do not send signals, like changes made by processes
+        # that do not share the platform cache.
+        models.Platform.objects.filter(pk=self.el8.pk).update(release='9')
+        monotonic.return_value = 1059.0
+        assert platforms.get_platform_index() is index
+
+        monotonic.return_value = 1060.0
+        new_index = platforms.get_platform_index()
+        assert new_index is not index
+        assert new_index.get_platform('el', '9') == self.el8
@@ -0,0 +1,94 @@
+# (c) 2012-2019, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+import hashlib
+import io
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from galaxy.importer.utils import readme as readme_utils
+from galaxy.main import models
+from galaxy.main import readmes
+
+
+def _readme_file(text, mimetype='text/markdown'):
+    return readme_utils.ReadmeFile(
+        text=text, mimetype=mimetype,
+        hash=hashlib.sha256(text.encode('utf-8')).hexdigest())
+
+
+class TestRenderReadme(TestCase):
+
+    def test_render_is_cached(self):
+        readme = _readme_file('# Title')
+        # select cached, insert rendered
+        with self.assertNumQueries(2):
+            assert readmes.render_readme(readme) == '<h1>Title</h1>'
+        with self.assertNumQueries(1):
+            assert readmes.render_readme(readme) == '<h1>Title</h1>'
+
+        cached = models.RenderedReadme.objects.get()
+        assert cached.raw_hash == readme.hash
+        assert cached.renderer_version == readmes.RENDERER_VERSION
+
+    def test_render_default_mimetype(self):
+        readme = _readme_file('*text*', mimetype=None)
+        assert readmes.render_readme(readme) == '<p><em>text</em></p>'
+
+    def test_render_readmes(self):
+        files = [
+            _readme_file('# Title'),
+            _readme_file('# Title'),
+            _readme_file('Title\n=====\n\nText', mimetype='text/x-rst'),
+        ]
+        readmes.render_readme(files[0])
+
+        # select cached, insert rendered
+        with self.assertNumQueries(2):
+            result = readmes.render_readmes(files)
+        assert len(result) == 2
+        assert models.RenderedReadme.objects.count() == 2
+
+
+class TestRenderReadmesCommand(TestCase):
+
+    def setUp(self):
+        namespace = models.Namespace.objects.create(name='alice')
+        provider = models.Provider.objects.get(name='GitHub')
+        provider_ns = models.ProviderNamespace.objects.create(
+            name='alice', namespace=namespace, provider=provider)
+        repository = models.Repository.objects.create(
+            provider_namespace=provider_ns, name='apache',
+            original_name='apache')
+        self.readme = models.Readme.objects.create(
+            repository=repository, raw='# Title',
+            raw_hash=_readme_file('# Title').hash,
+            mimetype='text/markdown', html='<h1>GitHub</h1>')
+
+    def test_render_stale(self):
+        models.RenderedReadme.objects.create(
+            raw_hash='outdated', mimetype='text/markdown',
+            renderer_version=readmes.RENDERER_VERSION - 1, html='')
+
+        call_command('render_readmes', workers=1, stdout=io.StringIO())
+
+        self.readme.refresh_from_db()
+        assert self.readme.html == '<h1>Title</h1>'
+        assert self.readme.renderer_version == readmes.RENDERER_VERSION
+        assert list(models.RenderedReadme.objects.values_list(
+            'raw_hash', flat=True)) == [self.readme.raw_hash]
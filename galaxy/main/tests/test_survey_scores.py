@@ -0,0 +1,85 @@
+# (c) 2012-2019, Ansible by Red Hat
+#
+# This file is part of Ansible Galaxy
+#
+# Ansible Galaxy is free software: you can redistribute it and/or modify
+# it under the terms of the Apache License as published by
+# the Apache Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# Ansible Galaxy is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# Apache License for more details.
+#
+# You should have received a copy of the Apache License
+# along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
+
+import copy
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from galaxy.common.survey import calculate_survey_score
+from galaxy.main import models
+from galaxy.main import survey_scores
+
+UserModel = get_user_model()
+
+
+class TestSurveyScores(TestCase):
+
+    def setUp(self):
+        namespace = models.Namespace.objects.create(name='alice')
+        self.collection = models.Collection.objects.create(
+            namespace=namespace, name='mycollection')
+        self.users = [
+            UserModel.objects.create(username=f'user{i}') for i in range(2)]
+
+    def _create_survey(self, user, **answers):
+        return models.CollectionSurvey.objects.create(
+            collection=self.collection, user=user, **answers)
+
+    def _assert_score(self, survey_count):
+        self.collection.refresh_from_db()
+        surveys = models.CollectionSurvey.objects.filter(
+            collection=self.collection)
+        assert self.collection.community_survey_count == survey_count
+        assert self.collection.community_score == \
+            calculate_survey_score(surveys)
+
+    def test_score_follows_surveys(self):
+        survey = self._create_survey(self.users[0], docs=5)
+        self._assert_score(1)
+        assert self.collection.community_score == 5.0
+
+        other = self._create_survey(
+            self.users[1], docs=2, ease_of_use=4)
+        self._assert_score(2)
+
+        previous = copy.copy(survey)
+        survey.works_as_is = 1
+        survey.save()
+        survey_scores.replace(previous, survey)
+        self._assert_score(2)
+
+        other.delete()
+        survey.delete()
+        self._assert_score(0)
+        assert self.collection.community_score is None
+
+    def test_rebuild_command(self):
+        self._create_survey(self.users[0], docs=3, used_in_production=5)
+        models.Collection.objects.update(
+            community_score=None, community_survey_count=0,
+            community_answer_sum=0, community_answer_count=0)
+
+        out = io.StringIO()
+        call_command('rebuild_survey_scores', stdout=out)
+
+        assert out.getvalue() == \
+            'Corrected 1 repository and collection scores.\n'
+        self._assert_score(1)
+        assert survey_scores.rebuild() == 0
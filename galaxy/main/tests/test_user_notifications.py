@@ -15,8 +15,12 @@
 # You should have received a copy of the Apache License
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 
+from unittest import mock
+
+from allauth.account.models import EmailAddress
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core import mail
+from django.test import TestCase, override_settings
 from pulpcore import constants as pulp_const
 from pulpcore.app import models as pulp_models
 
@@ -221,3 +225,42 @@ class TestCollectionNotifications(TestCase):
         notifications = models.UserNotification.objects.filter(
             user__in=[self.user_2, self.user_3, self.user_4, self.user_5])
         assert notifications.count() == 0
+
+    @override_settings(GALAXY_NOTIFICATION_EMAIL_CHUNK_SIZE=1)
+    @mock.patch.object(user_notifications.send_emails, 'delay')
+    def test_new_version_emails(self, send_emails_delay):
+        # Run email sub-tasks synchronously
+        send_emails_delay.side_effect = (
+            lambda *args: user_notifications.send_emails.apply(args))
+        for user in (self.user_2, self.user_3):
+            EmailAddress.objects.create(
+                user=user, email=user.email, primary=True, verified=True)
+        for pref in (self.user_2_pref, self.user_3_pref):
+            pref.preferences['notify_content_release'] = True
+            pref.save()
+        version = models.CollectionVersion.objects.create(
+            collection=self.collection_1, version='1.2.3')
+
+        user_notifications.collection_new_version(version.pk)
+
+        assert send_emails_delay.call_count == 2
+        assert sorted(m.to[0] for m in mail.outbox) == ['2@2.com', '3@3.com']
+        for message in mail.outbox:
+            assert len(message.to) == 1
+            assert message.subject == \
+                'Ansible Galaxy: New version of user_1_ns.apache'
+
+    def test_new_version_number_of_queries(self):
+        version = models.CollectionVersion.objects.create(
+            collection=self.collection_1, version='1.2.3')
+        notification = user_notifications.NotificationManger(
+            email_template=user_notifications.collection_new_version_template,
+            preferences_name='notify_content_release',
+            preferences_list=models.UserPreferences.objects.filter(
+                collections_followed__pk=self.collection_1.pk),
+            subject='subject',
+            collection=version.collection,
+        )
+        # Select recipients with emails, insert notifications
+        with self.assertNumQueries(2):
+            notification.send('message')
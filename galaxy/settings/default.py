@@ -16,6 +16,7 @@
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 # Django settings for galaxy project.
 
+import datetime
 import os
 
 import djcelery
@@ -228,6 +229,14 @@ CELERY_ACCEPT_CONTENT = ['json']
 
 CELERYBEAT_SCHEDULER = 'djcelery.schedulers.DatabaseScheduler'
 
+# Default periodic tasks, merged into the database schedule on beat startup.
+CELERYBEAT_SCHEDULE = {
+    'apply-download-counts': {
+        'task': 'galaxy.main.celerytasks.tasks.apply_download_counts',
+        'schedule': datetime.timedelta(seconds=60),
+    },
+}
+
 # Allauth
 # ---------------------------------------------------------
 
@@ -331,18 +340,82 @@ ROLE_TYPES_ENABLED = frozenset(['ANS', 'CON', 'APP'])
 # If set to `None`, system temporary directory is used.
 CONTENT_DOWNLOAD_DIR = '/var/tmp/galaxy/imports'
 
+# A directory to keep bare mirrors of imported repositories in. Subsequent
+# imports of a repository fetch only new objects from the remote.
+# If set to `None`, repositories are always cloned from the remote.
+CONTENT_MIRROR_DIR = '/var/tmp/galaxy/mirrors'
+
+# Maximum total size of repository mirrors in bytes. Least recently used
+# mirrors are removed when exceeded.
+CONTENT_MIRROR_MAX_SIZE = 10 * 1024 ** 3
+
 GALAXY_URL = 'http://{site}:8000'
 
 GALAXY_PULP_REPOSITORY = 'galaxy'
 
 GALAXY_DOWNLOAD_URL = '/download/'
 
+# Delegates serving of artifacts stored on the local filesystem to the front
+# proxy. Supported values:
+# * None - artifacts are streamed by the application (development only).
+# * 'x-accel-redirect' - nginx. GALAXY_DOWNLOAD_SENDFILE_LOCATION must be
+#   an `internal` location, that is an alias of MEDIA_ROOT.
+# * 'x-sendfile' - Apache mod_xsendfile, lighttpd. If set,
+#   GALAXY_DOWNLOAD_SENDFILE_LOCATION replaces MEDIA_ROOT in file paths
+#   passed to the proxy.
+GALAXY_DOWNLOAD_SENDFILE = None
+
+GALAXY_DOWNLOAD_SENDFILE_LOCATION = None
+
+# Cache alias and timeout (in seconds) for resolved artifact lookups,
+# see `galaxy.main.artifacts`. Artifacts are cached by processes serving
+# downloads on first lookup. Deleted collection versions are evicted only
+# from the cache of the deleting process, unless the alias refers to a cache
+# shared by all processes. With the default per-process cache, other
+# processes may resolve a deleted version until the timeout expires.
+GALAXY_ARTIFACT_CACHE = 'default'
+
+GALAXY_ARTIFACT_CACHE_TIMEOUT = 60
+
+# Cache alias for platform tables version, see `galaxy.main.platforms`.
+# Platform changes invalidate loaded platform indexes only in processes
+# sharing this cache. Indexes are reloaded in any case after the number
+# of seconds below, which bounds staleness with a per-process cache.
+GALAXY_PLATFORM_CACHE = 'default'
+
+GALAXY_PLATFORM_INDEX_TTL = 60
+
+# Cache alias and timeout (in seconds) for rendered responses of anonymous
+# read API requests, see `galaxy.main.response_cache`. Responses are
+# invalidated by workers, so the cache must be shared by all processes.
+# Response caching is disabled if not set.
+GALAXY_RESPONSE_CACHE = None
+
+GALAXY_RESPONSE_CACHE_TIMEOUT = 10 * 60
+
+# Download count increments are buffered in memory and written to
+# the database by a background thread every this number of seconds,
+# or when number of buffered increments reaches the limit below.
+# Increments buffered in memory may be lost if a process is killed.
+# Written increments are applied to counters by the periodic
+# `apply_download_counts` task. 0 disables buffering.
+GALAXY_DOWNLOAD_COUNT_FLUSH_INTERVAL = 10
+
+GALAXY_DOWNLOAD_COUNT_FLUSH_SIZE = 100
+
 # Notification Settings
 # ---------------------------------------------------------
 
 GALAXY_NOTIFICATION_EMAIL = 'notifications@galaxy.ansible.com'
 DEFAULT_FROM_EMAIL = 'noreply@galaxy.ansible.com'
 
+# Notification emails are sent by sub-tasks in chunks of this size,
+# each over a single mail server connection.
+GALAXY_NOTIFICATION_EMAIL_CHUNK_SIZE = 100
+
+# Celery rate limit of notification email chunks, per worker.
+GALAXY_NOTIFICATION_EMAIL_RATE_LIMIT = '30/m'
+
 # =========================================================
 # Logging Settings
 # =========================================================
@@ -88,3 +88,20 @@ WAIT_FOR = [
 STATIC_ROOT = ''
 
 MEDIA_ROOT = '/var/lib/galaxy/media/'
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'dummy': {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+    },
+}
+
+# Do not share resolved artifacts between test cases
+GALAXY_ARTIFACT_CACHE = 'dummy'
+
+GALAXY_RESPONSE_CACHE = 'dummy'
+
+# Write download counts immediately
+GALAXY_DOWNLOAD_COUNT_FLUSH_INTERVAL = 0
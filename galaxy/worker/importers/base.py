@@ -108,8 +108,7 @@ class ContentImporter(object):
         content.readme = None
         content.save()
         content.readme = utils.update_readme(
-            repository, readme_obj, readme,
-            self.ctx.github_client, self.ctx.github_repo)
+            repository, readme_obj, readme)
         content.save()
 
     def _log_create_content(self):
@@ -15,9 +15,7 @@
 # You should have received a copy of the Apache License
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 
-import semantic_version as semver
-
-from galaxy.main.models import Namespace, Collection
+from galaxy.main.dependencies import DependencyStatus, resolve_dependencies
 from galaxy.worker import exceptions as exc
 
 
@@ -27,23 +25,16 @@ def _raise_import_fail(msg):
 
 def check_dependencies(dependencies):
     """Check collection dependencies and matching version are in database."""
-    for dep, version_spec in dependencies.items():
-        ns_name, name = dep.split('.')
-
-        try:
-            ns = Namespace.objects.get(name=ns_name)
-        except Namespace.DoesNotExist:
+    for report in resolve_dependencies(dependencies):
+        dep = report.name
+        if report.status is DependencyStatus.INVALID:
+            _raise_import_fail(
+                f'Invalid dependency: {dep} {report.version_spec}')
+        elif report.status is DependencyStatus.NAMESPACE_NOT_FOUND:
             _raise_import_fail(f'Dependency namespace not in galaxy: {dep}')
-        try:
-            collection = Collection.objects.get(namespace=ns.pk, name=name)
-        except Collection.DoesNotExist:
+        elif report.status is DependencyStatus.COLLECTION_NOT_FOUND:
             _raise_import_fail(f'Dependency collection not in galaxy: {dep}')
-
-        spec = semver.Spec(version_spec)
-        versions = (
-            semver.Version(v.version) for v in collection.versions.all())
-        no_match_message = ('Dependency found in galaxy but no matching '
-                            f'version found: {dep} {version_spec}')
-
-        if not spec.select(versions):
-            _raise_import_fail(no_match_message)
+        elif report.status is DependencyStatus.VERSION_NOT_FOUND:
+            _raise_import_fail(
+                'Dependency found in galaxy but no matching '
+                f'version found: {dep} {report.version_spec}')
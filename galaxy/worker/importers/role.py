@@ -15,9 +15,12 @@
 # You should have received a copy of the Apache License
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 
+import collections
+
 from galaxy import common
 from galaxy import constants
 from galaxy.main import models
+from galaxy.worker import utils
 
 from . import base
 
@@ -54,56 +57,43 @@ class RoleImporter(base.ContentImporter):
         return common.sanitize_content_name(name)
 
     def _add_role_videos(self, role, videos):
-        role.videos.all().delete()
-        for video in videos:
-            role.videos.create(
-                url=video.url,
-                description=video.description)
+        # Keeps unchanged videos, removes videos no longer listed
+        # in the metadata
+        current = {(url, description): pk for pk, url, description
+                   in role.videos.values_list('pk', 'url', 'description')}
+        new = collections.OrderedDict(
+            ((video.url, video.description), video) for video in videos)
+
+        to_remove = [pk for key, pk in current.items() if key not in new]
+        if to_remove:
+            role.videos.filter(pk__in=to_remove).delete()
+
+        to_add = [video for key, video in new.items() if key not in current]
+        if to_add:
+            models.Video.objects.bulk_create([
+                models.Video(
+                    role=role, url=video.url, description=video.description)
+                for video in to_add
+            ])
 
     def _add_tags(self, role, tags):
-        for tag in tags:
-            db_tag, _ = models.Tag.objects.get_or_create(
-                name=tag,
-                defaults={'description': tag, 'active': True}
-            )
-            role.tags.add(db_tag)
-
-        # Remove tags no longer listed in the metadata
-        for tag in role.tags.all():
-            if tag.name not in tags:
-                role.tags.remove(tag)
+        # Removes tags no longer listed in the metadata
+        utils.sync_tags(role, tags)
 
     def _add_platforms(self, role, platforms):
         if role.role_type not in (constants.RoleType.CONTAINER,
                                   constants.RoleType.ANSIBLE):
             return
-        for platform in platforms:
-            role.platforms.add(platform)
-
-        # Remove platforms/versions that are no longer listed in the metadata
-        for db_platform in role.platforms.all():
-            if db_platform not in platforms:
-                role.platforms.remove(db_platform)
+        # Removes platforms/versions no longer listed in the metadata
+        utils.sync_m2m(role.platforms, platforms)
 
     def _add_cloud_platforms(self, role, cloud_platforms):
-        cloud_platforms = set(cloud_platforms)
-
-        for cloud_platform in cloud_platforms:
-            role.cloud_platforms.add(cloud_platform)
-
-        # Remove cloud platforms that are no longer listed in the metadata
-        for db_cloud_platform in role.cloud_platforms.all():
-            if db_cloud_platform not in cloud_platforms:
-                role.cloud_platforms.remove(db_cloud_platform)
+        # Removes cloud platforms no longer listed in the metadata
+        utils.sync_m2m(role.cloud_platforms, cloud_platforms)
 
     def _add_dependencies(self, role, dependencies):
         if role.role_type not in (constants.RoleType.CONTAINER,
                                   constants.RoleType.ANSIBLE):
             return
-        for dep_role in dependencies:
-            role.dependencies.add(dep_role)
-
-        # Remove dependencies no longer in the metadata
-        for dep in role.dependencies.all():
-            if (dep.namespace.name, dep.name) not in dependencies:
-                role.dependencies.remove(dep)
+        # Removes dependencies no longer listed in the metadata
+        utils.sync_m2m(role.dependencies, dependencies)
@@ -15,7 +15,12 @@
 # You should have received a copy of the Apache License
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 
+import collections
+import json
 import logging
+import time
+
+from django.db import connections
 
 from galaxy import constants as const
 from galaxy.importer.utils import lint as lintutils
@@ -40,36 +45,157 @@ class ContentTypeAdapter(BaseLoggerAdapter):
         })
 
 
-class ImportTaskHandler(logging.Handler):
+class BufferedImportHandler(logging.Handler):
+    """Base class for handlers, that write import task logs in batches.
+
+    Records are buffered in memory and flushed when `capacity` records or
+    `max_bytes` bytes of messages are buffered, when `flush_interval`
+    seconds elapsed since the oldest buffered record, when a record of
+    `flush_level` or higher is emitted, and on task completion
+    (see `flush_task_logs`).
+
+    Flush conditions are checked only when a record is emitted, buffered
+    records are not flushed by a timer during a silent step. Callers
+    flush logs explicitly with `flush_task_logs` before long running
+    steps, e.g. cloning or linting.
+    """
+
+    def __init__(self, level=logging.NOTSET, capacity=100,
+                 max_bytes=64 * 1024, flush_interval=1.0,
+                 flush_level=logging.ERROR):
+        super().__init__(level)
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.flush_level = flush_level
+
+        self.buffer = []
+        self._buffered_bytes = 0
+        self._first_buffered = None
+
     def emit(self, record: logging.LogRecord) -> None:
-        from galaxy.main import models
+        self.buffer.append(record)
+        self._buffered_bytes += len(str(record.msg))
+        if self._first_buffered is None:
+            self._first_buffered = time.monotonic()
+        if self.should_flush(record):
+            self.flush()
+
+    def should_flush(self, record: logging.LogRecord) -> bool:
+        return (
+            len(self.buffer) >= self.capacity
+            or self._buffered_bytes >= self.max_bytes
+            or record.levelno >= self.flush_level
+            or time.monotonic() - self._first_buffered >= self.flush_interval
+        )
 
-        create_kwargs = {}
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            records, self.buffer = self.buffer, []
+            self._buffered_bytes = 0
+            self._first_buffered = None
+            if not records:
+                return
+            # Records of different tasks are written separately, preserving
+            # the order of records within each task.
+            tasks = collections.OrderedDict()
+            for record in records:
+                tasks.setdefault(record.task.pk, []).append(record)
+            for task_records in tasks.values():
+                try:
+                    self.write_records(task_records[0].task, task_records)
+                except Exception:
+                    for record in task_records:
+                        self.handleError(record)
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            super().close()
+
+    def write_records(self, task, records) -> None:
+        raise NotImplementedError
+
+
+def _get_message_type(record: logging.LogRecord) -> str:
+    return const.ImportTaskMessageType.from_logging_level(record.levelno).value
+
+
+def _count_messages(task, records) -> collections.Counter:
+    """Returns counter increments of task message counters."""
+    counts = collections.Counter()
+    for record in records:
+        field = task.COUNTER_FIELDS.get(_get_message_type(record))
+        if field is not None:
+            counts[field] += 1
+    return counts
+
+
+class ImportTaskHandler(BufferedImportHandler):
+    """Writes log records as `ImportTaskMessage` objects.
+
+    Message counters of a task are incremented in the database along
+    with inserted messages, and in the task instance as records arrive.
+    """
 
-        lint_record: lintutils.LintRecord = getattr(
-            record, 'lint_record', None)
-        if lint_record:
-            create_kwargs = {
-                'is_linter_rule_violation': True,
-                'linter_type': lint_record.type,
-                'linter_rule_id': lint_record.code,
-                'rule_desc': lint_record.message,
-                'rule_severity': lint_record.severity,
-                'score_type': lint_record.score_type,
-                'content_name': record.content_name,
-            }
+    def emit(self, record: logging.LogRecord) -> None:
+        record.task.count_message(_get_message_type(record))
+        super().emit(record)
+
+    def write_records(self, task, records) -> None:
+        from django.db.models import F
+        from galaxy.main import models
+
+        messages = []
+        for record in records:
+            create_kwargs = {}
+
+            lint_record: lintutils.LintRecord = getattr(
+                record, 'lint_record', None)
+            if lint_record:
+                create_kwargs = {
+                    'is_linter_rule_violation': True,
+                    'linter_type': lint_record.type,
+                    'linter_rule_id': lint_record.code,
+                    'rule_desc': lint_record.message,
+                    'rule_severity': lint_record.severity,
+                    'score_type': lint_record.score_type,
+                    'content_name': record.content_name,
+                }
+
+            messages.append(models.ImportTaskMessage(
+                task=task,
+                message_type=_get_message_type(record),
+                message_text=record.msg,
+                **create_kwargs,
+            ))
 
         # TODO(cutwater): Revisit connection alias usage.
-        models.ImportTaskMessage.objects.using('logging').create(
-            task=record.task,
-            message_type=const.ImportTaskMessageType.from_logging_level(
-                record.levelno).value,
-            message_text=record.msg,
-            **create_kwargs,
-        )
+        models.ImportTaskMessage.objects.using('logging').bulk_create(
+            messages)
+
+        counts = _count_messages(task, records)
+        if counts:
+            models.ImportTask.objects.using('logging').filter(
+                pk=task.pk).update(**{
+                    field: F(field) + count
+                    for field, count in counts.items()})
+
 
+class CollectionImportHandler(BufferedImportHandler):
+    """Appends log records to `CollectionImport` messages.
+
+    Records are also added to the task instance, so the instance stays
+    consistent with the database without reloading. Buffered records are
+    appended with a single JSONB concatenation, instead of rewriting
+    the whole `messages` and `lint_records` arrays. Message counters
+    are incremented in the same statement.
+    """
 
-class CollectionImportHandler(logging.Handler):
     def emit(self, record: logging.LogRecord) -> None:
         from galaxy.main import models
         task: models.CollectionImport = record.task
@@ -79,4 +205,49 @@ class CollectionImportHandler(logging.Handler):
         if lint_record is not None:
             task.add_lint_record(lint_record)
         task.add_log_record(record)
-        task.save()
+        task.count_message(_get_message_type(record))
+        super().emit(record)
+
+    def write_records(self, task, records) -> None:
+        from galaxy.main import models
+
+        messages = [models.CollectionImport.make_log_message(record)
+                    for record in records]
+        lint_records = [
+            models.CollectionImport.make_lint_message(record.lint_record)
+            for record in records
+            if getattr(record, 'lint_record', None) is not None
+        ]
+
+        counts = _count_messages(task, records)
+
+        query = (
+            f'UPDATE {models.CollectionImport._meta.db_table} '
+            f'SET messages = messages || %s::jsonb, '
+            f'lint_records = lint_records || %s::jsonb, '
+            f'error_count = error_count + %s, '
+            f'warning_count = warning_count + %s, '
+            f'info_count = info_count + %s '
+            f'WHERE {models.CollectionImport._meta.pk.column} = %s'
+        )
+        with connections[task._state.db or 'default'].cursor() as cursor:
+            cursor.execute(query, [
+                json.dumps(messages),
+                json.dumps(lint_records),
+                counts['error_count'],
+                counts['warning_count'],
+                counts['info_count'],
+                task.pk,
+            ])
+
+
+def flush_task_logs(logger) -> None:
+    """Flushes import task log records buffered by logger handlers.
+
+    Called on task completion and before long running steps, so that
+    logged progress is visible while the step runs.
+    """
+    while isinstance(logger, logging.LoggerAdapter):
+        logger = logger.logger
+    for handler in logger.handlers:
+        handler.flush()
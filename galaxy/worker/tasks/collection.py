@@ -23,12 +23,13 @@ from galaxy_importer.collection import import_collection as process_collection
 from galaxy_importer.collection import CollectionFilename
 from galaxy_importer.exceptions import ImporterError
 from pulpcore.app import models as pulp_models
-import semantic_version as semver
 
 from galaxy.main import models
+from galaxy.main import response_cache
 from galaxy.main.celerytasks import user_notifications
 from galaxy.worker import exceptions as exc
 from galaxy.worker import logutils
+from galaxy.worker import utils
 from galaxy.worker.importers.collection import check_dependencies
 
 
@@ -75,6 +76,7 @@ def import_collection(artifact_id, repository_id):
         f'Starting import: task_id={task.id}, artifact_id={artifact_id}')
 
     try:
+        logutils.flush_task_logs(task_logger)
         importer_data = _process_collection(artifact, filename, task_logger)
         task_logger.info('Publishing collection')
         version = _publish_collection(
@@ -82,16 +84,18 @@ def import_collection(artifact_id, repository_id):
         task_logger.info('Collection published')
     except Exception as e:
         task_logger.error(f'Import Task "{task.id}" failed: {e}')
+        logutils.flush_task_logs(task_logger)
         user_notifications.collection_import.delay(task.id, has_failed=True)
         artifact.delete()
         raise
 
     _notify_followers(version)
 
-    user_notifications.collection_import.delay(task.id, has_failed=False)
     errors, warnings = task.get_message_stats()
     task_logger.info(
         f'Import completed with {warnings} warnings and {errors} errors')
+    logutils.flush_task_logs(task_logger)
+    user_notifications.collection_import.delay(task.id, has_failed=False)
 
 
 def _get_task_logger(task):
@@ -152,7 +156,7 @@ def _publish_collection(task, artifact, repository, importer_data):
             'Collection version "{version}" already exists.'
             .format(version=importer_data['metadata']['version']))
 
-    _update_latest_version(collection, version)
+    _update_latest_version(collection)
     log.info('Updating collection tags')
     _update_collection_tags(collection, version, importer_data['metadata'])
 
@@ -165,6 +169,7 @@ def _publish_collection(task, artifact, repository, importer_data):
         content=version,
         relative_path=rel_path,
     )
+    response_cache.invalidate(response_cache.collection_tag(collection.pk))
 
     with pulp_models.RepositoryVersion.create(repository) as new_version:
         new_version.add_content(
@@ -183,15 +188,16 @@ def _publish_collection(task, artifact, repository, importer_data):
     )
 
     task.imported_version = version
-    task.save()
+    # NOTE: Log messages are appended by CollectionImportHandler,
+    # saving them here would overwrite records flushed concurrently.
+    task.save(update_fields=['imported_version'])
     return version
 
 
-def _update_latest_version(collection, new_version):
-    latest_version = collection.latest_version
-    if latest_version is None or (semver.Version(latest_version.version)
-                                  < semver.Version(new_version.version)):
-        collection.latest_version = new_version
+def _update_latest_version(collection):
+    latest_version = collection.get_latest_version()
+    if collection.latest_version_id != latest_version.pk:
+        collection.latest_version = latest_version
         collection.save()
 
 
@@ -201,20 +207,7 @@ def _update_collection_tags(collection, version, metadata):
     if collection.latest_version != version:
         return
 
-    tags_not_in_db = [
-        {'name': tag, 'description': tag, 'active': True}
-        for tag in metadata['tags']
-        if models.Tag.objects.filter(name=tag).count() == 0]
-    models.Tag.objects.bulk_create([models.Tag(**t) for t in tags_not_in_db])
-
-    tags_qs = models.Tag.objects.filter(name__in=metadata['tags'])
-    collection.tags.add(*tags_qs)
-
-    tags_not_in_metadata = [
-        tag for tag in collection.tags.all()
-        if tag.name not in metadata['tags']
-    ]
-    collection.tags.remove(*tags_not_in_metadata)
+    utils.sync_tags(collection, metadata['tags'])
 
 
 def _notify_followers(version):
@@ -19,7 +19,6 @@ import logging
 
 import celery
 import github
-import pytz
 
 from django.conf import settings
 from django.db import transaction
@@ -29,7 +28,9 @@ from allauth.socialaccount import models as auth_models
 from galaxy import constants
 from galaxy.importer import repository as i_repo
 from galaxy.importer import exceptions as i_exc
+from galaxy.importer.utils import git as i_git
 from galaxy.main import models
+from galaxy.main import response_cache
 from galaxy.worker import exceptions as exc
 from galaxy.worker import importers
 from galaxy.worker import logutils
@@ -58,8 +59,10 @@ def import_repository(task_id, user_initiated=False):
 
     try:
         _import_repository(import_task, logger)
+        logutils.flush_task_logs(logger)
         user_notifications.repo_import.delay(import_task.id, user_initiated)
     except exc.LegacyTaskError as e:
+        logutils.flush_task_logs(logger)
         user_notifications.repo_import.delay(
             import_task.id,
             user_initiated,
@@ -68,6 +71,7 @@ def import_repository(task_id, user_initiated=False):
         import_task.finish_failed(
             reason='Task "{}" failed: {}'.format(import_task.id, str(e)))
     except Exception as e:
+        logutils.flush_task_logs(logger)
         user_notifications.repo_import.delay(
             import_task.id,
             user_initiated,
@@ -79,6 +83,15 @@ def import_repository(task_id, user_initiated=False):
         raise
 
 
+def _get_mirror_cache():
+    if not settings.CONTENT_MIRROR_DIR:
+        return None
+    return i_git.MirrorCache(
+        settings.CONTENT_MIRROR_DIR,
+        max_size=settings.CONTENT_MIRROR_MAX_SIZE,
+    )
+
+
 @transaction.atomic
 def _import_repository(import_task, logger):
     repository = import_task.repository
@@ -100,6 +113,7 @@ def _import_repository(import_task, logger):
             temp_dir=settings.CONTENT_DOWNLOAD_DIR,
             logger=logger,
             repo_obj=repository,
+            mirror_cache=_get_mirror_cache(),
         )
     except i_exc.ImporterError as e:
         raise exc.LegacyTaskError(str(e))
@@ -163,12 +177,14 @@ def _import_repository(import_task, logger):
                 obj.content_type, obj.namespace, obj.name))
         obj.delete()
 
-    _update_readme(repository, repo_info.readme, gh_api, gh_repo)
+    _update_readme(repository, repo_info.readme)
     _update_namespace(gh_repo)
     _update_repo_info(repository, gh_repo, repo_info.commit,
                       repo_info.description)
     repository.save()
 
+    # Messages are read back from the database below.
+    logutils.flush_task_logs(logger)
     _update_task_msg_content_id(import_task)
     _cleanup_old_task_msg(import_task)
 
@@ -177,15 +193,18 @@ def _import_repository(import_task, logger):
     # - version updates send out email notifications and we don't want to
     #   notify people that an update happened if it failed on one of the other
     #   steps
-    _update_repository_versions(repository, gh_repo, logger)
+    _update_repository_versions(repository, repo_info.tags, logger)
+
+    response_cache.invalidate(
+        response_cache.namespace_tag(
+            repository.provider_namespace.namespace.name),
+        response_cache.repository_tag(repository.pk),
+    )
 
-    warnings = import_task.messages.filter(
-        message_type=models.ImportTaskMessage.TYPE_WARNING).count()
-    errors = import_task.messages.filter(
-        message_type=models.ImportTaskMessage.TYPE_ERROR).count()
+    logutils.flush_task_logs(logger)
     import_task.finish_success(
         'Import completed with {0} warnings and {1} '
-        'errors'.format(warnings, errors))
+        'errors'.format(import_task.warning_count, import_task.error_count))
 
     if repository.is_new:
         user_notifications.repo_author_release.delay(repository.id)
@@ -295,12 +314,12 @@ def _get_social_token(import_task):
             u"You must first authenticate with GitHub.".format(user.username))
 
 
-def _update_readme(repository, readme, github_api, github_repo):
+def _update_readme(repository, readme):
     readme_obj = repository.readme
     repository.readme = None
     repository.save()
     repository.readme = utils.update_readme(
-        repository, readme_obj, readme, github_api, github_repo)
+        repository, readme_obj, readme)
     repository.save()
 
 
@@ -322,58 +341,19 @@ def _update_repo_info(repository, gh_repo, commit_info, repo_description):
     repository.commit_created = commit_info.committer_date
 
 
-def _update_repository_versions(repository, github_repo, logger):
+def _update_repository_versions(repository, tags, logger):
     logger.info('Updating repository versions...')
 
-    git_tags = {tag.name: tag for tag in github_repo.get_tags()}
-    db_tags = {v.tag: v for v in repository.versions.all()}
-
-    to_delete = set(db_tags) - set(git_tags)
-    for version in to_delete:
-        db_tags[version].delete()
-
-    to_add = set(git_tags) - set(db_tags)
-    tags_added = False
-    skipped_tags = []
-    for version in to_add:
-        tag = git_tags[version]
-        try:
-            version = utils.parse_version_tag(tag.name)
-        except ValueError:
-            skipped_tags.append(tag.name)
-            continue
-
-        commit_date = tag.commit.commit.author.date.replace(tzinfo=pytz.UTC)
-        commit_sha = tag.commit.commit.sha
-        version_obj, created = models.RepositoryVersion.objects.get_or_create(
-            repository=repository,
-            version=version,
-            defaults={
-                'tag': tag.name,
-                'commit_date': commit_date,
-                'commit_sha': commit_sha,
-            },
-        )
-        if not created:
-            logger.warning('Version conflict: {}'.format(tag.name))
-        else:
-            tags_added = True
+    result = utils.sync_repository_versions(repository, tags)
 
-    if skipped_tags:
+    for tag in result.conflicts:
+        logger.warning('Version conflict: {}'.format(tag))
+    if result.skipped:
         msg = ('Galaxy will only import git tags that match the '
                'semantic version format, skipping these tag(s): {}')
-        logger.warning(msg.format(', '.join(skipped_tags)))
-    if tags_added:
+        logger.warning(msg.format(', '.join(result.skipped)))
+    if result.added:
         user_notifications.repo_update.delay(repository.id)
-
-    to_update = set(git_tags) & set(db_tags)
-    for version in to_update:
-        tag = git_tags[version]
-        version_obj = db_tags[version]
-        commit_date = tag.commit.commit.author.date.replace(tzinfo=pytz.UTC)
-        if version_obj.commit_date != commit_date:
-            logger.warning('Release date of version {} has changed.'
-                           .format(version_obj.tag))
-            version_obj.commit_date = commit_date
-            version_obj.commit_sha = tag.commit.commit.sha
-            version_obj.save()
+    for tag in result.updated:
+        logger.warning('Release date of version {} has changed.'
+                       .format(tag))
@@ -0,0 +1,148 @@
+import logging
+from unittest import mock
+
+from django.test import TestCase
+from pulpcore.app import models as pulp_models
+
+from galaxy.importer.utils import lint as lintutils
+from galaxy.main import models
+from galaxy.worker import logutils
+
+
+class RecordingHandler(logutils.BufferedImportHandler):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.written = []
+
+    def write_records(self, task, records):
+        self.written.append((task, [r.msg for r in records]))
+
+
+def _make_logger(handler, task):
+    logger = logging.getLogger('galaxy.worker.tests.test_logutils')
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return logutils.ImportTaskAdapter(logger, task=task)
+
+
+def _make_task(pk):
+    return mock.Mock(pk=pk)
+
+
+def test_records_are_buffered():
+    handler = RecordingHandler(capacity=10, flush_interval=3600)
+    logger = _make_logger(handler, _make_task(1))
+
+    logger.info('first')
+    logger.info('second')
+
+    assert handler.written == []
+
+
+def test_flush_by_capacity():
+    task = _make_task(1)
+    handler = RecordingHandler(capacity=2, flush_interval=3600)
+    logger = _make_logger(handler, task)
+
+    logger.info('first')
+    logger.info('second')
+    logger.info('third')
+
+    assert handler.written == [(task, ['first', 'second'])]
+
+
+def test_flush_by_size():
+    task = _make_task(1)
+    handler = RecordingHandler(max_bytes=10, flush_interval=3600)
+    logger = _make_logger(handler, task)
+
+    logger.info('short')
+    assert handler.written == []
+    logger.info('long message')
+    assert handler.written == [(task, ['short', 'long message'])]
+
+
+def test_flush_by_level():
+    task = _make_task(1)
+    handler = RecordingHandler(flush_interval=3600)
+    logger = _make_logger(handler, task)
+
+    logger.info('first')
+    logger.error('failed')
+
+    assert handler.written == [(task, ['first', 'failed'])]
+
+
+@mock.patch('galaxy.worker.logutils.time.monotonic')
+def test_flush_by_time(monotonic):
+    task = _make_task(1)
+    monotonic.return_value = 100.0
+    handler = RecordingHandler(flush_interval=5)
+    logger = _make_logger(handler, task)
+
+    logger.info('first')
+    monotonic.return_value = 104.0
+    logger.info('second')
+    assert handler.written == []
+
+    monotonic.return_value = 105.0
+    logger.info('third')
+    assert handler.written == [(task, ['first', 'second', 'third'])]
+
+
+def test_flush_task_logs():
+    task1, task2 = _make_task(1), _make_task(2)
+    handler = RecordingHandler(flush_interval=3600)
+    logger1 = _make_logger(handler, task1)
+    logger2 = logutils.ContentTypeAdapter(
+        logutils.ImportTaskAdapter(logger1.logger, task=task2), 'role')
+
+    logger1.info('first')
+    logger2.info('second')
+    logger1.info('third')
+    logutils.flush_task_logs(logger2)
+
+    assert handler.written == [
+        (task1, ['first', 'third']),
+        (task2, ['second']),
+    ]
+
+
+class TestCollectionImportHandler(TestCase):
+
+    def setUp(self):
+        namespace = models.Namespace.objects.create(name='mynamespace')
+        self.task = models.CollectionImport.objects.create(
+            namespace=namespace, name='mycollection', version='1.0.0',
+            pulp_task=pulp_models.Task.objects.create(state='running'))
+
+    def test_write_records(self):
+        handler = logutils.CollectionImportHandler(flush_interval=3600)
+        logger = _make_logger(handler, self.task)
+        lint_record = lintutils.LintRecord(
+            type='yamllint', code='E100', message='Bad YAML', severity=1)
+
+        logger.info('first')
+        logger.warning('second', extra={'lint_record': lint_record})
+        logger.warning('third')
+        logutils.flush_task_logs(logger)
+        logger.error('failed')
+
+        task = models.CollectionImport.objects.get(pk=self.task.pk)
+        assert [(m['level'], m['message']) for m in task.messages] == [
+            ('INFO', 'first'),
+            ('WARNING', 'second'),
+            ('WARNING', 'third'),
+            ('ERROR', 'failed'),
+        ]
+        assert task.lint_records == [{
+            'type': 'yamllint',
+            'code': 'E100',
+            'message': 'Bad YAML',
+            'severity': 1,
+            'score_type': None,
+        }]
+        assert (task.info_count, task.warning_count, task.error_count) == \
+            (1, 2, 1)
+        assert task.messages == self.task.messages
@@ -0,0 +1,145 @@
+import datetime
+
+import pytz
+from django.test import TestCase
+
+from galaxy import constants
+from galaxy.importer.utils import git
+from galaxy.main import models
+from galaxy.worker import utils
+
+
+class TestSyncTags(TestCase):
+    def setUp(self):
+        ns = models.Namespace.objects.create(name='alice')
+        self.collection = models.Collection.objects.create(
+            namespace=ns, name='apache')
+        models.Tag.objects.create(name='web', description='web', active=True)
+
+    def _tag_names(self):
+        return sorted(self.collection.tags.values_list('name', flat=True))
+
+    def test_sync_tags(self):
+        utils.sync_tags(self.collection, ['web', 'server', 'server'])
+        assert self._tag_names() == ['server', 'web']
+
+        tag = models.Tag.objects.get(name='server')
+        assert tag.description == 'server'
+        assert tag.active
+
+        utils.sync_tags(self.collection, ['server', 'http'])
+        assert self._tag_names() == ['http', 'server']
+
+        utils.sync_tags(self.collection, [])
+        assert self._tag_names() == []
+
+    def test_number_of_queries(self):
+        tags = [f'tag{i}' for i in range(20)]
+        # select tags, insert tags, select created tags,
+        # select current tags, insert links
+        with self.assertNumQueries(5):
+            utils.sync_tags(self.collection, tags)
+        # select tags, select current tags, delete links, insert links
+        with self.assertNumQueries(4):
+            utils.sync_tags(self.collection, tags[10:] + ['web'])
+
+
+class TestSyncRepositoryVersions(TestCase):
+    def setUp(self):
+        ns = models.Namespace.objects.create(name='alice')
+        provider = models.Provider.objects.get(name='GitHub')
+        provider_ns = models.ProviderNamespace.objects.create(
+            name='alice', namespace=ns, provider=provider)
+        self.repository = models.Repository.objects.create(
+            provider_namespace=provider_ns, name='apache',
+            original_name='apache')
+        self.date = datetime.datetime(2019, 1, 1, tzinfo=pytz.UTC)
+
+    def _tag(self, name, sha='a' * 40, date=None):
+        return git.TagInfo(name, sha, date or self.date)
+
+    def _versions(self):
+        return sorted(self.repository.versions.values_list(
+            'tag', 'commit_sha', 'commit_date'))
+
+    def test_sync_versions(self):
+        result = utils.sync_repository_versions(self.repository, [
+            self._tag('v1.0.0'), self._tag('1.0.0'), self._tag('latest'),
+            self._tag('1.1.0', sha='b' * 40),
+        ])
+        assert result.added == ['1.0.0', '1.1.0']
+        assert result.conflicts == ['v1.0.0']
+        assert result.skipped == ['latest']
+        assert self._versions() == [
+            ('1.0.0', 'a' * 40, self.date),
+            ('1.1.0', 'b' * 40, self.date),
+        ]
+
+        new_date = self.date + datetime.timedelta(days=1)
+        result = utils.sync_repository_versions(self.repository, [
+            self._tag('1.1.0', sha='c' * 40, date=new_date),
+            self._tag('2.0.0'),
+        ])
+        assert result.added == ['2.0.0']
+        assert result.updated == ['1.1.0']
+        assert result.deleted == ['1.0.0']
+        assert self._versions() == [
+            ('1.1.0', 'c' * 40, new_date),
+            ('2.0.0', 'a' * 40, self.date),
+        ]
+
+    def test_number_of_queries(self):
+        tags = [self._tag(f'1.0.{i}') for i in range(20)]
+        # select versions, insert versions
+        with self.assertNumQueries(2):
+            utils.sync_repository_versions(self.repository, tags)
+        tags = [self._tag(f'1.0.{i}', date=self.date.replace(year=2020))
+                for i in range(10)]
+        # select versions, delete versions, update versions
+        with self.assertNumQueries(3):
+            utils.sync_repository_versions(self.repository, tags)
+
+
+class TestSyncM2M(TestCase):
+    def setUp(self):
+        ns = models.Namespace.objects.create(name='alice')
+        provider = models.Provider.objects.get(name='GitHub')
+        provider_ns = models.ProviderNamespace.objects.create(
+            name='alice', namespace=ns, provider=provider)
+        repository = models.Repository.objects.create(
+            provider_namespace=provider_ns, name='apache',
+            original_name='apache')
+        content_type = models.ContentType.get(constants.ContentType.ROLE)
+        self.role = models.Content.objects.create(
+            namespace=ns, name='apache', repository=repository,
+            content_type=content_type)
+        self.platforms = [
+            models.Platform.objects.create(name='EL', release=str(i))
+            for i in range(5, 10)]
+
+    def _platform_ids(self):
+        return set(self.role.platforms.values_list('pk', flat=True))
+
+    def test_sync_m2m(self):
+        added, removed = utils.sync_m2m(
+            self.role.platforms, self.platforms[:3])
+        assert added == {p.pk for p in self.platforms[:3]}
+        assert removed == set()
+        assert self._platform_ids() == added
+
+        added, removed = utils.sync_m2m(
+            self.role.platforms, [p.pk for p in self.platforms[2:]])
+        assert added == {p.pk for p in self.platforms[3:]}
+        assert removed == {p.pk for p in self.platforms[:2]}
+        assert self._platform_ids() == {p.pk for p in self.platforms[2:]}
+
+    def test_number_of_queries(self):
+        # select current, insert
+        with self.assertNumQueries(2):
+            utils.sync_m2m(self.role.platforms, self.platforms[:3])
+        # select current, delete, insert
+        with self.assertNumQueries(3):
+            utils.sync_m2m(self.role.platforms, self.platforms[1:])
+        # select current
+        with self.assertNumQueries(1):
+            utils.sync_m2m(self.role.platforms, self.platforms[1:])
@@ -15,9 +15,20 @@
 # You should have received a copy of the Apache License
 # along with Galaxy.  If not, see <http://www.apache.org/licenses/>.
 
+import collections
+
+import pytz
 import semantic_version
+from django.utils import timezone
 
 from galaxy.main import models
+from galaxy.main import readmes
+
+
+VersionSyncResult = collections.namedtuple(
+    'VersionSyncResult',
+    ('added', 'updated', 'deleted', 'skipped', 'conflicts'),
+)
 
 
 class Context(object):
@@ -26,7 +37,7 @@ class Context(object):
             setattr(self, arg, value)
 
 
-def update_readme(repository, readme_obj, readme, github_api, github_repo):
+def update_readme(repository, readme_obj, readme):
     if readme_obj and readme and readme_obj.raw_hash == readme.hash:
         return readme_obj
 
@@ -38,12 +49,12 @@ def update_readme(repository, readme_obj, readme, github_api, github_repo):
             repository=repository, raw_hash=readme.hash,
             defaults={
                 'raw': readme.text,
-                'mimetype': readme.mimetype,
+                'mimetype': readmes.get_mimetype(readme.mimetype),
             }
         )
-        if created:
-            readme_obj.html = github_api.render_markdown(
-                readme.text, context=github_repo)
+        if readme_obj.renderer_version != readmes.RENDERER_VERSION:
+            readme_obj.html = readmes.render_readme(readme)
+            readme_obj.renderer_version = readmes.RENDERER_VERSION
             readme_obj.save()
         return readme_obj
 
@@ -55,3 +66,135 @@ def parse_version_tag(value):
     if value[0].lower() == 'v':
         value = value[1:]
     return semantic_version.Version(value)
+
+
+def sync_tags(instance, tag_names):
+    """Sets tags of a collection or content object.
+
+    Missing tags are created. Number of queries doesn't depend on number
+    of tags.
+
+    :param instance: An object with `tags` many-to-many field.
+    :param tag_names: An iterable of tag names.
+    """
+    tag_names = set(tag_names)
+    tags = dict(models.Tag.objects.filter(
+        name__in=tag_names).values_list('name', 'pk'))
+    missing = tag_names - tags.keys()
+    if missing:
+        models.Tag.objects.bulk_create([
+            models.Tag(name=name, description=name, active=True)
+            for name in missing
+        ], ignore_conflicts=True)
+        tags.update(models.Tag.objects.filter(
+            name__in=missing).values_list('name', 'pk'))
+
+    sync_m2m(instance.tags, tags.values())
+
+
+def sync_m2m(manager, objects):
+    """Sets related objects of a many-to-many relation.
+
+    Changes are applied to the relation through table with at most one
+    bulk insert and one bulk delete. Unlike `add` and `remove`, no
+    `m2m_changed` signals are sent.
+
+    :param manager: A many-to-many related manager, e.g. `role.platforms`.
+    :param objects: An iterable of related objects or primary keys.
+    :return: A tuple of sets of added and removed primary keys.
+    """
+    instance = manager.instance
+    through = manager.through
+    source_field = manager.source_field_name + '_id'
+    target_field = manager.target_field_name + '_id'
+
+    target_ids = {getattr(obj, 'pk', obj) for obj in objects}
+    current_ids = set(through.objects.filter(
+        **{source_field: instance.pk}).values_list(target_field, flat=True))
+
+    to_remove = current_ids - target_ids
+    if to_remove:
+        through.objects.filter(**{
+            source_field: instance.pk,
+            target_field + '__in': to_remove,
+        }).delete()
+
+    to_add = target_ids - current_ids
+    if to_add:
+        through.objects.bulk_create([
+            through(**{source_field: instance.pk, target_field: target_id})
+            for target_id in to_add
+        ], ignore_conflicts=True)
+
+    return to_add, to_remove
+
+
+def sync_repository_versions(repository, tags):
+    """Synchronizes repository versions with git tags.
+
+    Versions of deleted tags are removed, versions of new tags that match
+    semantic version format are added and versions with changed commit date
+    are updated. Number of queries doesn't depend on number of tags.
+
+    :param repository: Repository object.
+    :param tags: An iterable of `galaxy.importer.utils.git.TagInfo`.
+    :return: Tag names of added, updated, deleted, skipped and
+        conflicting versions.
+    :rtype: VersionSyncResult
+    """
+    git_tags = {tag.name: tag for tag in tags}
+    db_tags = {v.tag: v for v in repository.versions.all()}
+
+    deleted = sorted(set(db_tags) - set(git_tags))
+    if deleted:
+        repository.versions.filter(
+            pk__in=[db_tags[tag].pk for tag in deleted]).delete()
+
+    existing_versions = {
+        str(v.version) for tag, v in db_tags.items() if tag in git_tags}
+    to_create = []
+    skipped = []
+    conflicts = []
+    for name in sorted(set(git_tags) - set(db_tags)):
+        tag = git_tags[name]
+        try:
+            version = parse_version_tag(name)
+        except ValueError:
+            skipped.append(name)
+            continue
+        if str(version) in existing_versions:
+            conflicts.append(name)
+            continue
+        existing_versions.add(str(version))
+        to_create.append(models.RepositoryVersion(
+            repository=repository,
+            version=version,
+            tag=name,
+            commit_date=tag.date.astimezone(pytz.UTC),
+            commit_sha=tag.sha,
+        ))
+    if to_create:
+        models.RepositoryVersion.objects.bulk_create(to_create)
+
+    to_update = []
+    now = timezone.now()
+    for name in sorted(set(git_tags) & set(db_tags)):
+        tag = git_tags[name]
+        version_obj = db_tags[name]
+        commit_date = tag.date.astimezone(pytz.UTC)
+        if version_obj.commit_date != commit_date:
+            version_obj.commit_date = commit_date
+            version_obj.commit_sha = tag.sha
+            version_obj.modified = now
+            to_update.append(version_obj)
+    if to_update:
+        models.RepositoryVersion.objects.bulk_update(
+            to_update, ['commit_date', 'commit_sha', 'modified'])
+
+    return VersionSyncResult(
+        added=[v.tag for v in to_create],
+        updated=[v.tag for v in to_update],
+        deleted=deleted,
+        skipped=skipped,
+        conflicts=conflicts,
+    )